@@ -0,0 +1,102 @@
+# benchmarks/bench_database.py
+"""
+Benchmark throughput baca/tulis campuran untuk lapisan database.
+
+- "before": satu koneksi aiosqlite, journal default, setiap tulis langsung commit,
+  semua baca mengantri di koneksi yang sama (perilaku lama).
+- "after" : initialize_database() dengan WAL + pragma, pool pembaca, dan group commit.
+
+Cara pakai (dari root repo):
+    python -m benchmarks.bench_database --players 2000 --workers 32 --ops 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import aiosqlite
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database  # noqa: E402
+
+SCAN_QUERY = "SELECT user_id, exp FROM players ORDER BY exp DESC LIMIT 10"
+
+async def _seed(db, players: int):
+    await db.executemany("INSERT OR IGNORE INTO players (user_id, exp, prisma) VALUES (?, ?, ?)",
+                         [(uid, random.randint(0, 100000), 3000) for uid in range(1, players + 1)])
+    await db.commit()
+
+async def _run_workers(workers: int, ops: int, players: int, do_read, do_scan, do_write):
+    async def worker():
+        for _ in range(ops):
+            roll = random.random()
+            uid = random.randint(1, players)
+            if roll < 0.60: await do_read(uid)
+            elif roll < 0.65: await do_scan()
+            else: await do_write(uid)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return time.perf_counter() - start
+
+async def bench_before(path: str, players: int, workers: int, ops: int) -> float:
+    db = await database.initialize_database(path, reader_pool_size=0)
+    await db.execute("PRAGMA journal_mode = DELETE")
+    await db.execute("PRAGMA synchronous = FULL")
+    await _seed(db, players)
+
+    async def do_read(uid):
+        async with db.execute("SELECT * FROM players WHERE user_id = ?", (uid,)) as cursor:
+            await cursor.fetchone()
+
+    async def do_scan():
+        async with db.execute(SCAN_QUERY) as cursor:
+            await cursor.fetchall()
+
+    async def do_write(uid):
+        await db.execute("UPDATE players SET prisma = prisma + 1 WHERE user_id = ?", (uid,))
+        await db.commit()
+
+    elapsed = await _run_workers(workers, ops, players, do_read, do_scan, do_write)
+    await db.close()
+    return elapsed
+
+async def bench_after(path: str, players: int, workers: int, ops: int) -> float:
+    db = await database.initialize_database(path)
+    await _seed(db, players)
+
+    async def do_read(uid):
+        await database.fetch_all(db, "SELECT * FROM players WHERE user_id = ?", (uid,))
+
+    async def do_scan():
+        await database.fetch_all(db, SCAN_QUERY)
+
+    async def do_write(uid):
+        await database.execute_write(db, "UPDATE players SET prisma = prisma + 1 WHERE user_id = ?", (uid,))
+
+    elapsed = await _run_workers(workers, ops, players, do_read, do_scan, do_write)
+    writer = database.get_writer(db)
+    print(f"  group commit: {writer.statements} statement dalam {writer.commits} commit")
+    await database.close_database(db)
+    return elapsed
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--ops", type=int, default=200, help="Operasi per worker")
+    args = parser.parse_args()
+    total_ops = args.workers * args.ops
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = await bench_before(os.path.join(tmp, "before.db"), args.players, args.workers, args.ops)
+        print(f"before: {total_ops} ops dalam {before:.2f}s ({total_ops / before:,.0f} ops/s)")
+        after = await bench_after(os.path.join(tmp, "after.db"), args.players, args.workers, args.ops)
+        print(f"after : {total_ops} ops dalam {after:.2f}s ({total_ops / after:,.0f} ops/s)")
+        print(f"speedup: {before / after:.2f}x")
+
+if __name__ == "__main__":
+    asyncio.run(main())
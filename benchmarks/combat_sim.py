@@ -0,0 +1,308 @@
+# benchmarks/combat_sim.py
+"""
+Simulator pertarungan massal untuk balancing. Menjalankan N pertarungan otomatis memakai
+CombatEngine + implementasi skill asli untuk satu pasangan title/equipment/monster, atau
+matriks penuh title vs title / title vs monster.
+
+- Pertarungan dibagi per chunk ke pool proses; tiap worker memuat katalog sekali.
+- RNG di-seed per chunk (seed, sel, chunk) sehingga hasil sama untuk --seed yang sama,
+  berapa pun jumlah worker.
+- PvP bergantian sisi p1/p2 tiap pertarungan agar tie SPD tidak berat sebelah.
+- Pertarungan yang melempar exception dihitung per tipe error dan tidak masuk statistik.
+
+Cara pakai (dari root repo):
+    python -m benchmarks.combat_sim --title 1 --vs-title 4 -n 10000
+    python -m benchmarks.combat_sim --title 1 --equip 301,101 --upgrade 5 --level 20 --vs-monster 0 -n 5000
+    python -m benchmarks.combat_sim --matrix titles -n 10000 --csv title_matrix.csv
+"""
+import argparse
+import asyncio
+import csv
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database import LEVEL_UP_STAT_GAINS  # noqa: E402
+from game_logic.catalog import DATA_DIR, GameCatalog, load_catalog_sources  # noqa: E402
+from game_logic.combat_engine import (  # noqa: E402
+    CombatEngine, build_monster_participant, build_player_participant, fresh_participant
+)
+
+# ===================================================================================
+# SPESIFIKASI PETARUNG & STATISTIK
+# ===================================================================================
+
+# Spesifikasi petarung (picklable): ("title", title_id, equip_ids, upgrade_level, player_level) atau ("monster", index)
+
+class SimStats:
+    """Akumulator hasil untuk satu sel (A vs B); bisa digabung antar chunk."""
+    __slots__ = ("fights", "wins_a", "wins_b", "draws", "round_limit", "rounds", "damage_a", "damage_b", "errors")
+
+    def __init__(self):
+        self.fights = 0
+        self.wins_a = 0
+        self.wins_b = 0
+        self.draws = 0
+        self.round_limit = 0
+        self.rounds = 0
+        self.damage_a = Counter()   # {bucket: jumlah pertarungan}
+        self.damage_b = Counter()
+        self.errors = Counter()     # {nama exception: jumlah}
+
+    def merge(self, other: "SimStats"):
+        self.fights += other.fights
+        self.wins_a += other.wins_a
+        self.wins_b += other.wins_b
+        self.draws += other.draws
+        self.round_limit += other.round_limit
+        self.rounds += other.rounds
+        self.damage_a.update(other.damage_a)
+        self.damage_b.update(other.damage_b)
+        self.errors.update(other.errors)
+
+    def rate(self, count: int) -> float:
+        return count / self.fights if self.fights else 0.0
+
+    @property
+    def avg_rounds(self) -> float:
+        return self.rounds / self.fights if self.fights else 0.0
+
+def _percentile(histogram: Counter, q: float) -> int:
+    total = sum(histogram.values())
+    if not total: return 0
+    threshold, seen = q * total, 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= threshold: return bucket
+    return max(histogram)
+
+# ===================================================================================
+# WORKER
+# ===================================================================================
+
+_catalog: GameCatalog | None = None
+_snapshots: dict = {}
+
+def _init_worker(data_dir: str):
+    global _catalog
+    _catalog = GameCatalog(load_catalog_sources(data_dir))
+    _snapshots.clear()
+
+def _level_stats(level: int) -> dict:
+    player_data = {"base_hp": 100, "base_atk": 10, "base_def": 5, "base_spd": 10}
+    for col, gain in LEVEL_UP_STAT_GAINS.items(): player_data[col] += gain * (level - 1)
+    return player_data
+
+def _snapshot(spec: tuple) -> dict:
+    """Snapshot petarung dari spesifikasi (di-cache per worker); tiap pertarungan memakai salinan fresh_participant."""
+    if spec in _snapshots: return _snapshots[spec]
+    if spec[0] == "monster":
+        monster = _catalog.all("monsters")[spec[1]]
+        snapshot = build_monster_participant(monster, _catalog.monster_title(monster.get('monster_title_id')) or {})
+    else:
+        _, title_id, equip_ids, upgrade, level = spec
+        title = _catalog.title(title_id)
+        equipment = {}
+        for item_id in equip_ids:
+            item = _catalog.item(item_id)
+            equipment[item.get('type', str(item_id))] = item_id
+        upgrades = {slot: {"level": upgrade} for slot in equipment}
+        snapshot = build_player_participant(None, title['name'], _level_stats(level), title, equipment, upgrades, _catalog.item)
+    _snapshots[spec] = snapshot
+    return snapshot
+
+def _bucket(amount: int, size: int) -> int:
+    return amount // size * size
+
+async def _run_fights(stats: SimStats, spec_a: tuple, spec_b: tuple, fights: int, first: int, damage_bucket: int):
+    is_pve = spec_b[0] == "monster"
+    snap_a, snap_b = _snapshot(spec_a), _snapshot(spec_b)
+    for i in range(first, first + fights):
+        a, b = fresh_participant(snap_a), fresh_participant(snap_b)
+        a['id'] = 1
+        if not is_pve: b['id'] = 2
+        # PvE: pemain selalu p1 (seperti CombatSession); PvP: sisi bergantian
+        p1, p2 = (b, a) if not is_pve and i % 2 else (a, b)
+        engine = CombatEngine(p1, p2, is_pve=is_pve)
+        try:
+            result = await engine.run()
+        except Exception as e:
+            stats.errors[type(e).__name__] += 1
+            continue
+
+        stats.fights += 1
+        stats.rounds += result.rounds
+        if result.winner is a: stats.wins_a += 1
+        elif result.winner is b: stats.wins_b += 1
+        elif result.reason == "round_limit": stats.round_limit += 1
+        else: stats.draws += 1
+        side_a, side_b = ('p1', 'p2') if p1 is a else ('p2', 'p1')
+        stats.damage_a[_bucket(result.damage[side_a], damage_bucket)] += 1
+        stats.damage_b[_bucket(result.damage[side_b], damage_bucket)] += 1
+
+def _run_chunk(task: tuple) -> tuple[int, SimStats]:
+    cell, spec_a, spec_b, chunk, fights, seed, damage_bucket = task
+    random.seed(f"{seed}:{cell}:{chunk}")
+    stats = SimStats()
+    asyncio.run(_run_fights(stats, spec_a, spec_b, fights, chunk * fights, damage_bucket))
+    return cell, stats
+
+# ===================================================================================
+# KOORDINATOR
+# ===================================================================================
+
+def simulate(cells: list[tuple], fights: int, *, workers: int, chunk_size: int, seed: int,
+             damage_bucket: int, data_dir: str, progress: bool = False) -> list[SimStats]:
+    """Menjalankan `fights` pertarungan untuk tiap sel (spec_a, spec_b); hasil sesuai urutan `cells`."""
+    tasks = []
+    for cell, (spec_a, spec_b) in enumerate(cells):
+        for chunk, start in enumerate(range(0, fights, chunk_size)):
+            tasks.append((cell, spec_a, spec_b, chunk, min(chunk_size, fights - start), seed, damage_bucket))
+
+    results = [SimStats() for _ in cells]
+    def collect(done: int, cell: int, stats: SimStats):
+        results[cell].merge(stats)
+        if progress: print(f"\r  {done}/{len(tasks)} chunk", end="", file=sys.stderr, flush=True)
+
+    if workers <= 1:
+        _init_worker(data_dir)
+        for done, task in enumerate(tasks, 1): collect(done, *_run_chunk(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data_dir,)) as pool:
+            for done, (cell, stats) in enumerate(pool.map(_run_chunk, tasks), 1): collect(done, cell, stats)
+    if progress: print(file=sys.stderr)
+    return results
+
+def _fighter_label(catalog: GameCatalog, spec: tuple) -> str:
+    if spec[0] == "monster": return f"[Monster] {catalog.all('monsters')[spec[1]]['name']}"
+    _, title_id, equip_ids, upgrade, level = spec
+    label = f"{catalog.title(title_id)['name']} (Lv {level})"
+    if equip_ids: label += " + " + ", ".join(f"{catalog.item(i)['name']} +{upgrade}" for i in equip_ids)
+    return label
+
+def _format_errors(stats: SimStats) -> str:
+    return ", ".join(f"{name} x{count}" for name, count in stats.errors.most_common()) or "-"
+
+def _print_pair(label_a: str, label_b: str, stats: SimStats):
+    print(f"A: {label_a}\nB: {label_b}")
+    print(f"Pertarungan : {stats.fights} (error: {_format_errors(stats)})")
+    print(f"Menang A    : {stats.rate(stats.wins_a):6.1%}   Menang B: {stats.rate(stats.wins_b):6.1%}   "
+          f"Seri: {stats.rate(stats.draws):5.1%}   Batas ronde: {stats.rate(stats.round_limit):5.1%}")
+    print(f"Rata ronde  : {stats.avg_rounds:.2f}")
+    for side, hist in (("A", stats.damage_a), ("B", stats.damage_b)):
+        p10, p50, p90 = (_percentile(hist, q) for q in (0.1, 0.5, 0.9))
+        print(f"Damage {side}    : p10 {p10:>6}   p50 {p50:>6}   p90 {p90:>6}")
+
+def _write_csv(path: str, catalog: GameCatalog, cells: list[tuple], results: list[SimStats]):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["a", "b", "fights", "win_a", "win_b", "draw", "round_limit", "avg_rounds",
+                         "damage_a_p50", "damage_b_p50", "errors"])
+        for (spec_a, spec_b), stats in zip(cells, results):
+            writer.writerow([
+                _fighter_label(catalog, spec_a), _fighter_label(catalog, spec_b), stats.fights,
+                f"{stats.rate(stats.wins_a):.4f}", f"{stats.rate(stats.wins_b):.4f}",
+                f"{stats.rate(stats.draws):.4f}", f"{stats.rate(stats.round_limit):.4f}", f"{stats.avg_rounds:.2f}",
+                _percentile(stats.damage_a, 0.5), _percentile(stats.damage_b, 0.5), sum(stats.errors.values())
+            ])
+
+def _print_ranking(catalog: GameCatalog, specs: list[tuple], cells: list[tuple], results: list[SimStats]):
+    """
+    Peringkat title berdasarkan rata-rata win rate terhadap semua lawan di matriks.
+    Pertarungan yang error tidak ikut dihitung dan sel yang seluruhnya error dilewati, jadi jumlahnya
+    ditampilkan per title; title bertanda * dirata-rata dari data parsial.
+    """
+    win_rates = {spec: [] for spec in specs}
+    errors, skipped = Counter(), Counter()
+    for (spec_a, spec_b), stats in zip(cells, results):
+        failed = sum(stats.errors.values())
+        for spec in {spec_a, spec_b}:
+            if spec not in win_rates: continue
+            errors[spec] += failed
+            if not stats.fights: skipped[spec] += 1
+        if not stats.fights: continue
+        win_rates[spec_a].append(stats.rate(stats.wins_a))
+        if spec_b in win_rates and spec_b != spec_a: win_rates[spec_b].append(stats.rate(stats.wins_b))
+    ranking = sorted(((sum(r) / len(r) if r else 0.0, spec) for spec, r in win_rates.items()), key=lambda x: x[0], reverse=True)
+    print(f"{'#':>3}  {'Win rate':>8}  {'Error':>6}  {'Sel':>4}  Title")
+    for rank, (rate, spec) in enumerate(ranking, 1):
+        mark = " *" if errors[spec] else ""
+        print(f"{rank:>3}  {rate:8.1%}  {errors[spec]:>6}  {skipped[spec]:>4}  {_fighter_label(catalog, spec)}{mark}")
+
+    total = SimStats()
+    for stats in results: total.merge(stats)
+    failed = sum(total.errors.values())
+    if failed:
+        skipped_cells = sum(1 for stats in results if not stats.fights)
+        print(f"\n* {failed:,} dari {failed + total.fights:,} pertarungan error ({_format_errors(total)}); "
+              f"{skipped_cells} sel tanpa hasil dilewati. Kolom Error/Sel = pertarungan error / sel dilewati per title; "
+              f"win rate bertanda * dihitung dari data parsial.")
+
+def _parse_ids(value: str) -> tuple:
+    return tuple(int(x) for x in value.split(",") if x.strip()) if value else ()
+
+def _monster_index(catalog: GameCatalog, value: str) -> int:
+    monsters = catalog.all("monsters")
+    if value.isdigit(): return int(value)
+    for i, monster in enumerate(monsters):
+        if monster.get('name', '').lower() == value.lower(): return i
+    raise SystemExit(f"Monster '{value}' tidak ditemukan.")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--title", type=int, help="ID title petarung A")
+    parser.add_argument("--equip", default="", help="ID item petarung A, dipisah koma")
+    parser.add_argument("--upgrade", type=int, default=0, help="level upgrade semua equipment")
+    parser.add_argument("--level", type=int, default=1, help="level pemain (stat dasar + kenaikan per level)")
+    parser.add_argument("--vs-title", type=int, help="ID title petarung B")
+    parser.add_argument("--vs-equip", default="", help="ID item petarung B, dipisah koma")
+    parser.add_argument("--vs-monster", help="indeks atau nama monster lawan")
+    parser.add_argument("--matrix", choices=("titles", "monsters"), help="semua title vs semua title/monster")
+    parser.add_argument("-n", "--fights", type=int, default=1000, help="pertarungan per pasangan")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=500, help="pertarungan per tugas worker")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--damage-bucket", type=int, default=10, help="lebar bucket histogram damage")
+    parser.add_argument("--csv", help="tulis hasil per sel ke file CSV")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args()
+
+    catalog = GameCatalog(load_catalog_sources(args.data_dir))
+    def title_spec(title_id: int, equip: str) -> tuple:
+        if not catalog.title(title_id): raise SystemExit(f"Title {title_id} tidak ditemukan.")
+        for item_id in _parse_ids(equip):
+            if not catalog.item(item_id): raise SystemExit(f"Item {item_id} tidak ditemukan.")
+        return ("title", title_id, _parse_ids(equip), args.upgrade, args.level)
+
+    if args.matrix:
+        specs = [title_spec(t['id'], args.equip) for t in catalog.all("titles")]
+        if args.matrix == "titles":
+            # Tiap pasangan sekali (termasuk mirror); sisi p1/p2 sudah bergantian di dalam sel
+            cells = [(a, b) for i, a in enumerate(specs) for b in specs[i:]]
+        else:
+            cells = [(a, ("monster", m)) for a in specs for m in range(len(catalog.all("monsters")))]
+    else:
+        if args.title is None or (args.vs_title is None) == (args.vs_monster is None):
+            parser.error("butuh --title dan tepat satu dari --vs-title / --vs-monster (atau --matrix)")
+        opponent = (title_spec(args.vs_title, args.vs_equip) if args.vs_title is not None
+                    else ("monster", _monster_index(catalog, args.vs_monster)))
+        cells = [(title_spec(args.title, args.equip), opponent)]
+
+    start = time.perf_counter()
+    results = simulate(cells, args.fights, workers=args.workers, chunk_size=args.chunk, seed=args.seed,
+                       damage_bucket=args.damage_bucket, data_dir=args.data_dir, progress=len(cells) > 1)
+    elapsed = time.perf_counter() - start
+
+    if args.matrix: _print_ranking(catalog, specs, cells, results)
+    else: _print_pair(_fighter_label(catalog, cells[0][0]), _fighter_label(catalog, cells[0][1]), results[0])
+    if args.csv: _write_csv(args.csv, catalog, cells, results)
+
+    total = sum(s.fights + sum(s.errors.values()) for s in results)
+    print(f"Waktu       : {elapsed:.1f}s ({total / elapsed:,.0f} pertarungan/s, {args.workers} worker)")
+
+if __name__ == "__main__":
+    main()
@@ -90,7 +90,18 @@ async def send_embed_with_local_image(
     - file_path: Path lengkap ke file gambar lokal (misal: "assets/logos/maha5_logo.png").
     - attachment_name: Nama file yang akan digunakan di Discord (misal: "maha5_logo.png").
     - content: Teks pesan tambahan (opsional).
+
+    Jika bot punya registry aset aktif, `attachment://<attachment_name>` di embed diganti URL CDN
+    sehingga file tidak di-upload ulang.
     """
+    assets = getattr(getattr(destination, "bot", None), "assets", None)
+    if assets and (url := await assets.get_url(file_path)):
+        attachment_url = f"attachment://{attachment_name}"
+        if embed.image.url == attachment_url: embed.set_image(url=url)
+        if embed.thumbnail.url == attachment_url: embed.set_thumbnail(url=url)
+        await destination.send(content=content, embed=embed)
+        return
+
     try:
         local_file = discord.File(file_path, filename=attachment_name)
         await destination.send(content=content, file=local_file, embed=embed)
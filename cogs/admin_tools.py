@@ -3,7 +3,7 @@ import discord
 from discord.ext import commands
 import math
 import json
-from database import get_player_data, update_player_data
+from database import get_player_data, update_player_data, fetch_all
 
 class AdminTools(commands.Cog):
     def __init__(self, bot):
@@ -22,8 +22,7 @@ class AdminTools(commands.Cog):
         msg = await ctx.send("🔄 Memulai migrasi database ke sistem Level Baru...")
         
         # 1. Ambil semua player
-        async with self.bot.db.execute("SELECT user_id, exp, agency_id FROM players") as cursor:
-            all_players = await cursor.fetchall()
+        all_players = await fetch_all(self.bot.db, "SELECT user_id, exp, agency_id FROM players")
 
         count = 0
         for row in all_players:
@@ -6,7 +6,7 @@ import random
 import math
 from datetime import datetime, timedelta
 
-from database import get_player_data, update_player_data
+from database import get_players_fields, add_exp_bulk
 from ._utils import BotColors
 
 class AFKStreamCog(commands.Cog, name="AFK Stream"):
@@ -63,40 +63,42 @@ class AFKStreamCog(commands.Cog, name="AFK Stream"):
         active_farmers = [] # List of tuples: (Member Object, Display Name, Level, Player Data)
         disqualified_members = [] # List string description
         
-        # Loop melalui semua channel AFK yang terdaftar
+        # Kumpulkan semua member dari channel AFK yang terdaftar
+        members = []
         for vc_id in self.afk_vc_ids:
             voice_channel = self.bot.get_channel(vc_id)
             if not voice_channel or not isinstance(voice_channel, discord.VoiceChannel): continue
+            members.extend(m for m in voice_channel.members if not m.bot)
 
-            for member in voice_channel.members:
-                if member.bot: continue
+        # Ambil data DB semua member dalam satu query
+        players = await get_players_fields(self.bot.db, [m.id for m in members], 'equipped_title_id', 'exp')
 
-                # Cek Syarat Visual
-                is_muted = member.voice.self_mute or member.voice.mute
-                is_deafened = member.voice.self_deaf or member.voice.deaf
-                
-                reason = []
-                if is_muted: reason.append("Mic Off 🔇")
-                if is_deafened: reason.append("Deafen 🎧")
+        for member in members:
+            # Cek Syarat Visual
+            is_muted = member.voice.self_mute or member.voice.mute
+            is_deafened = member.voice.self_deaf or member.voice.deaf
+            
+            reason = []
+            if is_muted: reason.append("Mic Off 🔇")
+            if is_deafened: reason.append("Deafen 🎧")
 
-                # Ambil Data DB (Cukup cepat untuk realtime)
-                player_data = await get_player_data(self.bot.db, member.id)
-                
-                # Syarat Debut (Harus memiliki title yang ter-equip)
-                if not (player_data and player_data.get('equipped_title_id')):
-                    reason.append("Belum Debut 👶")
-
-                if not reason:
-                    # Hitung level saat ini untuk ditampilkan
-                    level = self._get_level_from_exp(player_data.get('exp', 0))
-                    # Tambahkan ke list jika belum ada, untuk menghindari duplikasi jika user pindah antar VC AFK
-                    if member.id not in [a[0].id for a in active_farmers]:
-                        active_farmers.append((member, member.display_name, level, player_data))
-                else:
-                    # Tambahkan ke disqualified jika belum ada (agar tidak menumpuk)
-                    desc = f"{member.display_name} ({', '.join(reason)})"
-                    if desc not in disqualified_members:
-                        disqualified_members.append(desc)
+            player_data = players.get(member.id)
+            
+            # Syarat Debut (Harus memiliki title yang ter-equip)
+            if not (player_data and player_data.get('equipped_title_id')):
+                reason.append("Belum Debut 👶")
+
+            if not reason:
+                # Hitung level saat ini untuk ditampilkan
+                level = self._get_level_from_exp(player_data.get('exp', 0))
+                # Tambahkan ke list jika belum ada, untuk menghindari duplikasi jika user pindah antar VC AFK
+                if member.id not in [a[0].id for a in active_farmers]:
+                    active_farmers.append((member, member.display_name, level, player_data))
+            else:
+                # Tambahkan ke disqualified jika belum ada (agar tidak menumpuk)
+                desc = f"{member.display_name} ({', '.join(reason)})"
+                if desc not in disqualified_members:
+                    disqualified_members.append(desc)
         
         return active_farmers, disqualified_members
 
@@ -136,35 +138,22 @@ class AFKStreamCog(commands.Cog, name="AFK Stream"):
         
         dashboard_active_list = []
 
-        # 2. Proses Hadiah hanya untuk yang Active
-        for member, name, old_level_calc, player_data in active_farmers_data:
-            current_exp = player_data.get('exp', 0)
-            
-            # Hitung level dari DB (untuk memastikan akurasi reward)
-            real_old_level = self._get_level_from_exp(current_exp)
+        # 2. Proses Hadiah hanya untuk yang Active: semua pemain ditulis dalam satu transaksi
+        results = await add_exp_bulk(
+            self.bot.db, [member.id for member, *_ in active_farmers_data],
+            self.EXP_PER_TICK, prisma=self.PRISMA_PER_TICK
+        )
 
-            new_exp_val = current_exp + self.EXP_PER_TICK
-            new_prisma_val = player_data.get('prisma', 0) + self.PRISMA_PER_TICK
-            
-            new_level = self._get_level_from_exp(new_exp_val)
-            
-            db_updates = {
-                "exp": new_exp_val,
-                "prisma": new_prisma_val
-            }
+        # 3. Kirim embed level up setelah semua hadiah tersimpan
+        for member, name, old_level_calc, player_data in active_farmers_data:
+            result = results.get(member.id)
+            if result is None: continue
+            new_level = result['new_level']
 
             # Level Up Handling
-            if new_level > real_old_level:
-                levels_gained = new_level - real_old_level
-                hp_gain, atk_gain, def_gain, spd_gain = 15*levels_gained, 3*levels_gained, 2*levels_gained, 1*levels_gained
-                
-                db_updates.update({
-                    "base_hp": player_data.get('base_hp', 100) + hp_gain,
-                    "base_atk": player_data.get('base_atk', 10) + atk_gain,
-                    "base_def": player_data.get('base_def', 5) + def_gain,
-                    "base_spd": player_data.get('base_spd', 10) + spd_gain,
-                    "level": new_level
-                })
+            if result['levels_gained']:
+                gains = result['stat_gains']
+                hp_gain, atk_gain, def_gain = gains['base_hp'], gains['base_atk'], gains['base_def']
 
                 if log_channel:
                     lvl_embed = discord.Embed(
@@ -175,12 +164,10 @@ class AFKStreamCog(commands.Cog, name="AFK Stream"):
                     lvl_embed.add_field(name="Stat Bonus", value=f"❤️HP `+{hp_gain}` ⚔️ATK `+{atk_gain}` 🛡️DEF `+{def_gain}`", inline=True)
                     await log_channel.send(embed=lvl_embed, delete_after=60)
 
-            await update_player_data(self.bot.db, member.id, **db_updates)
-            
             # Masukkan ke list untuk update dashboard
             dashboard_active_list.append((name, new_level))
 
-        # 3. Update Dashboard setelah pembagian hadiah
+        # 4. Update Dashboard setelah pembagian hadiah
         await self._update_dashboard(dashboard_active_list, disqualified_members)
 
     async def _update_dashboard(self, active_list, disqualified_list):
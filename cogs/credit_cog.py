@@ -1,6 +1,5 @@
 import discord
 from discord.ext import commands
-import json
 import math
 
 # Impor BotColors dari file _utils.py untuk konsistensi
@@ -275,22 +274,9 @@ class CreditView(discord.ui.View):
     )
     async def select_callback(self, interaction: discord.Interaction, select: discord.ui.Select):
         choice = select.values[0]
-        data_source = []
-
-        # Load data dari bot attributes (pastikan data sudah di-load di main.py)
-        if choice == "titles": data_source = getattr(self.cog.bot, 'titles', [])
-        elif choice == "monsters": data_source = getattr(self.cog.bot, 'monsters', [])
-        elif choice == "fishes": data_source = getattr(self.cog.bot, 'fishes', [])
-        elif choice == "fishing_items": 
-            fishing_items_dict = getattr(self.cog.bot, 'fishing_items', {})
-            data_source = list(fishing_items_dict.values())
-        elif choice == "agencies": data_source = getattr(self.cog.bot, 'agencies', [])
-
-        # Fallback jika data kosong (untuk testing lokal tanpa main.py penuh)
-        if not data_source and choice == "fishing_items":
-             try:
-                 with open('data/fishing_items.json', 'r') as f: data_source = json.load(f)
-             except: pass
+
+        # Data diambil dari katalog bersama (nama pilihan = nama tabel katalog)
+        data_source = list(self.cog.bot.catalog.all(choice))
 
         if not data_source:
             return await interaction.response.send_message(f"❌ Data {choice} tidak ditemukan atau kosong.", ephemeral=True)
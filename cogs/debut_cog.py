@@ -2,7 +2,6 @@ import discord
 from discord.ext import commands
 import random
 import asyncio
-import os
 import math
 
 from database import get_player_data, add_title_to_player, set_equipped_title, reset_player_progress
@@ -75,7 +74,7 @@ class RerollView(discord.ui.View):
         await add_title_to_player(self.bot.db, user_id, title_id)
         await set_equipped_title(self.bot.db, user_id, title_id)
 
-        final_embed, file = self.cog._create_title_display(self.current_title)
+        final_embed, file = await self.cog._create_title_display(self.current_title)
         final_embed.title = "🎉 Selamat Datang di Dunia MAHADVEN! 🎉"
         final_embed.set_footer(text="Karaktermu telah dibuat! Lihat panduan di bawah ini.")
         
@@ -103,7 +102,7 @@ class RerollView(discord.ui.View):
         await interaction.response.defer()
         
         self.current_title = self.cog._get_weighted_random_title()
-        new_embed, file = self.cog._create_title_display(self.current_title)
+        new_embed, file = await self.cog._create_title_display(self.current_title)
         
         button.label = f"Reroll (Sisa: {self.rerolls_left})"
         if self.rerolls_left == 0:
@@ -280,7 +279,7 @@ class DebutCog(commands.Cog, name="Debut"):
         if cd := stats_dict.get('crit_damage', 0): parts.append(f"💥CDMG:`{cd*100:+.0f}%`")
         return ' | '.join(parts) or "Tidak ada bonus stat."
 
-    def _create_title_display(self, title: dict) -> tuple[discord.Embed, discord.File | None]:
+    async def _create_title_display(self, title: dict) -> tuple[discord.Embed, discord.File | None]:
         """Membuat embed dan file gambar untuk Title."""
         rarity = title.get("rarity", "Common").capitalize()
         rarity_colors = {"Common": BotColors.COMMON, "Rare": BotColors.RARE, "Epic": BotColors.EPIC, "Legendary": BotColors.LEGENDARY}
@@ -293,10 +292,7 @@ class DebutCog(commands.Cog, name="Debut"):
 
         file = None
         if image_filename := title.get("image_file"):
-            image_path = f"assets/images/{image_filename}"
-            if os.path.exists(image_path):
-                file = discord.File(image_path, filename=image_filename)
-                embed.set_thumbnail(url=f"attachment://{image_filename}")
+            file = await self.bot.assets.set_embed_image(embed, f"assets/images/{image_filename}", thumbnail=True)
         
         embed.add_field(name="Rarity", value=f"**{rarity}**", inline=False)
         
@@ -334,7 +330,7 @@ class DebutCog(commands.Cog, name="Debut"):
         first_title = self._get_weighted_random_title()
         view.current_title = first_title
         
-        initial_embed, file = self._create_title_display(first_title)
+        initial_embed, file = await self._create_title_display(first_title)
         
         kwargs = {'content': None, 'embed': initial_embed, 'view': view, 'attachments': []}
         if file:
@@ -1,10 +1,14 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import ui
 import asyncio
+import os
 from typing import Literal, Optional, List
 
-from database import initialize_database, get_player_data, update_player_data
+from database import (
+    initialize_database, get_player_data, update_player_data, get_player_cache_stats,
+    create_backup, prune_backups, list_backups, restore_backup, format_database, BACKUP_DIR
+)
 
 # --- Modal untuk meminta input nama Cog saat reload ---
 class ReloadCogModal(ui.Modal, title="Reload Cog"):
@@ -52,19 +56,17 @@ class ConfirmFormatView(ui.View):
                 item.disabled = True
             await self.original_interaction.edit_original_response(view=self)
 
-            # Proses format database
-            cursor = await self.bot.db.cursor()
-            await cursor.execute("DROP TABLE IF EXISTS players")
-            await cursor.execute("DROP TABLE IF EXISTS player_titles")
-            await self.bot.db.commit()
-            await cursor.close()
-            
-            await initialize_database()
+            # Proses format database: koneksi lama ditutup (antrian tulis dikosongkan) sebelum tabel dihapus,
+            # lalu skema dibuat ulang di koneksi baru beserta pool pembacanya
+            self.bot.db = await format_database(self.bot.db)
             
             await interaction.followup.send("✅ Database berhasil diformat dan tabel baru telah dibuat.", ephemeral=True)
             self.value = True
 
         except Exception as e:
+            # Pastikan bot tetap punya koneksi yang hidup jika format gagal setelah koneksi ditutup
+            try: await self.bot.db.execute("SELECT 1")
+            except Exception: self.bot.db = await initialize_database()
             await interaction.followup.send(f"❌ **Terjadi kesalahan fatal saat format database:**\n`{e}`", ephemeral=True)
             self.value = False
         
@@ -90,6 +92,41 @@ class ConfirmFormatView(ui.View):
         await self.original_interaction.edit_original_response(content="*Waktu konfirmasi habis...*", view=self)
 
 
+class ConfirmRestoreView(ui.View):
+    """Konfirmasi sebelum database diganti dengan isi snapshot."""
+    def __init__(self, bot: commands.Bot, author_id: int, backup_name: str):
+        super().__init__(timeout=30)
+        self.bot = bot
+        self.author_id = author_id
+        self.backup_name = backup_name
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("Anda tidak bisa melakukan ini!", ephemeral=True)
+            return False
+        return True
+
+    @ui.button(label="KONFIRMASI RESTORE", style=discord.ButtonStyle.danger)
+    async def confirm(self, interaction: discord.Interaction, button: ui.Button):
+        for item in self.children: item.disabled = True
+        await interaction.response.edit_message(content=f"⏳ Memulihkan dari `{self.backup_name}`...", view=self)
+        try:
+            self.bot.db = await restore_backup(self.bot.db, os.path.join(BACKUP_DIR, self.backup_name))
+            await interaction.followup.send(f"✅ Database dipulihkan dari `{self.backup_name}`. Snapshot sebelum restore sudah disimpan.")
+        except Exception as e:
+            # Pastikan bot tetap punya koneksi yang hidup jika restore gagal setelah koneksi ditutup
+            try: await self.bot.db.execute("SELECT 1")
+            except Exception: self.bot.db = await initialize_database()
+            await interaction.followup.send(f"❌ **Restore gagal:**\n`{e}`")
+        self.stop()
+
+    @ui.button(label="Batal", style=discord.ButtonStyle.secondary)
+    async def cancel(self, interaction: discord.Interaction, button: ui.Button):
+        for item in self.children: item.disabled = True
+        await interaction.response.edit_message(content="⚠️ Restore dibatalkan.", view=self)
+        self.stop()
+
+
 # --- View Utama untuk Panel Developer ---
 class DevPanelView(ui.View):
     def __init__(self, bot: commands.Bot):
@@ -121,11 +158,27 @@ class DevPanelView(ui.View):
     @ui.button(label="Reload Game Data", style=discord.ButtonStyle.success, emoji="📄", row=1)
     async def reload_data_button(self, interaction: discord.Interaction, button: ui.Button):
         try:
-            self.bot.load_all_game_data()
-            await interaction.response.send_message("✅ **Berhasil!** Semua data game dari file JSON telah dimuat ulang.", ephemeral=True)
+            changed = self.bot.load_all_game_data()
+            errors = self.bot.catalog_loader.errors
+            if changed:
+                message = f"✅ **Berhasil!** Katalog v{self.bot.catalog.version} aktif. Data yang diperbarui: `{', '.join(sorted(changed))}`."
+            else:
+                message = "ℹ️ Tidak ada file data game yang berubah."
+            if errors:
+                message += "\n⚠️ Gagal dibaca (data lama tetap dipakai):\n" + "\n".join(f"`{name}`: {err}" for name, err in errors.items())
+            await interaction.response.send_message(message, ephemeral=True)
         except Exception as e:
             await interaction.response.send_message(f"❌ **Gagal!** Terjadi kesalahan saat memuat ulang data:\n```py\n{e}\n```", ephemeral=True)
 
+    @ui.button(label="Cache Stats", style=discord.ButtonStyle.secondary, emoji="📊", row=1)
+    async def cache_stats_button(self, interaction: discord.Interaction, button: ui.Button):
+        stats = get_player_cache_stats()
+        embed = discord.Embed(title="📊 Player Cache", color=discord.Color.blue())
+        embed.add_field(name="Ukuran", value=f"`{stats['size']}/{stats['max_size']}`", inline=True)
+        embed.add_field(name="Hit Rate", value=f"`{stats['hit_rate']:.1%}`", inline=True)
+        embed.add_field(name="Hit / Miss / Evict", value=f"`{stats['hits']}` / `{stats['misses']}` / `{stats['evictions']}`", inline=False)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     @ui.button(label="Shutdown Bot", style=discord.ButtonStyle.danger, emoji="🔌", row=1)
     async def shutdown_button(self, interaction: discord.Interaction, button: ui.Button):
         await interaction.response.send_message("Bot sedang dimatikan...", ephemeral=True)
@@ -280,6 +333,24 @@ class ActionButton(ui.Button):
 class DevCog(commands.Cog, name="Developer"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.backup_loop.start()
+
+    def cog_unload(self):
+        self.backup_loop.cancel()
+
+    @tasks.loop(hours=1)
+    async def backup_loop(self):
+        """Snapshot otomatis per jam + pembersihan sesuai retensi."""
+        try:
+            result = await create_backup(self.bot.db)
+            removed = prune_backups()
+            print(f"[BACKUP] {result['name']} ({result['size'] / 1024:.0f} KB, {result['seconds']:.2f} dtk), {len(removed)} snapshot lama dihapus.")
+        except Exception as e:
+            print(f"[BACKUP] Gagal membuat snapshot: {e}")
+
+    @backup_loop.before_loop
+    async def before_backup_loop(self):
+        await self.bot.wait_until_ready()
 
     @commands.command(name="dev")
     @commands.is_owner()
@@ -310,8 +381,7 @@ class DevCog(commands.Cog, name="Developer"):
         Cara pakai: !force_give @Player title 5001
         Cara pakai: !force_give @Player item 101
         """
-        from database import add_title_to_player, get_player_inventory, update_player_data
-        import json
+        from database import add_title_to_player, add_player_item
 
         if type.lower() == "title":
             # Kembalikan Title
@@ -320,13 +390,41 @@ class DevCog(commands.Cog, name="Developer"):
         
         elif type.lower() in ["item", "fish", "rod"]:
             # Kembalikan Item/Ikan/Joran (semua masuk inventory)
-            inventory = await get_player_inventory(self.bot.db, target.id)
-            inventory.append(item_id)
-            await update_player_data(self.bot.db, target.id, inventory=json.dumps(inventory))
+            await add_player_item(self.bot.db, target.id, item_id, kind="fish" if type.lower() == "fish" else "item")
             await ctx.send(f"✅ Berhasil memaksa masuk **Item ID {item_id}** ke inventory **{target.display_name}**.")
         
         else:
             await ctx.send("❌ Tipe salah! Gunakan: `title` atau `item`.")
 
+    @commands.command(name="backup")
+    @commands.is_owner()
+    async def backup_cmd(self, ctx: commands.Context):
+        """Membuat snapshot database sekarang juga."""
+        result = await create_backup(self.bot.db)
+        prune_backups()
+        await ctx.send(f"✅ Snapshot `{result['name']}` dibuat ({result['size'] / 1024:.0f} KB).\nSHA-256: `{result['checksum'][:16]}…`")
+
+    @commands.command(name="backups")
+    @commands.is_owner()
+    async def list_backups_cmd(self, ctx: commands.Context):
+        """Menampilkan snapshot yang tersedia untuk di-restore."""
+        names = list_backups()
+        if not names: return await ctx.send("Belum ada snapshot.")
+        lines = [f"`{name}`" for name in names[:15]]
+        if len(names) > 15: lines.append(f"... dan {len(names) - 15} lainnya")
+        await ctx.send(embed=discord.Embed(title="🗄️ Snapshot Database", description="\n".join(lines), color=discord.Color.blue()))
+
+    @commands.command(name="restore")
+    @commands.is_owner()
+    async def restore_cmd(self, ctx: commands.Context, backup_name: str):
+        """
+        Memulihkan database dari snapshot.
+        Cara pakai: !restore mahadven-20250101-120000.db
+        """
+        if backup_name not in list_backups():
+            return await ctx.send("❌ Snapshot tidak ditemukan. Lihat daftar dengan `!backups`.")
+        view = ConfirmRestoreView(self.bot, ctx.author.id, backup_name)
+        await ctx.send(f"⚠️ Database akan diganti dengan isi `{backup_name}`. Data setelah snapshot itu akan hilang.", view=view)
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(DevCog(bot))
\ No newline at end of file
@@ -1,14 +1,12 @@
 import discord
 from discord.ext import commands
-import json
-import os
 import time
 import datetime
 import pytz 
 import traceback
 import random
 from collections import Counter
-from database import get_player_data, update_player_data, get_player_inventory
+from database import get_player_data, get_player_inventory, add_player_item, update_player_json
 from ._utils import BotColors
 
 # Zona Waktu WIB
@@ -18,6 +16,19 @@ WIB = pytz.timezone('Asia/Jakarta')
 UPGRADE_BASE_COST = 5000
 MAX_SLOTS_LIMIT = 12
 
+def _empty_slot() -> dict:
+    return {"status": "empty", "plant_id": None, "planted_at": 0, "last_watered": 0, "accumulated_growth": 0}
+
+def _ensure_farm_slots(farm_data: dict):
+    """Melengkapi struktur ladang (dipakai lewat `update_player_json`); None jika tidak ada yang berubah."""
+    changed = 'max_slots' not in farm_data or 'slots' not in farm_data
+    farm_data.setdefault('max_slots', 6)
+    farm_data.setdefault('slots', [])
+    while len(farm_data['slots']) < farm_data['max_slots']:
+        farm_data['slots'].append(_empty_slot())
+        changed = True
+    return {} if changed else None
+
 # ===================================================================================
 # VIEW: TOKO TANI (FARM SHOP)
 # ===================================================================================
@@ -63,15 +74,11 @@ class FarmShopView(discord.ui.View):
             plant = self.cog.plants[plant_id]
             price = plant['price_buy']
             
-            player_data = await get_player_data(self.cog.bot.db, self.user.id)
-            if player_data.get('prisma', 0) < price:
+            if not await add_player_item(self.cog.bot.db, self.user.id, plant_id, kind="seed", prisma=-price):
                 return await interaction.followup.send(f"❌ Prisma kurang! Butuh **{price} 💎**.", ephemeral=True)
 
-            inventory = await get_player_inventory(self.cog.bot.db, self.user.id)
-            new_prisma = player_data['prisma'] - price
-            inventory.append(plant_id)
-            
-            await update_player_data(self.cog.bot.db, self.user.id, prisma=new_prisma, inventory=json.dumps(inventory))
+            player_data = await get_player_data(self.cog.bot.db, self.user.id)
+            new_prisma = player_data['prisma']
             
             embed = self.cog.create_shop_embed(self.user, new_prisma)
             await interaction.edit_original_response(embed=embed, view=self)
@@ -175,31 +182,29 @@ class FarmingView(discord.ui.View):
         try:
             await interaction.response.defer()
             seed_id = interaction.data['values'][0]
-            
             empty_idx = -1
-            limit = self.farm_data.get('max_slots', 6)
-            
-            for i in range(limit):
-                if i < len(self.farm_data['slots']):
-                    if self.farm_data['slots'][i]['status'] == 'empty':
+
+            def plant(farm_data):
+                # Petak kosong dicari di farm_data terkini; bibit diambil di op yang sama
+                nonlocal empty_idx
+                slots = farm_data.get('slots', [])
+                for i in range(min(farm_data.get('max_slots', 6), len(slots))):
+                    if slots[i]['status'] == 'empty':
                         empty_idx = i
-                        break
-            
-            if empty_idx == -1:
-                return await interaction.followup.send("❌ Ladang penuh! Panen dulu atau Beli Petak Baru.", ephemeral=True)
-
-            current_inv = await get_player_inventory(self.cog.bot.db, self.user.id)
-            if seed_id in current_inv:
-                current_inv.remove(seed_id)
-                self.farm_data['slots'][empty_idx] = {
-                    "status": "growing",
-                    "plant_id": seed_id,
-                    "planted_at": time.time(),
-                    "last_watered": time.time(),
-                    "accumulated_growth": 0
-                }
-                await update_player_data(self.cog.bot.db, self.user.id, inventory=json.dumps(current_inv), farm_data=json.dumps(self.farm_data))
+                        slots[i] = {
+                            "status": "growing",
+                            "plant_id": seed_id,
+                            "planted_at": time.time(),
+                            "last_watered": time.time(),
+                            "accumulated_growth": 0
+                        }
+                        return {"remove_items": {seed_id: 1}}
+                return None
+
+            if await update_player_json(self.cog.bot.db, self.user.id, 'farm_data', plant) is not None:
                 await self.cog.refresh_farm_ui(interaction, message=f"🌱 Menanam **{self.cog.plants[seed_id]['name']}** di Petak #{empty_idx+1}.")
+            elif empty_idx == -1:
+                await interaction.followup.send("❌ Ladang penuh! Panen dulu atau Beli Petak Baru.", ephemeral=True)
             else:
                 await interaction.followup.send("❌ Bibit tidak ditemukan.", ephemeral=True)
         except Exception as e:
@@ -236,17 +241,11 @@ class FarmingView(discord.ui.View):
 class FarmingCog(commands.Cog, name="Pertanian"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.plants = {}
-        self._load_plants()
 
-    def _load_plants(self):
-        try:
-            path = os.path.join(os.path.dirname(__file__), '..', 'data', 'plants.json')
-            if not os.path.exists(path): path = 'data/plants.json'
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.plants = {p['id']: p for p in data}
-        except Exception as e: print(f"Error plants.json: {e}")
+    @property
+    def plants(self):
+        """{id: tanaman} dari katalog bersama."""
+        return self.bot.catalog.index("plants")
 
     # --- SYSTEM: CUACA & WAKTU ---
     def get_weather(self):
@@ -303,13 +302,9 @@ class FarmingCog(commands.Cog, name="Pertanian"):
         player_data = await get_player_data(self.bot.db, ctx.author.id)
         if not player_data: return await ctx.send("Daftar dulu dengan `!debut`!")
 
-        farm_data = json.loads(player_data.get('farm_data') or '{}')
-        if 'max_slots' not in farm_data: farm_data['max_slots'] = 6
-        if 'slots' not in farm_data: farm_data['slots'] = []
-        while len(farm_data['slots']) < farm_data['max_slots']:
-             farm_data['slots'].append({"status": "empty", "plant_id": None, "planted_at": 0, "last_watered": 0, "accumulated_growth": 0})
-        
-        await update_player_data(self.bot.db, ctx.author.id, farm_data=json.dumps(farm_data))
+        farm_data = player_data.json('farm_data')
+        if len(farm_data.get('slots', [])) < farm_data.get('max_slots', 6) or 'max_slots' not in farm_data:
+            farm_data = await update_player_json(self.bot.db, ctx.author.id, 'farm_data', _ensure_farm_slots) or farm_data
         
         inventory = await get_player_inventory(self.bot.db, ctx.author.id)
         
@@ -320,7 +315,7 @@ class FarmingCog(commands.Cog, name="Pertanian"):
     async def upgrade_farm(self, interaction):
         await interaction.response.defer()
         player_data = await get_player_data(self.bot.db, interaction.user.id)
-        farm_data = json.loads(player_data.get('farm_data'))
+        farm_data = player_data.json('farm_data')
         
         current_slots = farm_data.get('max_slots', 6)
         if current_slots >= MAX_SLOTS_LIMIT:
@@ -335,38 +330,49 @@ class FarmingCog(commands.Cog, name="Pertanian"):
         if player_data.get('prisma', 0) < cost:
             return await interaction.followup.send(f"❌ Uang kurang! Butuh **{cost} 💎** untuk menambah 1 petak.", ephemeral=True)
             
-        new_prisma = player_data['prisma'] - cost
-        farm_data['max_slots'] += 1
-        farm_data['slots'].append({"status": "empty", "plant_id": None, "planted_at": 0, "last_watered": 0, "accumulated_growth": 0})
-        
-        await update_player_data(self.bot.db, interaction.user.id, prisma=new_prisma, farm_data=json.dumps(farm_data))
+        stale = False
+        def upgrade(farm_data):
+            # Jumlah slot dicek ulang di farm_data terkini; prisma dipotong sebagai delta bersaldo-aman di op yang sama
+            nonlocal stale
+            if farm_data.get('max_slots', 6) != current_slots:
+                stale = True
+                return None
+            _ensure_farm_slots(farm_data)
+            farm_data['max_slots'] += 1
+            farm_data['slots'].append(_empty_slot())
+            return {"deltas": {"prisma": -cost}}
+
+        farm_data = await update_player_json(self.bot.db, interaction.user.id, 'farm_data', upgrade)
+        if farm_data is None:
+            if stale: return await self.refresh_farm_ui(interaction, message="Ladang sudah diperluas, coba lagi.")
+            return await interaction.followup.send(f"❌ Uang kurang! Butuh **{cost} 💎** untuk menambah 1 petak.", ephemeral=True)
         await self.refresh_farm_ui(interaction, message=f"🔨 Ladang diperluas! Slot sekarang: **{farm_data['max_slots']}**.")
 
     async def water_all(self, interaction):
         await interaction.response.defer()
         user_id = interaction.user.id
-        player_data = await get_player_data(self.bot.db, user_id)
-        farm_data = json.loads(player_data.get('farm_data'))
-
         watered_count = 0
-        now = time.time()
 
-        for slot in farm_data['slots']:
-            if slot['status'] != 'empty':
-                plant = self.plants.get(slot['plant_id'])
-                if not plant: continue
+        def water(farm_data):
+            nonlocal watered_count
+            now = time.time()
+            for slot in farm_data.get('slots', []):
+                if slot['status'] != 'empty':
+                    plant = self.plants.get(slot['plant_id'])
+                    if not plant: continue
 
-                time_diff = now - slot['last_watered']
-                valid_growth = min(time_diff, plant['water_interval'])
-                
-                if slot['accumulated_growth'] < plant['growth_time']:
-                     slot['accumulated_growth'] += valid_growth
-                
-                slot['last_watered'] = now
-                watered_count += 1
-        
+                    time_diff = now - slot['last_watered']
+                    valid_growth = min(time_diff, plant['water_interval'])
+                    
+                    if slot['accumulated_growth'] < plant['growth_time']:
+                         slot['accumulated_growth'] += valid_growth
+                    
+                    slot['last_watered'] = now
+                    watered_count += 1
+            return {} if watered_count else None
+
+        await update_player_json(self.bot.db, user_id, 'farm_data', water)
         if watered_count > 0:
-            await update_player_data(self.bot.db, user_id, farm_data=json.dumps(farm_data))
             await self.refresh_farm_ui(interaction, message=f"💧 {watered_count} tanaman disiram!")
         else:
             await interaction.followup.send("Tidak ada tanaman.", ephemeral=True)
@@ -374,28 +380,27 @@ class FarmingCog(commands.Cog, name="Pertanian"):
     async def harvest_all(self, interaction):
         await interaction.response.defer()
         user_id = interaction.user.id
-        player_data = await get_player_data(self.bot.db, user_id)
-        farm_data = json.loads(player_data.get('farm_data'))
-        inventory = await get_player_inventory(self.bot.db, user_id)
-
         harvested = []
         total_xp = 0
 
-        for i, slot in enumerate(farm_data['slots']):
-            if slot['status'] != 'empty':
-                if self.check_is_ready(slot):
-                    plant = self.plants.get(slot['plant_id'])
-                    crop_id = slot['plant_id'].replace("seed_", "")
-                    
-                    inventory.append(crop_id)
-                    harvested.append(f"{plant['name']}")
-                    total_xp += plant['xp_reward']
-                    farm_data['slots'][i] = {"status": "empty", "plant_id": None, "planted_at": 0, "last_watered": 0, "accumulated_growth": 0}
-
+        def harvest(farm_data):
+            # Petak siap panen dicek di farm_data terkini, lalu hasil panen, EXP, dan petak kosong
+            # ditulis dalam op yang sama: dua panen bersamaan tidak bisa memanen petak yang sama
+            nonlocal total_xp
+            crops = Counter()
+            for i, slot in enumerate(farm_data.get('slots', [])):
+                if slot['status'] != 'empty':
+                    if self.check_is_ready(slot):
+                        plant = self.plants.get(slot['plant_id'])
+                        crops[slot['plant_id'].replace("seed_", "")] += 1
+                        harvested.append(f"{plant['name']}")
+                        total_xp += plant['xp_reward']
+                        farm_data['slots'][i] = _empty_slot()
+            if not crops: return None
+            return {"add_items": crops, "deltas": {"exp": total_xp}, "kind": "crop"}
+
+        await update_player_json(self.bot.db, user_id, 'farm_data', harvest)
         if harvested:
-            new_exp = player_data['exp'] + total_xp
-            await update_player_data(self.bot.db, user_id, farm_data=json.dumps(farm_data), inventory=json.dumps(inventory), exp=new_exp)
-            
             counts = Counter(harvested)
             display_list = [f"{name} x{cnt}" for name, cnt in counts.items()]
             await self.refresh_farm_ui(interaction, message=f"🌾 Panen: **{', '.join(display_list)}** | XP +{total_xp}")
@@ -405,7 +410,7 @@ class FarmingCog(commands.Cog, name="Pertanian"):
     async def refresh_farm_ui(self, interaction, message=None):
         try:
             player_data = await get_player_data(self.bot.db, interaction.user.id)
-            farm_data = json.loads(player_data.get('farm_data'))
+            farm_data = player_data.json('farm_data')
             inventory = await get_player_inventory(self.bot.db, interaction.user.id)
             
             embed = self.create_farm_embed(interaction.user, farm_data)
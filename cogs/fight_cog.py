@@ -5,7 +5,8 @@ import math
 from typing import Optional, List
 
 # Mengimpor CombatSession yang baru dan daftar pertarungan aktif
-from game_logic.combat_logic import CombatSession, active_players, get_player_data
+from game_logic.combat_logic import CombatSession, active_players
+from database import get_player_fields
 
 # ===================================================================================
 # [BARU] PEMETAAN STATUS KE EMOJI & FUNGSI HELPER
@@ -275,7 +276,7 @@ class CombatView(discord.ui.View):
         self.clear_items()
         active_participant = self.session.current_turn_participant
         is_player_turn = active_participant.get('is_player', False) and not self.session.game_over
-        is_silenced = any(e.get('type') == 'silence' for e in active_participant.get('status_effects', []))
+        is_silenced = active_participant['status_effects'].has_type('silence')
 
         attack_button = discord.ui.Button(label="Serang", style=discord.ButtonStyle.danger, emoji="⚔️", disabled=not is_player_turn, row=0)
         attack_button.callback = self.attack_callback
@@ -330,7 +331,7 @@ class CombatView(discord.ui.View):
 
         # [PERBAIKAN KUNCI] Jalankan efek awal giliran (termasuk pengurangan cooldown) UNTUK PEMAIN
         participant = self.session.current_turn_participant
-        is_skipped = await self.session._apply_turn_start_effects_and_check_skip(participant)
+        is_skipped = await self.session.begin_turn(participant)
         
         # Perbarui UI untuk menunjukkan efek DoT/HoT dan pengurangan cooldown yang baru saja terjadi
         await self.update_message(interaction)
@@ -552,13 +553,13 @@ class FightCog(commands.Cog, name="Pertarungan"):
         if not is_tourney_match:
             try:
                 p1_user = p1_entity # Ganti nama variabel agar lebih jelas
-                p1_data = await get_player_data(self.bot.db, p1_user.id)
+                p1_data = await get_player_fields(self.bot.db, p1_user.id, 'equipped_title_id')
                 if not p1_data or not p1_data.get('equipped_title_id'):
                     await channel.send(f"❌ Pertarungan tidak bisa dimulai karena **{p1_user.display_name}** belum melakukan debut atau datanya tidak ditemukan.")
                     return
 
                 if isinstance(p2_entity, discord.Member):
-                    p2_data = await get_player_data(self.bot.db, p2_entity.id)
+                    p2_data = await get_player_fields(self.bot.db, p2_entity.id, 'equipped_title_id')
                     if not p2_data or not p2_data.get('equipped_title_id'):
                         await channel.send(f"❌ Pertarungan tidak bisa dimulai karena **{p2_entity.display_name}** belum melakukan debut atau datanya tidak ditemukan.")
                         return
@@ -604,12 +605,10 @@ class FightCog(commands.Cog, name="Pertarungan"):
         Melakukan tantangan pvp dengan player lain.
         """
         # [IMPLEMENTASI BARU] Pemeriksaan debut untuk kedua pemain
-        player_data = await self.bot.db.execute("SELECT equipped_title_id FROM players WHERE user_id = ?", (ctx.author.id,))
-        if not await player_data.fetchone():
+        if await get_player_fields(self.bot.db, ctx.author.id, 'equipped_title_id') is None:
             return await ctx.send(f"Kamu harus melakukan debut terlebih dahulu dengan `{self.bot.command_prefix}debut` sebelum bisa bertarung!", ephemeral=True)
 
-        opponent_data = await self.bot.db.execute("SELECT equipped_title_id FROM players WHERE user_id = ?", (lawan.id,))
-        if not await opponent_data.fetchone():
+        if await get_player_fields(self.bot.db, lawan.id, 'equipped_title_id') is None:
             return await ctx.send(f"**{lawan.display_name}** belum melakukan debut dan tidak bisa ditantang.", ephemeral=True)
         # --- Akhir Implementasi Baru ---
 
@@ -649,8 +648,7 @@ class FightCog(commands.Cog, name="Pertarungan"):
         Melakukan pertarungan dengan monsters.
         """
         # [IMPLEMENTASI BARU] Pemeriksaan debut
-        player_data = await self.bot.db.execute("SELECT equipped_title_id FROM players WHERE user_id = ?", (ctx.author.id,))
-        if not await player_data.fetchone():
+        if await get_player_fields(self.bot.db, ctx.author.id, 'equipped_title_id') is None:
             return await ctx.send(f"Kamu harus melakukan debut terlebih dahulu dengan `{self.bot.command_prefix}debut` sebelum bisa berlatih!", ephemeral=True)
         # --- Akhir Implementasi Baru ---
 
@@ -8,7 +8,10 @@ import time
 from collections import Counter
 import traceback
 
-from database import get_player_data, update_player_data, get_player_inventory
+from database import (
+    get_player_data, get_player_inventory,
+    add_player_item, remove_player_item, clear_player_items, update_player_json
+)
 # Import BotColors dari utils
 from ._utils import BotColors
 
@@ -16,6 +19,12 @@ from ._utils import BotColors
 ARROWS = {"UP": "⬆️", "DOWN": "⬇️", "LEFT": "⬅️", "RIGHT": "➡️"}
 ARROW_KEYS = list(ARROWS.keys())
 
+def _init_fishing_data(fishing_data: dict):
+    """Mengisi data memancing default (dipakai lewat `update_player_json`); None jika sudah terisi."""
+    if fishing_data: return None
+    fishing_data.update({"inventory": ["rod_basic"], "equipped": {"rod": "rod_basic", "charm": None}, "aquarium": []})
+    return {}
+
 # ===================================================================================
 # VIEW PERMAINAN (DIFFICULTY SCALING - BLIND MODE)
 # ===================================================================================
@@ -102,9 +111,8 @@ class FishingGameView(discord.ui.View):
 
     async def handle_win(self, interaction: discord.Interaction):
         self.stop()
-        player_inventory = await get_player_inventory(self.cog.bot.db, self.ctx.author.id)
-        player_inventory.append(self.fish['id'])
-        await update_player_data(self.cog.bot.db, self.ctx.author.id, inventory=json.dumps(player_inventory))
+        await add_player_item(self.cog.bot.db, self.ctx.author.id, self.fish['id'], kind="fish")
+        self.cog.record_quest_progress(self.ctx.author.id, 'CATCH_FISH')
 
         # Menggunakan palet warna dari BotColors
         rarity_colors = {
@@ -263,15 +271,11 @@ class FishBagView(discord.ui.View):
         await interaction.response.defer()
         try:
             fish_id = int(interaction.data['values'][0])
-            inventory = await get_player_inventory(self.cog.bot.db, self.ctx.author.id)
-            player_data = await get_player_data(self.cog.bot.db, self.ctx.author.id)
+            fish_data = self.cog.get_fish_data(fish_id)
             
-            if fish_id in inventory:
-                fish_data = self.cog.get_fish_data(fish_id)
-                inventory.remove(fish_id)
-                
-                new_prisma = player_data.get('prisma', 0) + fish_data['price']
-                await update_player_data(self.cog.bot.db, self.ctx.author.id, inventory=json.dumps(inventory), prisma=new_prisma)
+            if fish_data and await remove_player_item(self.cog.bot.db, self.ctx.author.id, fish_id, prisma=fish_data['price']):
+                self.cog.record_quest_progress(self.ctx.author.id, 'EARN_PRISMA', fish_data['price'])
+                inventory = await get_player_inventory(self.cog.bot.db, self.ctx.author.id)
                 
                 self.inventory_list = inventory
                 self.build_components()
@@ -287,26 +291,15 @@ class FishBagView(discord.ui.View):
     async def sell_all_callback(self, interaction: discord.Interaction):
         await interaction.response.defer()
         try:
-            inventory = await get_player_inventory(self.cog.bot.db, self.ctx.author.id)
-            player_data = await get_player_data(self.cog.bot.db, self.ctx.author.id)
+            fish_prices = {f['id']: f['price'] for f in self.cog.fishes}
+            sold = await clear_player_items(self.cog.bot.db, self.ctx.author.id, fish_prices, credit_prices=fish_prices)
             
-            total_earnings = 0
-            sold_count = 0
-            new_inventory = []
-            fish_ids = [f['id'] for f in self.cog.fishes]
-
-            for item_id in inventory:
-                if item_id in fish_ids:
-                    fish_data = self.cog.get_fish_data(item_id)
-                    if fish_data:
-                        total_earnings += fish_data['price']
-                        sold_count += 1
-                else:
-                    new_inventory.append(item_id)
+            total_earnings = sum(fish_prices[item_id] * qty for item_id, qty in sold.items())
+            sold_count = sum(sold.values())
 
             if sold_count > 0:
-                new_prisma = player_data.get('prisma', 0) + total_earnings
-                await update_player_data(self.cog.bot.db, self.ctx.author.id, inventory=json.dumps(new_inventory), prisma=new_prisma)
+                self.cog.record_quest_progress(self.ctx.author.id, 'EARN_PRISMA', total_earnings)
+                new_inventory = await get_player_inventory(self.cog.bot.db, self.ctx.author.id)
                 
                 self.inventory_list = new_inventory
                 self.build_components()
@@ -321,18 +314,13 @@ class FishBagView(discord.ui.View):
             await interaction.followup.send(f"Error: {e}", ephemeral=True)
 
     async def _move_item(self, interaction, fish_id, to_aquarium):
-        inventory = await get_player_inventory(self.cog.bot.db, self.ctx.author.id)
-        player_data = await get_player_data(self.cog.bot.db, self.ctx.author.id)
-        
-        fishing_data = json.loads(player_data.get('fishing_data') or '{"aquarium": []}')
-        aquarium = fishing_data.get('aquarium', [])
+        def store(fishing_data):
+            # Ikan diambil dari tas dan ditambahkan ke aquarium terkini dalam satu op penulis
+            fishing_data.setdefault('aquarium', []).append(fish_id)
+            return {"remove_items": {fish_id: 1}}
 
-        if fish_id in inventory:
-            inventory.remove(fish_id)
-            aquarium.append(fish_id)
-            fishing_data['aquarium'] = aquarium
-            
-            await update_player_data(self.cog.bot.db, self.ctx.author.id, inventory=json.dumps(inventory), fishing_data=json.dumps(fishing_data))
+        if await update_player_json(self.cog.bot.db, self.ctx.author.id, 'fishing_data', store) is not None:
+            inventory = await get_player_inventory(self.cog.bot.db, self.ctx.author.id)
             
             self.inventory_list = inventory
             self.build_components()
@@ -401,19 +389,16 @@ class AquariumView(discord.ui.View):
         try:
             fish_id = int(interaction.data['values'][0])
             
-            inventory = await get_player_inventory(self.cog.bot.db, self.ctx.author.id)
-            player_data = await get_player_data(self.cog.bot.db, self.ctx.author.id)
-            
-            fishing_data = json.loads(player_data.get('fishing_data') or '{"aquarium": []}')
-            aquarium = fishing_data.get('aquarium', [])
-
-            if fish_id in aquarium:
+            def withdraw(fishing_data):
+                # Keberadaan ikan dicek di aquarium terkini; klik ganda tidak bisa menyalinnya dua kali
+                aquarium = fishing_data.get('aquarium', [])
+                if fish_id not in aquarium: return None
                 aquarium.remove(fish_id)
-                inventory.append(fish_id)
-                fishing_data['aquarium'] = aquarium
-                
-                await update_player_data(self.cog.bot.db, self.ctx.author.id, inventory=json.dumps(inventory), fishing_data=json.dumps(fishing_data))
-                
+                return {"add_items": {fish_id: 1}, "kind": "fish"}
+
+            fishing_data = await update_player_json(self.cog.bot.db, self.ctx.author.id, 'fishing_data', withdraw)
+            if fishing_data is not None:
+                aquarium = fishing_data.get('aquarium', [])
                 self.aquarium_list = aquarium
                 self.build_components()
                 
@@ -461,11 +446,20 @@ class FishingItemPreviewView(discord.ui.View):
         if player_data.get('prisma', 0) < self.item['price']:
             return await interaction.followup.send("❌ Saldo Prisma tidak mencukupi!", ephemeral=True)
 
-        # Proses Transaksi
-        new_prisma = player_data.get('prisma', 0) - self.item['price']
-        fishing_data['inventory'].append(self.item_id)
-        
-        await update_player_data(self.cog.bot.db, self.ctx.author.id, prisma=new_prisma, fishing_data=json.dumps(fishing_data))
+        # Proses Transaksi: kepemilikan dicek ulang dan harga dipotong sebagai delta dalam op yang sama
+        owned = False
+        def buy(fishing_data):
+            nonlocal owned
+            inventory = fishing_data.setdefault("inventory", ["rod_basic"])
+            if self.item_id in inventory:
+                owned = True
+                return None
+            inventory.append(self.item_id)
+            return {"deltas": {"prisma": -self.item['price']}}
+
+        if await update_player_json(self.cog.bot.db, self.ctx.author.id, 'fishing_data', buy) is None:
+            msg = "❌ Kamu sudah memiliki item ini!" if owned else "❌ Saldo Prisma tidak mencukupi!"
+            return await interaction.followup.send(msg, ephemeral=True)
         
         # Feedback Sukses
         embed = discord.Embed(
@@ -641,17 +635,19 @@ class FishingLoadoutView(discord.ui.View):
     async def equip_callback(self, interaction: discord.Interaction):
         val = interaction.data['values'][0]
         cid = interaction.data['custom_id']
-        if 'equipped' not in self.fishing_data: self.fishing_data['equipped'] = {}
         
-        msg = ""
-        if cid == "rod_select":
-            self.fishing_data['equipped']['rod'] = val
-            msg = f"🎣 Joran diganti."
-        else:
-            if val == "unequip": self.fishing_data['equipped']['charm'] = None; msg = "📿 Charm dilepas."
-            else: self.fishing_data['equipped']['charm'] = val; msg = f"📿 Charm diganti."
+        if cid == "rod_select": msg = f"🎣 Joran diganti."
+        elif val == "unequip": msg = "📿 Charm dilepas."
+        else: msg = f"📿 Charm diganti."
+
+        def equip(fishing_data):
+            # Hanya slot equipment yang diubah; isi aquarium/inventory terkini tidak ditimpa
+            equipped = fishing_data.setdefault('equipped', {})
+            if cid == "rod_select": equipped['rod'] = val
+            else: equipped['charm'] = None if val == "unequip" else val
+            return {}
 
-        await update_player_data(self.cog.bot.db, self.ctx.author.id, fishing_data=json.dumps(self.fishing_data))
+        self.fishing_data = await update_player_json(self.cog.bot.db, self.ctx.author.id, 'fishing_data', equip) or self.fishing_data
         self.clear_items(); self.build_menus(); self.add_item(self.back_button)
         
         await interaction.response.edit_message(view=self)
@@ -818,8 +814,10 @@ class FishingPanelView(discord.ui.View):
             player_data = await get_player_data(self.cog.bot.db, self.ctx.author.id)
             raw_data = player_data.get('fishing_data')
             if not raw_data:
-                fishing_data = {"inventory": ["rod_basic"], "equipped": {"rod": "rod_basic", "charm": None}, "aquarium": []}
-                await update_player_data(self.cog.bot.db, self.ctx.author.id, fishing_data=json.dumps(fishing_data))
+                fishing_data = await update_player_json(self.cog.bot.db, self.ctx.author.id, 'fishing_data', _init_fishing_data)
+                if fishing_data is None:
+                    fishing_data = {}
+                    _init_fishing_data(fishing_data)
             else:
                 fishing_data = json.loads(raw_data)
                 
@@ -838,33 +836,28 @@ class FishingPanelView(discord.ui.View):
 class FishingCog(commands.Cog, name="Memancing"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.fishes = []
-        self.fishing_items = {} 
-        self._load_fishes()
-        self._load_fishing_items()
         
         # Dictionary untuk menyimpan sesi auto-fishing
         # Format: {user_id: {'task': asyncio.Task, 'last_active': float}}
         self.autofish_sessions = {}
 
-    def _load_fishes(self):
-        try:
-            path = os.path.join(os.path.dirname(__file__), '..', 'data', 'fishes.json')
-            if not os.path.exists(path): path = 'data/fishes.json'
-            with open(path, 'r', encoding='utf-8') as f: self.fishes = json.load(f)
-        except Exception as e: print(f"Error loading fishes.json: {e}")
+    # --- Data dari katalog bersama ---
+    @property
+    def fishes(self) -> tuple:
+        return self.bot.catalog.all("fishes")
 
-    def _load_fishing_items(self):
-        try:
-            path = os.path.join(os.path.dirname(__file__), '..', 'data', 'fishing_items.json')
-            if not os.path.exists(path): path = 'data/fishing_items.json'
-            with open(path, 'r', encoding='utf-8') as f:
-                items_list = json.load(f)
-                for item in items_list: self.fishing_items[item['id']] = item
-        except Exception as e: print(f"Error loading fishing_items.json: {e}")
+    @property
+    def fishing_items(self):
+        """{id: item} alat pancing."""
+        return self.bot.catalog.index("fishing_items")
 
     def get_fish_data(self, fish_id):
-        return next((f for f in self.fishes if f['id'] == fish_id), None)
+        return self.bot.catalog.fish(fish_id)
+
+    def record_quest_progress(self, user_id, quest_type, amount=1):
+        """Meneruskan event memancing ke akumulator progres misi (tanpa query DB)."""
+        quest_cog = self.bot.get_cog("Misi")
+        if quest_cog: quest_cog.record_progress(user_id, quest_type, amount)
     
     # --- LOGIKA RNG TERPUSAT (DIPERLUKAN UNTUK MANUAL DAN AUTO) ---
     def _calculate_catch_result(self, total_luck, is_auto=False):
@@ -931,11 +924,11 @@ class FishingCog(commands.Cog, name="Memancing"):
         )[0]
 
         # 5. Ambil ikan spesifik dari rarity terpilih
-        potential_fishes = [f for f in self.fishes if f['rarity'] == rarity_choice]
+        potential_fishes = self.bot.catalog.by_rarity("fishes", rarity_choice)
         
         # Fallback jika list kosong (misal luck rendah, legendary belum terbuka)
         if not potential_fishes: 
-            potential_fishes = [f for f in self.fishes if f['rarity'] == "Common"]
+            potential_fishes = self.bot.catalog.by_rarity("fishes", "Common")
             
         return random.choice(potential_fishes)
     
@@ -1082,9 +1075,8 @@ class FishingCog(commands.Cog, name="Memancing"):
                 caught_fish = self._calculate_catch_result(total_luck, is_auto=True)
                 
                 # Simpan ke Database
-                curr_inv = await get_player_inventory(self.bot.db, user_id)
-                curr_inv.append(caught_fish['id'])
-                await update_player_data(self.bot.db, user_id, inventory=json.dumps(curr_inv))
+                await add_player_item(self.bot.db, user_id, caught_fish['id'], kind="fish")
+                self.record_quest_progress(user_id, 'CATCH_FISH')
 
                 # Tampilkan Hasil
                 try: await message.edit(embed=self._get_auto_visual_embed('success', {'fish': caught_fish, 'user': ctx.author}))
@@ -1301,9 +1293,10 @@ class FishingCog(commands.Cog, name="Memancing"):
         
         fishing_data_raw = player_data.get('fishing_data')
         if not fishing_data_raw:
-            default_data = {"inventory": ["rod_basic"], "equipped": {"rod": "rod_basic", "charm": None}, "aquarium": []}
-            await update_player_data(self.bot.db, ctx.author.id, fishing_data=json.dumps(default_data))
-            fishing_data = default_data
+            fishing_data = await update_player_json(self.bot.db, ctx.author.id, 'fishing_data', _init_fishing_data)
+            if fishing_data is None:
+                fishing_data = {}
+                _init_fishing_data(fishing_data)
         else:
             fishing_data = json.loads(fishing_data_raw)
 
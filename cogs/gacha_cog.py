@@ -3,12 +3,10 @@ from discord.ext import commands
 import random
 from collections import defaultdict
 import asyncio
-import os
-import json
 from typing import Dict, Any
 
 # [PERBAIKAN] Impor fungsi baru untuk menyimpan artefak
-from database import get_player_data, update_player_data, add_title_to_player, get_player_titles, add_artifact_to_player
+from database import get_player_data, get_player_fields, add_player_values, add_currency, add_title_to_player, get_owned_title_ids, add_artifact_to_player
 from ._utils import BotColors
 
 # --- KONFIGURASI GACHA BARU ---
@@ -119,17 +117,17 @@ class GachaMainView(discord.ui.View):
 class GachaCog(commands.Cog, name="Gacha"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.pools = { "titles": defaultdict(list), "artifacts": defaultdict(list) }
         self.rarities = list(RARITY_RATES.keys())
         self.weights = list(RARITY_RATES.values())
 
-        for title in self.bot.titles:
-            self.pools["titles"][title.get('rarity')].append(title)
-        for artifact in self.bot.artifacts:
-            self.pools["artifacts"][artifact.get('rarity')].append(artifact)
+    @property
+    def pools(self) -> dict:
+        """Pool per rarity dari katalog bersama: {banner: {rarity: (record, ...)}}."""
+        catalog = self.bot.catalog
+        return {"titles": catalog.rarity_pools("titles"), "artifacts": catalog.rarity_pools("artifacts")}
 
     async def create_main_embed(self, user: discord.User) -> discord.Embed:
-        player_data = await get_player_data(self.bot.db, user.id)
+        player_data = await get_player_fields(self.bot.db, user.id, 'prisma', 'title_pity', 'artifact_pity') or {}
         embed = discord.Embed(title="Pusat Gacha MAHADVEN", description="Pilih banner di bawah untuk menggunakan Prismamu!", color=BotColors.DEFAULT)
         embed.set_author(name=user.display_name, icon_url=user.display_avatar.url)
         embed.add_field(name="👑 Banner Title", value=f"Pity Legendary: `{player_data.get('title_pity', 0)}/{PITY_THRESHOLD_LEGENDARY}`", inline=True)
@@ -138,8 +136,8 @@ class GachaCog(commands.Cog, name="Gacha"):
         return embed
 
     async def create_banner_embed(self, user: discord.User, banner_type: str) -> discord.Embed:
-        player_data = await get_player_data(self.bot.db, user.id)
         pity_key = f"{banner_type.rstrip('s')}_pity"
+        player_data = await get_player_fields(self.bot.db, user.id, 'prisma', pity_key) or {}
         banner_name = "Title" if banner_type == "titles" else "Artefak"
         embed = discord.Embed(title=f"Banner Gacha - {banner_name}", description="Gunakan tombol di bawah untuk melakukan tarikan.\nJaminan 1 item Epic atau lebih tinggi setiap 10 tarikan!", color=BotColors.RARE)
         embed.set_footer(text=f"Pity Legendary: {player_data.get(pity_key, 0)}/{PITY_THRESHOLD_LEGENDARY} | Prismamu: {player_data.get('prisma', 0):,} 💎")
@@ -175,7 +173,7 @@ class GachaCog(commands.Cog, name="Gacha"):
 
         pity_key = f"{view.banner_type.rstrip('s')}_pity"
         current_pity = player_data.get(pity_key, 0)
-        owned_title_ids = set(await get_player_titles(self.bot.db, interaction.user.id))
+        owned_title_ids = await get_owned_title_ids(self.bot.db, interaction.user.id)
 
         results = []
         has_high_rarity_in_multi = False
@@ -218,16 +216,24 @@ class GachaCog(commands.Cog, name="Gacha"):
         elif agency_id == "prism_project":
             total_compensation = int(total_compensation * 1.20)
         
-        final_prisma_total = player_data.get('prisma', 0) - cost + total_compensation
+        # Biaya dipotong atomik sebelum animasi (saldo dicek ulang di SQL, aman dari pull/kredit paralel)
+        new_pity = 0 if reset_pity else current_pity
+        spent = await add_player_values(self.bot.db, interaction.user.id, prisma=-cost, set_values={pity_key: new_pity})
+        if spent is None:
+            await interaction.followup.send(f"Prismamu tidak cukup! Butuh {cost}.", ephemeral=True)
+            for item in view.children: item.disabled = False
+            await interaction.edit_original_response(view=view)
+            return
+
+        final_prisma_total = spent['prisma'] + total_compensation
         await self._run_pull_animation(interaction, processed_results, final_prisma_total, total_compensation, view.banner_type)
 
         if view.banner_type == "titles":
             for title_id in newly_acquired_title_ids: await add_title_to_player(self.bot.db, interaction.user.id, title_id)
         elif view.banner_type == "artifacts":
             for artifact_id in newly_acquired_artifact_ids: await add_artifact_to_player(self.bot.db, interaction.user.id, artifact_id)
-        
-        new_pity = 0 if reset_pity else current_pity
-        await update_player_data(self.bot.db, interaction.user.id, **{pity_key: new_pity, 'prisma': final_prisma_total})
+        if total_compensation > 0:
+            await add_currency(self.bot.db, interaction.user.id, total_compensation)
         
         await asyncio.sleep(3)
         await self.show_banner(interaction, view.banner_type, is_refresh=True)
@@ -278,7 +284,7 @@ class GachaCog(commands.Cog, name="Gacha"):
                 compensation = DUPLICATE_COMPENSATION.get(item.get('rarity', 'Common'), 0)
                 
                 # [IMPLEMENTASI BARU] Terapkan bonus agensi pada pesan hasil single pull
-                player_data = await get_player_data(self.bot.db, interaction.user.id)
+                player_data = await get_player_fields(self.bot.db, interaction.user.id, 'agency_id') or {}
                 agency_id = player_data.get('agency_id')
                 if agency_id == "mahavirtual": compensation = int(compensation * 0.85)
                 elif agency_id == "prism_project": compensation = int(compensation * 1.20)
@@ -319,11 +325,8 @@ class GachaCog(commands.Cog, name="Gacha"):
         embed = await self.create_banner_embed(interaction.user, banner_type)
         
         attachments = []
-        banner_path = BANNER_IMAGES.get(banner_type)
-        if banner_path and os.path.exists(banner_path):
-            banner_file = discord.File(banner_path, filename=os.path.basename(banner_path))
-            attachments.append(banner_file)
-            embed.set_image(url=f"attachment://{os.path.basename(banner_path)}")
+        if banner_path := BANNER_IMAGES.get(banner_type):
+            if banner_file := await self.bot.assets.set_embed_image(embed, banner_path): attachments.append(banner_file)
 
         await interaction.edit_original_response(embed=embed, view=view, attachments=attachments)
         view.message = await interaction.original_response()
@@ -11,8 +11,9 @@ import traceback
 from database import (
     get_player_inventory,
     get_player_data,
-    update_player_data,
-    get_player_equipment
+    get_player_equipment,
+    remove_player_item,
+    clear_player_items
 )
 from ._utils import BotColors
 
@@ -90,13 +91,13 @@ class InventoryView(discord.ui.View):
         inventory_list = await get_player_inventory(self.bot.db, user_id)
         if not inventory_list: return
 
-        cleaned_list = [
+        invalid_ids = {
             item_id for item_id in inventory_list 
-            if self.bot.get_item_by_id(item_id) is not None and item_id != 0
-        ]
+            if self.bot.get_item_by_id(item_id) is None or item_id == 0
+        }
 
-        if len(cleaned_list) != len(inventory_list):
-            await update_player_data(self.bot.db, user_id, inventory=json.dumps(cleaned_list))
+        if invalid_ids:
+            await clear_player_items(self.bot.db, user_id, invalid_ids)
 
     async def _update_view(self, interaction: discord.Interaction = None):
         try:
@@ -341,19 +342,8 @@ class ConfirmSellButton(discord.ui.Button):
         view: InventoryView = self.view
         await interaction.response.defer()
 
-        inventory_list = await get_player_inventory(view.bot.db, view.author.id)
-        player_data = await get_player_data(view.bot.db, view.author.id)
-        current_prisma = player_data.get('prisma', 0)
-
-        if view.selected_item_id_to_sell in inventory_list:
-            inventory_list.remove(view.selected_item_id_to_sell)
-            
-            await update_player_data(
-                view.bot.db, 
-                view.author.id, 
-                inventory=json.dumps(inventory_list), 
-                prisma=current_prisma + self.sell_price
-            )
+        # Item diambil dan Prisma dikreditkan dalam satu transaksi
+        if await remove_player_item(view.bot.db, view.author.id, view.selected_item_id_to_sell, prisma=self.sell_price):
             
             item_data = view.bot.get_item_by_id(view.selected_item_id_to_sell)
             item_name = item_data.get('name', 'Unknown Item') if item_data else 'Unknown Item'
@@ -1,12 +1,15 @@
 import discord
 from discord.ui import Select, View
-from discord.ext import commands
+from discord.ext import commands, tasks
+import asyncio
 import datetime
 import math  # <--- [PENTING] Wajib ada agar tidak error
+import time
+from collections import defaultdict
 
 # Impor fungsi dan variabel yang diperlukan
 # Pastikan path import ini sesuai dengan struktur foldermu
-from database import get_all_player_data
+from database import get_leaderboard_page, get_leaderboard_rank, get_write_version
 from ._utils import BotColors
 
 # --- Helper Function Static (RUMUS BARU) ---
@@ -19,140 +22,143 @@ def _get_level_from_exp_static(total_exp: int) -> int:
     # Rumus ini hanya mengembalikan SATU angka (Level)
     return int(math.sqrt(total_exp / 100)) + 1
 
+LEADERBOARD_PAGE_SIZE = 10
+LEADERBOARD_CACHE_TTL = 60       # Umur maksimal snapshot (detik)
+LEADERBOARD_REFRESH_INTERVAL = 15 # Jeda loop refresh latar belakang (detik)
+LEADERBOARD_IDLE_TIMEOUT = 300   # Kategori yang tidak dilihat selama ini tidak di-refresh lagi
+LEADERBOARD_CACHED_PAGES = 5     # Halaman teratas yang disimpan di snapshot; halaman lebih jauh di-query per halaman
+LEADERBOARD_MAX_EXTRA_PAGES = 50 # Batas halaman di luar snapshot yang ikut disimpan sampai snapshot dibangun ulang
+
+LEADERBOARD_TITLES = {
+    "level": "🏆 Papan Peringkat - Level Tertinggi",
+    "subs": "👥 Papan Peringkat - Subscriber Terbanyak",
+    "prisma": "💎 Papan Peringkat - Prisma Terbanyak",
+    "pvp_wins": "⚔️ Papan Peringkat - Juara Arena (PvP Wins)",
+    "titles": "📚 Papan Peringkat - Kolektor Title",
+    "power": "⚡ Papan Peringkat - Power Score"
+}
+
+def _format_value(category: str, value) -> str:
+    """Teks nilai satu pemain sesuai kategori (nilai kategori 'level' berupa total EXP)."""
+    value = value or 0
+    if category == "level": return f"**Level {_get_level_from_exp_static(value)}** ({value:,} EXP)"
+    if category == "subs": return f"**{value:,}** Subscribers"
+    if category == "prisma": return f"**{value:,}** 💎"
+    if category == "pvp_wins": return f"**{value:,}** Kemenangan"
+    if category == "titles": return f"**{value}** Title"
+    if category == "power": return f"**{int(value):,}** Power"
+    return f"**{value:,}**"
+
+def _assign_ranks(ranks: dict, rows: list, start: int, first_rank: int = None):
+    """
+    Mengisi `ranks` {user_id: (rank, value)}: nilai sama = peringkat sama (konsisten dengan COUNT(*) WHERE value > ?).
+    `first_rank` dipakai untuk halaman lepas yang baris pertamanya bisa seri dengan halaman sebelumnya.
+    """
+    previous_value, rank = (rows[0][1], first_rank) if rows and first_rank else (None, 0)
+    for index, (user_id, value) in enumerate(rows, start=start):
+        if value != previous_value: rank, previous_value = index, value
+        ranks[user_id] = (rank, value)
+
+class LeaderboardSnapshot:
+    """
+    Halaman-halaman teratas satu kategori yang dipakai bersama semua viewer, beserta peta peringkatnya.
+    `rows` berisi paling banyak `LEADERBOARD_CACHED_PAGES` halaman (+1 baris penanda halaman berikutnya);
+    halaman lebih jauh yang pernah dibuka disimpan di `extra_pages`.
+    """
+    __slots__ = ("rows", "ranks", "extra_pages", "extra_ranks", "version", "created_at")
+
+    def __init__(self, rows: list, version: int):
+        self.rows = rows
+        self.extra_pages: dict[int, tuple[list, bool]] = {}
+        self.extra_ranks: dict[int, tuple[int, int]] = {}
+        self.version = version
+        self.created_at = time.monotonic()
+
+        self.ranks = {}
+        _assign_ranks(self.ranks, rows, 1)
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() - self.created_at < LEADERBOARD_CACHE_TTL
+
+    @property
+    def is_complete(self) -> bool:
+        """True jika seluruh leaderboard muat di `rows` (tidak ada pemain di luar snapshot)."""
+        return len(self.rows) <= LEADERBOARD_CACHED_PAGES * LEADERBOARD_PAGE_SIZE
+
+    def page(self, page: int, size: int = LEADERBOARD_PAGE_SIZE) -> tuple[list, bool] | None:
+        """(baris, ada_halaman_berikutnya), atau None jika halaman itu belum pernah diambil."""
+        start = page * size
+        if page < LEADERBOARD_CACHED_PAGES or self.is_complete:
+            return self.rows[start:start + size], len(self.rows) > start + size
+        return self.extra_pages.get(page)
+
+    def add_extra_page(self, page: int, rows: list, has_next: bool, first_rank: int = None):
+        """Menyimpan halaman di luar snapshot beserta peringkatnya (`first_rank` = peringkat baris pertama)."""
+        if len(self.extra_pages) >= LEADERBOARD_MAX_EXTRA_PAGES:
+            self.extra_pages.clear()
+            self.extra_ranks.clear()
+        self.extra_pages[page] = (rows, has_next)
+        _assign_ranks(self.extra_ranks, rows, page * LEADERBOARD_PAGE_SIZE + 1, first_rank)
+
+    def rank_of(self, user_id: int):
+        """(rank, value) pemain jika ada di halaman yang sudah diambil, selain itu None."""
+        return self.ranks.get(user_id) or self.extra_ranks.get(user_id)
+
 # --- Helper Function untuk Membuat Embed ---
-async def create_leaderboard_embed(bot: commands.Bot, author: discord.User, all_players_data: list, category: str) -> discord.Embed:
-    title_map = {
-        "level": "🏆 Papan Peringkat - Level Tertinggi",
-        "subs": "👥 Papan Peringkat - Subscriber Terbanyak",
-        "prisma": "💎 Papan Peringkat - Prisma Terbanyak",
-        "pvp_wins": "⚔️ Papan Peringkat - Juara Arena (PvP Wins)",
-        "titles": "📚 Papan Peringkat - Kolektor Title",
-        "power": "⚡ Papan Peringkat - Power Score"
-    }
-    
-    # --- Logika Sorting ---
-    if category == "power":
-        # Dapatkan ProfileCog untuk menggunakan fungsi kalkulasi statnya.
-        # Pastikan nama Cog di main.py atau setup kamu adalah "Profil"
-        profile_cog = bot.get_cog("Profil")
-        
-        # Fallback jika ProfileCog belum siap/error, agar lb tidak crash total
-        if not profile_cog:
-            # Kita hitung kasar saja jika cog tidak ketemu
-            for player in all_players_data:
-                # Rumus kasar tanpa bonus item/title jika cog error
-                base_power = (player.get('base_hp', 100) / 5) + (player.get('base_atk', 10) * 2)
-                player['power_score'] = base_power
-        else:
-            # Hitung Power Score Detail
-            for player in all_players_data:
-                user_id = player.get('user_id')
-                if not user_id:
-                    player['power_score'] = 0
-                    continue
-
-                # Ambil total stat dari ProfileCog
-                try:
-                    total_stats, _ = await profile_cog._get_total_and_bonus_stats(user_id, player)
-                    power_score = (
-                        (total_stats.get('hp', 100) / 5) +             
-                        (total_stats.get('atk', 10) * 2) +             
-                        (total_stats.get('def', 5) * 1.5) +            
-                        (total_stats.get('spd', 10) * 1.2) +           
-                        (total_stats.get('crit_rate', 0.05) * 200) +   
-                        ((total_stats.get('crit_dmg', 1.5) - 1.5) * 100) 
-                    )
-                    player['power_score'] = power_score
-                except Exception as e:
-                    print(f"Error calculating power for {user_id}: {e}")
-                    player['power_score'] = 0
-                    
-        sort_key = "power_score"
-
-    elif category == "titles":
-        sort_key = "title_count"
-    else:
-        sort_key_map = {"level": "exp", "subs": "subscribers", "prisma": "prisma", "pvp_wins": "pvp_wins"}
-        sort_key = sort_key_map.get(category, "exp") # Default ke exp jika key tidak ada
-
-    # Lakukan Sorting
-    sorted_players = sorted(all_players_data, key=lambda p: p.get(sort_key, 0), reverse=True)
-
-    embed = discord.Embed(title=title_map.get(category, "Leaderboard"), color=BotColors.SUCCESS, timestamp=datetime.datetime.utcnow())
+def create_leaderboard_embed(bot: commands.Bot, author: discord.User, rows: list, category: str, page: int = 0, user_rank: tuple = None, ranks: list = None) -> discord.Embed:
+    """
+    Embed satu halaman leaderboard; `user_rank` (rank, value) ditampilkan jika author tidak ada di halaman ini.
+    `ranks` berisi peringkat tiap baris (seri = peringkat sama); jika kosong, baris dinomori urut posisinya.
+    """
+    offset = page * LEADERBOARD_PAGE_SIZE
+    if ranks is None: ranks = range(offset + 1, offset + len(rows) + 1)
+
+    embed = discord.Embed(title=LEADERBOARD_TITLES.get(category, "Leaderboard"), color=BotColors.SUCCESS, timestamp=datetime.datetime.utcnow())
 
     description_lines = []
     rank_emojis = ["🥇", "🥈", "🥉"]
 
-    # Loop Top 10
-    for rank, player_data in enumerate(sorted_players[:10], start=1):
-        user = bot.get_user(player_data.get('user_id'))
-        # Jika user tidak ditemukan di cache bot (misal sudah keluar server), pakai nama placeholder atau skip
-        display_name = user.display_name if user else f"User#{player_data.get('user_id')}"
-
+    for rank, (user_id, value) in zip(ranks, rows):
+        user = bot.get_user(user_id)
+        # Jika user tidak ditemukan di cache bot (misal sudah keluar server), pakai nama placeholder
+        display_name = user.display_name if user else f"User#{user_id}"
         rank_display = rank_emojis[rank - 1] if rank <= 3 else f"**`#{rank: <2}`**"
-        
-        # Logika Tampilan
-        if category == "level":
-            total_exp = player_data.get('exp', 0)
-            
-            # [PERBAIKAN UTAMA DI SINI]
-            # Kode lama: level, _, _ = ... (Crash karena fungsi baru cuma return 1 nilai)
-            # Kode baru: level = ...
-            level = _get_level_from_exp_static(total_exp)
-            
-            description_lines.append(f"{rank_display} {display_name} - **Level {level}** ({total_exp:,} EXP)")
-        elif category == "subs":
-            description_lines.append(f"{rank_display} {display_name} - **{player_data.get('subscribers', 0):,}** Subscribers")
-        elif category == "prisma":
-            description_lines.append(f"{rank_display} {display_name} - **{player_data.get('prisma', 0):,}** 💎")
-        elif category == "pvp_wins":
-            description_lines.append(f"{rank_display} {display_name} - **{player_data.get('pvp_wins', 0):,}** Kemenangan")
-        elif category == "titles":
-            description_lines.append(f"{rank_display} {display_name} - **{player_data.get('title_count', 0)}** Title")
-        elif category == "power":
-            description_lines.append(f"{rank_display} {display_name} - **{int(player_data.get('power_score', 0)):,}** Power")
+        description_lines.append(f"{rank_display} {display_name} - {_format_value(category, value)}")
 
     embed.description = "\n".join(description_lines) or "Papan peringkat ini kosong."
 
-    # Menampilkan peringkat pengguna sendiri jika di luar top 10
-    try:
-        user_rank_index = next(i for i, p in enumerate(sorted_players) if p.get('user_id') == author.id)
-        if user_rank_index >= 10:
-            user_rank = user_rank_index + 1
-            user_data = sorted_players[user_rank_index]
-            value = ""
-            if category == "level":
-                # [PERBAIKAN DI SINI JUGA]
-                level = _get_level_from_exp_static(user_data.get('exp', 0))
-                value = f"Peringkat Anda: **#{user_rank}** dengan **Level {level}**"
-            elif category == "subs":
-                value = f"Peringkat Anda: **#{user_rank}** dengan **{user_data.get('subscribers', 0):,}** Subscribers"
-            elif category == "prisma":
-                value = f"Peringkat Anda: **#{user_rank}** dengan **{user_data.get('prisma', 0):,}** 💎"
-            elif category == "pvp_wins":
-                value = f"Peringkat Anda: **#{user_rank}** dengan **{user_data.get('pvp_wins', 0):,}** Kemenangan"
-            elif category == "titles":
-                value = f"Peringkat Anda: **#{user_rank}** dengan **{user_data.get('title_count', 0)}** Title"
-            elif category == "power":
-                 value = f"Peringkat Anda: **#{user_rank}** dengan **{int(user_data.get('power_score', 0)):,}** Power"
-
-            if value:
-                embed.add_field(name="Posisi Anda", value=value, inline=False)
-    except StopIteration:
-        pass # User tidak ada di database
-
-    embed.set_footer(text=f"Diminta oleh {author.display_name}", icon_url=author.display_avatar.url)
+    # Menampilkan peringkat pengguna sendiri jika tidak ada di halaman ini
+    if user_rank and all(user_id != author.id for user_id, _ in rows):
+        rank, value = user_rank
+        embed.add_field(name="Posisi Anda", value=f"Peringkat Anda: **#{rank}** dengan {_format_value(category, value)}", inline=False)
+
+    embed.set_footer(text=f"Halaman {page + 1} • Diminta oleh {author.display_name}", icon_url=author.display_avatar.url)
     return embed
 
 # --- Kelas View untuk Dropdown ---
 class LeaderboardView(View):
-    def __init__(self, bot: commands.Bot, author: discord.User, all_data: list):
+    def __init__(self, cog: 'Leaderboard', author: discord.User, category: str = "level"):
         super().__init__(timeout=180.0)
-        self.bot = bot
+        self.cog = cog
+        self.bot = cog.bot
         self.author = author
-        self.all_data = all_data
+        self.category = category
+        self.page = 0
         self.message = None
 
+    async def render(self) -> discord.Embed:
+        snapshot, rows, has_next = await self.cog.get_page(self.category, self.page)
+        user_rank = None
+        if all(user_id != self.author.id for user_id, _ in rows):
+            user_rank = await self.cog.get_rank(snapshot, self.category, self.author.id)
+        # Nomor baris memakai peringkat yang sama dengan "Posisi Anda" (seri = peringkat sama)
+        offset = self.page * LEADERBOARD_PAGE_SIZE
+        ranks = [(snapshot.rank_of(user_id) or (position,))[0] for position, (user_id, _) in enumerate(rows, start=offset + 1)]
+        embed = create_leaderboard_embed(self.bot, self.author, rows, self.category, self.page, user_rank, ranks)
+        self.prev_button.disabled = self.page == 0
+        self.next_button.disabled = not has_next
+        return embed
+
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         if interaction.user.id != self.author.id:
             await interaction.response.send_message("Anda tidak bisa mengontrol papan peringkat ini.", ephemeral=True)
@@ -168,6 +174,11 @@ class LeaderboardView(View):
             except discord.NotFound:
                 pass
 
+    async def _refresh(self, interaction: discord.Interaction):
+        await interaction.response.defer()
+        new_embed = await self.render()
+        await interaction.edit_original_response(embed=new_embed, view=self)
+
     @discord.ui.select(
         placeholder="Pilih kategori papan peringkat...",
         options=[
@@ -177,36 +188,103 @@ class LeaderboardView(View):
             discord.SelectOption(label="Juara Arena (PvP Wins)", value="pvp_wins", description="Peringkat berdasarkan memenangkan pvp.",emoji="⚔️"),
             discord.SelectOption(label="Kolektor Title", value="titles", description="Peringkat berdasarkan jumlah title yang dimiliki.",emoji="📚"),
             discord.SelectOption(label="Power Score", value="power", description="Peringkat berdasarkan jumlah Power score player.",emoji="⚡"),
-        ]
+        ],
+        row=0
     )
     async def select_callback(self, interaction: discord.Interaction, select: Select):
-        category = select.values[0]
-        # Defer untuk mencegah 'Interaction Failed' jika kalkulasi lambat
-        await interaction.response.defer()
-        
-        new_embed = await create_leaderboard_embed(self.bot, self.author, self.all_data, category)
-        await interaction.edit_original_response(embed=new_embed, view=self)
+        self.category = select.values[0]
+        self.page = 0
+        await self._refresh(interaction)
+
+    @discord.ui.button(label="Sebelumnya", emoji="◀️", style=discord.ButtonStyle.secondary, row=1)
+    async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(0, self.page - 1)
+        await self._refresh(interaction)
+
+    @discord.ui.button(label="Berikutnya", emoji="▶️", style=discord.ButtonStyle.secondary, row=1)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await self._refresh(interaction)
 
 
 # --- Kelas Cog Utama ---
 class Leaderboard(commands.Cog, name="Papan Peringkat"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # Cache snapshot bersama per kategori; lock mencegah viewer bersamaan menghitung ulang
+        self._snapshots: dict[str, LeaderboardSnapshot] = {}
+        self._locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._last_viewed: dict[str, float] = {}
+
+        self.refresh_loop.start()
+
+    def cog_unload(self):
+        self.refresh_loop.cancel()
+
+    async def _build_snapshot(self, category: str) -> LeaderboardSnapshot:
+        version = get_write_version(self.bot.db)
+        rows = await get_leaderboard_page(self.bot.db, category, limit=LEADERBOARD_CACHED_PAGES * LEADERBOARD_PAGE_SIZE + 1)
+        snapshot = self._snapshots[category] = LeaderboardSnapshot(rows, version)
+        return snapshot
+
+    async def get_snapshot(self, category: str) -> LeaderboardSnapshot:
+        """Snapshot kategori dari cache; hanya satu viewer yang menghitung ulang jika sudah kedaluwarsa."""
+        self._last_viewed[category] = time.monotonic()
+        snapshot = self._snapshots.get(category)
+        if snapshot and snapshot.is_fresh(): return snapshot
+
+        async with self._locks[category]:
+            snapshot = self._snapshots.get(category)
+            if snapshot and snapshot.is_fresh(): return snapshot
+            return await self._build_snapshot(category)
+
+    async def get_page(self, category: str, page: int) -> tuple[LeaderboardSnapshot, list, bool]:
+        """(snapshot, baris, ada_halaman_berikutnya); halaman di luar snapshot diambil sekali lewat LIMIT/OFFSET."""
+        snapshot = await self.get_snapshot(category)
+        cached = snapshot.page(page)
+        if cached is None:
+            rows = await get_leaderboard_page(self.bot.db, category, limit=LEADERBOARD_PAGE_SIZE + 1, offset=page * LEADERBOARD_PAGE_SIZE)
+            rows, has_next = rows[:LEADERBOARD_PAGE_SIZE], len(rows) > LEADERBOARD_PAGE_SIZE
+            # Baris pertama bisa seri dengan halaman sebelumnya: peringkatnya diambil lewat COUNT yang sama dengan get_rank
+            first = await get_leaderboard_rank(self.bot.db, category, rows[0][0]) if rows else None
+            snapshot.add_extra_page(page, rows, has_next, first[0] if first else None)
+            cached = snapshot.page(page)
+        return (snapshot, *cached)
+
+    async def get_rank(self, snapshot: LeaderboardSnapshot, category: str, user_id: int):
+        """Peringkat dari snapshot jika pemain ada di halaman teratas, selain itu lewat query COUNT ber-index."""
+        if user_rank := snapshot.rank_of(user_id): return user_rank
+        if snapshot.is_complete: return None
+        return await get_leaderboard_rank(self.bot.db, category, user_id)
+
+    @tasks.loop(seconds=LEADERBOARD_REFRESH_INTERVAL)
+    async def refresh_loop(self):
+        """Refresh latar belakang: halaman teratas kategori yang masih dilihat dibangun ulang jika ada commit baru."""
+        if not self.bot.db: return
+        version = get_write_version(self.bot.db)
+        now = time.monotonic()
+        for category, snapshot in list(self._snapshots.items()):
+            if now - self._last_viewed.get(category, 0) > LEADERBOARD_IDLE_TIMEOUT:
+                # Tidak ada yang melihat: buang agar memori tidak tertahan
+                del self._snapshots[category]
+                continue
+            if snapshot.version == version: continue
+            async with self._locks[category]:
+                try: await self._build_snapshot(category)
+                except Exception as e: print(f"Gagal refresh leaderboard {category}: {e}")
+
+    @refresh_loop.before_loop
+    async def before_refresh_loop(self):
+        await self.bot.wait_until_ready()
 
     @commands.command(name="leaderboard", aliases=["lb", "top"])
     @commands.cooldown(1, 5, commands.BucketType.user)
     async def leaderboard(self, ctx: commands.Context):
         async with ctx.typing():
             try:
-                all_players_data = await get_all_player_data(self.bot.db)
-
-                if not all_players_data:
-                    await ctx.send("Belum ada pemain di papan peringkat.")
-                    return
-                
-                view = LeaderboardView(bot=self.bot, author=ctx.author, all_data=all_players_data)
                 # Default view: Level
-                initial_embed = await create_leaderboard_embed(self.bot, ctx.author, all_players_data, "level")
+                view = LeaderboardView(cog=self, author=ctx.author)
+                initial_embed = await view.render()
                 
                 message = await ctx.send(embed=initial_embed, view=view)
                 view.message = message
@@ -216,4 +294,4 @@ class Leaderboard(commands.Cog, name="Papan Peringkat"):
                 print(f"Error LB: {e}")
 
 async def setup(bot: commands.Bot):
-    await bot.add_cog(Leaderboard(bot))
\ No newline at end of file
+    await bot.add_cog(Leaderboard(bot))
@@ -2,17 +2,15 @@ import discord
 from discord.ext import commands
 import math
 from collections import Counter
-import os # Diperlukan untuk memeriksa path gambar
 
 # Impor fungsi-fungsi yang dibutuhkan dari database
 from database import (
     get_player_data,
     get_player_titles,
     set_equipped_title,
-    get_player_equipment,
     get_player_inventory,
     update_player_equipment_and_inventory,
-    get_player_upgrades
+    get_player_loadout
 )
 from ._utils import BotColors
 
@@ -338,59 +336,8 @@ class ProfileCog(commands.Cog, name="Profil"):
         return (player_spd / (player_spd + EVA_SCALING_FACTOR)) * MAX_EVA_FROM_SPD
 
     async def _get_total_and_bonus_stats(self, user_id: int, player_data: dict) -> tuple[dict, dict]:
-        # Stat dasar dari database
-        base_stats = {
-            'hp': player_data.get('base_hp', 100), 'atk': player_data.get('base_atk', 10), 
-            'def': player_data.get('base_def', 5), 'spd': player_data.get('base_spd', 10), 
-            'crit_rate': 0.05, 'crit_dmg': 1.5 
-        }
-        bonus_stats = {key: 0 for key in base_stats}
-
-        # Stat dari Title
-        if title_id := player_data.get('equipped_title_id'):
-            if title_data := self.bot.get_title_by_id(title_id):
-                for stat, value in title_data.get('stat_boost', {}).items():
-                    stat_key = 'crit_dmg' if stat == 'crit_damage' else stat
-                    if stat_key in bonus_stats: bonus_stats[stat_key] += value
-
-        # Stat dari Equipment + Upgrades
-        player_equipment = await get_player_equipment(self.bot.db, user_id)
-        player_upgrades = await get_player_upgrades(self.bot.db, user_id) 
-
-        if player_equipment:
-            for slot, item_id in player_equipment.items():
-                if item_id and (item_data := self.bot.get_item_by_id(item_id)):
-                    upgrade_data = player_upgrades.get(slot, {})
-                    level = upgrade_data.get('level', 0)
-                    
-                    # Hitung Stat Dasar Item (Dengan Scaling)
-                    for stat, value in item_data.get('stat_boost', {}).items():
-                        stat_key = 'crit_dmg' if stat == 'crit_damage' else stat
-                        final_value = value
-                        
-                        if value > 0:
-                            # Scaling: 5% untuk Crit, 10% untuk Stat Biasa
-                            if stat_key in ['crit_rate', 'crit_dmg']:
-                                multiplier = 1 + (level * 0.05)
-                                final_value = value * multiplier
-                            else:
-                                multiplier = 1 + (level * 0.10)
-                                final_value = int(value * multiplier)
-                        elif value < 0 and stat_key not in ['crit_rate', 'crit_dmg']:
-                             # Stat minus membaik tiap 3 level
-                             penalty_reduction = level // 3
-                             final_value = min(0, value + penalty_reduction)
-                        
-                        if stat_key in bonus_stats:
-                            bonus_stats[stat_key] += final_value
-
-                    # Hitung Bonus Stat (Sub-stats dari Upgrade)
-                    for stat, val in upgrade_data.get('bonus_stats', {}).items():
-                        if stat in bonus_stats:
-                            bonus_stats[stat] += val
-
-        total_stats = {key: base_stats[key] + bonus_stats[key] for key in base_stats}
-        return total_stats, bonus_stats
+        player_equipment, player_upgrades = await get_player_loadout(self.bot.db, user_id)
+        return self.bot.calculate_total_stats(player_data, player_equipment, player_upgrades)
 
     def _format_stats_for_title(self, stats_dict: dict) -> str:
         parts = []
@@ -469,8 +416,7 @@ class ProfileCog(commands.Cog, name="Profil"):
         slot_map = {"helm": "🧢 Helm", "armor": "👕 Armor", "pants": "👖 Celana", "shoes": "👢 Sepatu", "artifact": "🔮 Artefak"}
         embed = discord.Embed(title=f"⚔️ Equipment & Artefak - {user.display_name}", description="Gunakan dropdown di bawah untuk memilih slot dan mengganti item.", color=BotColors.DEFAULT).set_thumbnail(url=user.display_avatar.url)
         
-        equipment = await get_player_equipment(self.bot.db, user.id)
-        upgrades = await get_player_upgrades(self.bot.db, user.id)
+        equipment, upgrades = await get_player_loadout(self.bot.db, user.id)
 
         for slot_id, display_name in slot_map.items():
             item_id = equipment.get(slot_id)
@@ -547,19 +493,11 @@ class ProfileCog(commands.Cog, name="Profil"):
             color=embed_color
         )
 
+        # Avatar pengguna sebagai fallback; ditimpa gambar title (URL CDN / lampiran) jika ada
+        embed.set_thumbnail(url=user.display_avatar.url)
         file = None
-        # [LOGIKA BARU] Cek apakah title punya gambar dan apakah file-nya ada
         if image_filename := title_data.get("image_file"):
-            image_path = f"assets/images/{image_filename}"
-            if os.path.exists(image_path):
-                file = discord.File(image_path, filename=image_filename)
-                # [PERUBAHAN KUNCI] Gunakan set_thumbnail alih-alih set_image
-                embed.set_thumbnail(url=f"attachment://{image_filename}")
-
-        # Jika tidak ada file yang berhasil dibuat (baik karena tidak ada di JSON atau file tidak ditemukan)
-        # maka gunakan avatar pengguna sebagai fallback.
-        if file is None:
-            embed.set_thumbnail(url=user.display_avatar.url)
+            file = await self.bot.assets.set_embed_image(embed, f"assets/images/{image_filename}", thumbnail=True)
 
         # Bagian selanjutnya dari fungsi ini tetap sama
         if title_data.get('stat_boost'):
@@ -1,16 +1,18 @@
 import discord
 from discord.ext import commands, tasks
-import json
-from datetime import datetime, time, timedelta
+from datetime import datetime, time, timedelta, timezone
 import pytz
 import asyncio
-import os
 import math # [PENTING] Diperlukan untuk rumus level
+from collections import Counter, defaultdict
 
 # Impor dari proyek Anda
-from database import get_player_data, update_player_data
+from database import get_player_data, update_player_data, execute_write, get_writer
 from ._utils import BotColors
 
+# Jam reset misi (05:00 WIB) untuk jadwal `tasks.loop`
+QUEST_RESET_TIME_WIB = time(5, 0, tzinfo=timezone(timedelta(hours=7)))
+
 # ===================================================================================
 # UI CLASSES (TAMPILAN TOMBOL)
 # ===================================================================================
@@ -79,7 +81,8 @@ class QuestView(discord.ui.View):
         user_id = interaction.user.id
         quest_id = button.quest_def['id']
 
-        # Cek status klaim di DB
+        # Cek status klaim di DB (progres yang masih di memori ditulis dulu)
+        await self.cog.flush_quest_progress([user_id])
         async with self.cog.bot.db.execute("SELECT completed, claimed FROM player_quests WHERE user_id = ? AND quest_id = ?", (user_id, quest_id)) as cursor:
             quest_status = await cursor.fetchone()
 
@@ -89,7 +92,7 @@ class QuestView(discord.ui.View):
             return
 
         # Tandai sebagai claimed
-        await self.cog.bot.db.execute("UPDATE player_quests SET claimed = 1 WHERE user_id = ? AND quest_id = ?", (user_id, quest_id))
+        await execute_write(self.cog.bot.db, "UPDATE player_quests SET claimed = 1 WHERE user_id = ? AND quest_id = ?", (user_id, quest_id))
         
         # --- LOGIKA REWARD & LEVEL UP ---
         rewards = button.quest_def['rewards']
@@ -140,7 +143,6 @@ class QuestView(discord.ui.View):
 
         # Simpan ke DB
         await update_player_data(self.cog.bot.db, user_id, **db_updates)
-        await self.cog.bot.db.commit()
 
         embed_success = discord.Embed(description=embed_desc, color=discord.Color.green())
         await interaction.response.send_message(embed=embed_success, ephemeral=True)
@@ -154,15 +156,24 @@ class QuestCog(commands.Cog, name="Misi"):
         self.bot = bot
         self.WIB = pytz.timezone('Asia/Jakarta')
         self.RESET_TIME = time(5, 0)
-        self.last_daily_reset_check = None
+        # Periode yang sudah di-rollover dan user yang sudah punya assignment di periode itu
+        self.active_periods: dict = None
+        self.assigned_users: set[int] = set()
         
-        self.quests_data = self._load_quests()
-        self.all_quest_defs = {q['id']: q for q_list in self.quests_data.values() for q in q_list}
+        self.quest_ids_by_type = self._index_quests()
+        self.bot.add_catalog_listener(self._on_catalog_change)
+
+        # Akumulator progres di memori: {user_id: Counter({quest_type: jumlah})}
+        self.pending_progress: dict[int, Counter] = defaultdict(Counter)
         
         self.quest_reset_loop.start()
+        self.quest_flush_loop.start()
 
-    def cog_unload(self):
+    async def cog_unload(self):
+        self.bot.remove_catalog_listener(self._on_catalog_change)
         self.quest_reset_loop.cancel()
+        self.quest_flush_loop.cancel()
+        if self.bot.db: await self.flush_quest_progress()
     
     # [HELPER BARU] Rumus Level (Polynomial)
     def _get_level_from_exp(self, total_exp: int) -> int:
@@ -171,30 +182,28 @@ class QuestCog(commands.Cog, name="Misi"):
         # Formula yang benar: EXP_Total = 100 * (Level - 1)^2. Level = sqrt(EXP/100) + 1
         return int(math.sqrt(total_exp / 100)) + 1 
 
-    async def _ensure_daily_columns(self):
-        """Memastikan kolom daily_streak dan last_daily_claim ada di tabel players."""
-        try:
-            async with self.bot.db.execute("PRAGMA table_info(players)") as cursor:
-                columns = [row[1] for row in await cursor.fetchall()]
-            
-            if 'daily_streak' not in columns:
-                await self.bot.db.execute("ALTER TABLE players ADD COLUMN daily_streak INTEGER DEFAULT 0")
-            if 'last_daily_claim' not in columns:
-                await self.bot.db.execute("ALTER TABLE players ADD COLUMN last_daily_claim INTEGER DEFAULT 0")
-            
-            await self.bot.db.commit()
-        except Exception as e:
-            print(f"❌ Gagal update kolom daily: {e}")
-
-    def _load_quests(self):
-        try:
-            base_path = os.path.dirname(os.path.abspath(__file__))
-            json_path = os.path.join(base_path, '..', 'data', 'quests.json')
-            if not os.path.exists(json_path): json_path = 'data/quests.json'
-            with open(json_path, 'r', encoding='utf-8') as f: return json.load(f)
-        except Exception as e:
-            print(f"ERROR LOAD QUESTS: {e}")
-            return {"daily": [], "weekly": []}
+    # --- Definisi misi dari katalog bersama ---
+    @property
+    def quests_data(self):
+        """{periode: (definisi_misi, ...)}"""
+        return self.bot.catalog.quests
+
+    @property
+    def all_quest_defs(self):
+        return self.bot.catalog.index("quests")
+
+    def _index_quests(self):
+        """Index definisi misi harian & mingguan per tipe event: {tipe_event: (quest_id, ...)}."""
+        by_type = defaultdict(list)
+        for q_list in self.quests_data.values():
+            for q in q_list: by_type[q['type']].append(q['id'])
+        return {quest_type: tuple(ids) for quest_type, ids in by_type.items()}
+
+    def _on_catalog_change(self, catalog, changed: frozenset):
+        """Callback reload data game: index misi dibangun ulang, assignment dicek ulang agar misi baru ikut masuk."""
+        if "quests" not in changed: return
+        self.quest_ids_by_type = self._index_quests()
+        self.assigned_users.clear()
 
     def _create_progress_bar(self, current, total, length=8):
         if total <= 0: return f"▱" * length
@@ -214,63 +223,129 @@ class QuestCog(commands.Cog, name="Misi"):
             quest_date = now_wib.date()
         return quest_date.strftime("%Y-%m-%d"), f"{quest_date.isocalendar().year}-{quest_date.isocalendar().week}"
 
-    async def _ensure_quests_for_user(self, user_id: int, quest_type: str):
+    def _current_periods(self) -> dict:
         daily_period, weekly_period = self.get_quest_date_info()
-        current_period = daily_period if quest_type == 'daily' else weekly_period
-        target_quests = self.quests_data.get(quest_type, [])
-        
-        if not target_quests: return
-
-        pattern = 'DAILY_%' if quest_type == 'daily' else 'WEEKLY_%'
-        await self.bot.db.execute("DELETE FROM player_quests WHERE user_id = ? AND quest_id LIKE ? AND assigned_period != ?", (user_id, pattern, current_period))
-        
-        quests_to_insert = [(user_id, q['id'], current_period) for q in target_quests]
-        if quests_to_insert:
-            await self.bot.db.executemany("INSERT OR IGNORE INTO player_quests (user_id, quest_id, assigned_period) VALUES (?, ?, ?)", quests_to_insert)
-            await self.bot.db.commit()
-
-    @tasks.loop(minutes=30)
+        return {'daily': daily_period, 'weekly': weekly_period}
+
+    async def rollover_quest_period(self):
+        """Rollover global: satu DELETE untuk semua user, membuang assignment di luar periode aktif."""
+        periods = self._current_periods()
+        await execute_write(self.bot.db, "DELETE FROM player_quests WHERE assigned_period NOT IN (?, ?)", (periods['daily'], periods['weekly']))
+        self.active_periods = periods
+        self.assigned_users.clear()
+
+    async def ensure_quests_assigned(self, user_ids):
+        """Membuat assignment misi hanya untuk user yang belum punya di periode aktif."""
+        if self.active_periods != self._current_periods(): await self.rollover_quest_period()
+
+        missing = [uid for uid in dict.fromkeys(user_ids) if uid not in self.assigned_users]
+        if not missing: return
+
+        catalog = self.bot.catalog
+        rows = [
+            (uid, q['id'], self.active_periods[quest_type])
+            for uid in missing
+            for quest_type, q_list in catalog.quests.items() if quest_type in self.active_periods
+            for q in q_list
+        ]
+        if rows: await execute_write(self.bot.db, "INSERT OR IGNORE INTO player_quests (user_id, quest_id, assigned_period) VALUES (?, ?, ?)", rows, many=True)
+        # Data misi di-reload selama INSERT: biarkan user di-assign ulang dengan definisi terbaru
+        if self.bot.catalog is catalog: self.assigned_users.update(missing)
+
+    @tasks.loop(time=QUEST_RESET_TIME_WIB)
     async def quest_reset_loop(self):
-        daily_period, _ = self.get_quest_date_info()
-        if self.last_daily_reset_check is None: self.last_daily_reset_check = daily_period
-        if daily_period > self.last_daily_reset_check: self.last_daily_reset_check = daily_period
+        if self.active_periods != self._current_periods(): await self.rollover_quest_period()
+
+    @tasks.loop(seconds=30)
+    async def quest_flush_loop(self):
+        try: await self.flush_quest_progress()
+        except Exception as e: print(f"Gagal menyimpan progres misi: {e}")
 
     @quest_reset_loop.before_loop
     async def before_loop(self):
         await self.bot.wait_until_ready()
-        await self._ensure_daily_columns()
+        # Susul reset yang terlewat selama bot mati
+        if self.bot.db: await self.rollover_quest_period()
 
-    async def update_quest_progress(self, user_id, quest_type, amount=1):
-        if not self.bot.db: return
-        await self._ensure_quests_for_user(user_id, 'daily')
-        await self._ensure_quests_for_user(user_id, 'weekly')
+    @quest_flush_loop.before_loop
+    async def before_flush_loop(self):
+        await self.bot.wait_until_ready()
 
-        async with self.bot.db.execute("SELECT quest_id, progress FROM player_quests WHERE user_id = ? AND completed = 0", (user_id,)) as cursor:
-            active_quests = await cursor.fetchall()
-        
-        if not active_quests: return
+    # --- AKUMULATOR PROGRES ---
+
+    def record_progress(self, user_id: int, quest_type: str, amount: int = 1):
+        """Menambah counter progres di memori; ditulis ke DB oleh `flush_quest_progress`."""
+        # Event yang tidak didengarkan misi mana pun langsung diabaikan
+        if amount > 0 and quest_type in self.quest_ids_by_type:
+            self.pending_progress[user_id][quest_type] += amount
+
+    async def update_quest_progress(self, user_id, quest_type, amount=1):
+        self.record_progress(user_id, quest_type, amount)
+
+    async def flush_quest_progress(self, user_ids=None):
+        """
+        Menulis progres yang terkumpul (semua user, atau hanya `user_ids`) ke `player_quests`
+        dalam satu transaksi. Penyelesaian dicek terhadap definisi misi yang sudah di-cache.
+        """
+        if user_ids is None:
+            batch, self.pending_progress = self.pending_progress, defaultdict(Counter)
+        else:
+            batch = {uid: self.pending_progress.pop(uid) for uid in set(user_ids) if uid in self.pending_progress}
+        if not batch or not self.bot.db: return
+
+        user_ids = list(batch)
+        quest_ids = list({
+            quest_id for counts in batch.values() for quest_type in counts
+            for quest_id in self.quest_ids_by_type.get(quest_type, ())
+        })
+        if not quest_ids: return
+
+        async def op(conn):
+            user_placeholders = ", ".join("?" for _ in user_ids)
+            quest_placeholders = ", ".join("?" for _ in quest_ids)
+            async with conn.execute(
+                f"SELECT user_id, quest_id, progress FROM player_quests "
+                f"WHERE completed = 0 AND user_id IN ({user_placeholders}) AND quest_id IN ({quest_placeholders})",
+                user_ids + quest_ids
+            ) as cursor:
+                rows = await cursor.fetchall()
+
+            updates = []
+            for user_id, quest_id, current_progress in rows:
+                quest_def = self.all_quest_defs.get(quest_id)
+                if not quest_def: continue
+                amount = batch[user_id].get(quest_def['type'], 0)
+                if not amount: continue
 
-        updates, completions = [], []
-        for quest_id, current_progress in active_quests:
-            quest_def = self.all_quest_defs.get(quest_id)
-            if not quest_def: continue
-            
-            if quest_def['type'] == quest_type:
                 target = quest_def['target']
                 new_prog = min(current_progress + amount, target)
                 if new_prog > current_progress:
-                    updates.append((new_prog, user_id, quest_id))
-                    if new_prog >= target: completions.append((user_id, quest_id))
+                    updates.append((new_prog, int(new_prog >= target), user_id, quest_id))
+
+            if updates:
+                await conn.executemany("UPDATE player_quests SET progress = ?, completed = ? WHERE user_id = ? AND quest_id = ?", updates)
 
-        if updates: await self.bot.db.executemany("UPDATE player_quests SET progress = ? WHERE user_id = ? AND quest_id = ?", updates)
-        if completions: await self.bot.db.executemany("UPDATE player_quests SET completed = 1 WHERE user_id = ? AND quest_id = ?", completions)
-        if updates or completions: await self.bot.db.commit()
+        try:
+            await self.ensure_quests_assigned(user_ids)
+            await get_writer(self.bot.db).submit(op)
+        except Exception:
+            # Kembalikan ke akumulator agar dicoba lagi pada flush berikutnya
+            for uid, counts in batch.items(): self.pending_progress[uid].update(counts)
+            raise
 
     async def _build_quest_interface(self, user_id, active_filter):
-        await self._ensure_quests_for_user(user_id, active_filter)
+        await self.flush_quest_progress([user_id])
+        await self.ensure_quests_assigned([user_id])
 
         async with self.bot.db.execute("SELECT quest_id, progress, completed, claimed FROM player_quests WHERE user_id = ?", (user_id,)) as cursor:
             player_quests_db = await cursor.fetchall()
+
+        # Assignment bisa hilang di luar rollover (mis. reset progres oleh dev): buat ulang
+        if not player_quests_db and self.quests_data.get(active_filter):
+            self.assigned_users.discard(user_id)
+            await self.ensure_quests_assigned([user_id])
+            async with self.bot.db.execute("SELECT quest_id, progress, completed, claimed FROM player_quests WHERE user_id = ?", (user_id,)) as cursor:
+                player_quests_db = await cursor.fetchall()
         
         player_data = await get_player_data(self.bot.db, user_id)
         has_unfinished = any(not q[2] for q in player_quests_db if q[0].lower().startswith(active_filter))
@@ -383,10 +458,7 @@ class QuestCog(commands.Cog, name="Misi"):
         current_ts = int(now_wib.timestamp())
 
         # Update Daily Specific Columns + Resource (EXP dan Prisma baru)
-        await self.bot.db.execute(
-            "UPDATE players SET prisma = ?, exp = ?, last_daily_claim = ?, daily_streak = ? WHERE user_id = ?", 
-            (new_prisma, new_exp, current_ts, streak, user_id)
-        )
+        await update_player_data(self.bot.db, user_id, prisma=new_prisma, exp=new_exp, last_daily_claim=current_ts, daily_streak=streak)
         
         # Update Level & Stats jika naik level
         embed_extra = ""
@@ -408,8 +480,6 @@ class QuestCog(commands.Cog, name="Misi"):
                 base_spd=player_data.get('base_spd', 10) + spd_gain
             )
             embed_extra = f"\n\n🆙 **LEVEL UP!** (Lv.{new_level})\nStatus naik: ❤️+{hp_gain} ⚔️+{atk_gain} 🛡️+{def_gain} 💨+{spd_gain}"
-        
-        await self.bot.db.commit()
 
         embed = discord.Embed(title="📅 Absensi Harian Berhasil!", color=BotColors.SUCCESS)
         embed.description = f"Reset harian pukul **{self.RESET_TIME.strftime('%H:%M')} WIB**.{embed_extra}"
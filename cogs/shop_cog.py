@@ -2,12 +2,10 @@
 
 import discord
 from discord.ext import commands
-import json
 import math
-import os
 
 # Impor fungsi dan kelas dari proyek Anda
-from database import get_player_data, update_player_data
+from database import get_player_data, add_player_item
 from ._utils import BotColors
 
 # ===================================================================================
@@ -208,18 +206,9 @@ class BuyItemSelect(discord.ui.Select):
         if not item_to_buy:
             return await interaction.response.send_message("Item tidak ditemukan!", ephemeral=True)
 
-        player_data = await get_player_data(self.parent_view.bot.db, interaction.user.id)
-        
-        if player_data.get('prisma', 0) < item_to_buy['price']:
+        # Harga dipotong dan item ditambahkan dalam satu transaksi; False berarti saldo tidak cukup
+        if not await add_player_item(self.parent_view.bot.db, interaction.user.id, item_to_buy['id'], prisma=-item_to_buy['price']):
             return await interaction.response.send_message(f"Prismamu tidak cukup untuk membeli **{item_to_buy['name']}**!", ephemeral=True, delete_after=10)
-
-        new_prisma = player_data['prisma'] - item_to_buy['price']
-        inventory_list = json.loads(player_data.get('inventory', '[]'))
-        inventory_list.append(item_to_buy['id'])
-        new_inventory_json = json.dumps(inventory_list)
-
-        await update_player_data(self.parent_view.bot.db, interaction.user.id, 
-                                 prisma=new_prisma, inventory=new_inventory_json)
         
         await interaction.response.send_message(f"✅ Kamu berhasil membeli **{item_to_buy['name']}**!", ephemeral=True, delete_after=10)
         
@@ -232,36 +221,11 @@ class BuyItemSelect(discord.ui.Select):
 class ShopCog(commands.Cog, name="Toko"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.shop_items = []
-        
-        file_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'items.json')
 
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                all_items = json.load(f)
-                
-                if not isinstance(all_items, list):
-                    print("KESALAHAN: data/items.json tidak berisi sebuah list/array.")
-                    return
-
-                valid_types = {"helm", "armor", "pants", "shoes"}
-                
-                self.shop_items = [
-                    item for item in all_items 
-                    if 'price' in item and item['price'] > 0 and item.get('type', '').lower() in valid_types
-                ]
-
-            self.shop_items.sort(key=lambda x: (x.get('type').lower(), x['price']))
-            
-            if self.shop_items:
-                print(f"Berhasil memuat {len(self.shop_items)} item untuk toko.")
-            else:
-                print("PERINGATAN: Tidak ada item yang dimuat ke toko. Periksa 'data/items.json'.")
-
-        except FileNotFoundError:
-            print(f"KESALAHAN: File toko tidak ditemukan di path: {file_path}")
-        except json.JSONDecodeError as e:
-            print(f"KESALAHAN: Gagal membaca 'data/items.json'. Periksa format JSON. Error: {e}")
+    @property
+    def shop_items(self) -> tuple:
+        """Equipment yang dijual (berharga), sudah terurut per tipe lalu harga di katalog."""
+        return self.bot.catalog.shop_items
 
     @commands.command(name="toko", aliases=["shop"])
     @commands.cooldown(1, 10, commands.BucketType.user)
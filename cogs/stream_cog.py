@@ -4,7 +4,6 @@ import random
 import asyncio
 import datetime
 import math
-import json
 from collections import deque
 
 # Impor dari proyek Anda
@@ -416,9 +415,9 @@ class StreamSession:
         # Update Misi
         quest_cog = self.bot.get_cog("Misi")
         if quest_cog:
-            await quest_cog.update_quest_progress(user.id, 'COMPLETE_STREAM')
-            if total_exp_gained > 0: await quest_cog.update_quest_progress(user.id, 'STREAM_EXP', total_exp_gained)
-            if total_prisma_gained > 0: await quest_cog.update_quest_progress(user.id, 'EARN_PRISMA', total_prisma_gained)
+            quest_cog.record_progress(user.id, 'COMPLETE_STREAM')
+            quest_cog.record_progress(user.id, 'STREAM_EXP', total_exp_gained)
+            quest_cog.record_progress(user.id, 'EARN_PRISMA', total_prisma_gained)
 
     async def _send_recap_embed(self, level_up_messages: list = []):
         desc = f"Berikut adalah rekap dari stream **{self.stream_title}**."
@@ -580,15 +579,6 @@ class StreamCog(commands.Cog, name="Streaming"):
         # Dictionary untuk menyimpan waktu cooldown collab
         # Format: {user_id: timestamp_kapan_selesai}
         self.collab_cooldowns = {} 
-        self._load_stream_data()
-
-    def _load_stream_data(self):
-        try:
-            with open('data/stream_data.json', 'r', encoding='utf-8') as f:
-                self.bot.stream_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Error loading stream_data.json: {e}")
-            self.bot.stream_data = {"stream_titles": {}, "stream_events": [], "chat_data": {}}
 
     @commands.command(name="stream", aliases=["live"])
     @commands.cooldown(1, 75, commands.BucketType.user)
@@ -10,6 +10,7 @@ from collections import Counter
 
 from ._utils import BotColors
 from database import get_player_data, get_player_titles, get_player_inventory, get_player_equipment
+from game_logic.skills import index_passives
 
 # ===================================================================================
 # --- KELAS-KELAS VIEW (UI INTERAKTIF UNTUK FASE TURNAMEN) ---
@@ -457,7 +458,7 @@ class MatchHandler:
                         stat_key = 'crit_damage' if stat == 'crit_damage' else stat
                         if stat_key in final_stats: final_stats[stat_key] += value
             
-            return {
+            return index_passives({
                 "id": player_id, "name": player_user.display_name, "avatar_url": player_user.display_avatar.url,
                 "is_player": True, "agency_id": agency_id,
                 "stats": final_stats, "base_stats": base_stats, # base_stats sekarang adalah stat Lv 80
@@ -465,7 +466,7 @@ class MatchHandler:
                 "hp": final_stats['hp'], "max_hp": final_stats['hp'],
                 "status_effects": [], "passive_flags": {},
                 "skill_cooldowns": {s['name']: 0 for s in title_data.get('skills', []) if s.get('type') == 'active'}
-            }
+            })
         except Exception as e:
             print(f"Error building participant data for {player_id}: {e}")
             return None
@@ -2,8 +2,6 @@
 
 import discord
 from discord.ext import commands
-import json
-import os
 import asyncio
 import math
 import traceback
@@ -15,10 +13,14 @@ from database import (
     get_player_data, 
     update_player_data, 
     get_player_inventory, 
+    get_player_equipment,
+    add_player_item,
+    remove_player_item,
     get_player_titles, 
     remove_player_title, 
     add_title_to_player,
-    has_title
+    has_title,
+    transfer_currency
 )
 from ._utils import BotColors
 
@@ -86,14 +88,10 @@ class PayModal(discord.ui.Modal):
             if amount <= 0: raise ValueError
         except: return await interaction.response.send_message("❌ Jumlah tidak valid.", ephemeral=True)
 
-        sender_data = await get_player_data(self.cog.bot.db, self.ctx.author.id)
-        if sender_data.get('prisma', 0) < amount:
+        # Potong & tambah saldo secara atomik (saldo dicek di dalam UPDATE)
+        if await transfer_currency(self.cog.bot.db, self.ctx.author.id, self.target.id, amount) is None:
             return await interaction.response.send_message("❌ Saldo tidak cukup.", ephemeral=True)
 
-        target_data = await get_player_data(self.cog.bot.db, self.target.id)
-        await update_player_data(self.cog.bot.db, self.ctx.author.id, prisma=sender_data['prisma'] - amount)
-        await update_player_data(self.cog.bot.db, self.target.id, prisma=target_data.get('prisma', 0) + amount)
-
         embed = discord.Embed(title="💸 Transfer Berhasil", description=f"**{self.ctx.author.display_name}** mengirim `{amount:,}` 💎 ke **{self.target.display_name}**.", color=BotColors.SUCCESS)
         await interaction.response.edit_message(embed=embed, view=None)
 
@@ -327,17 +325,14 @@ class MarketOfferView(discord.ui.View):
             return await interaction.response.send_message("Hanya pembeli yang bisa menerima!", ephemeral=True)
             
         try:
-            # 2. Cek Uang Pembeli
-            buyer_data = await get_player_data(self.cog.bot.db, self.buyer.id)
-            if buyer_data.get('prisma', 0) < self.price:
-                return await interaction.response.send_message("❌ Uang tidak cukup!", ephemeral=True)
-
+            if self.is_finished:
+                return await interaction.response.send_message("❌ Transaksi ini sudah selesai.", ephemeral=True)
             self.is_finished = True
-            
-            # 3. Transfer Uang
-            await update_player_data(self.cog.bot.db, self.buyer.id, prisma=buyer_data['prisma'] - self.price)
-            seller_data = await get_player_data(self.cog.bot.db, self.ctx.author.id)
-            await update_player_data(self.cog.bot.db, self.ctx.author.id, prisma=seller_data.get('prisma', 0) + self.price)
+
+            # 2 & 3. Cek Uang Pembeli sekaligus Transfer Uang (atomik)
+            if await transfer_currency(self.cog.bot.db, self.buyer.id, self.ctx.author.id, self.price) is None:
+                self.is_finished = False
+                return await interaction.response.send_message("❌ Uang tidak cukup!", ephemeral=True)
 
             # 4. Transfer Barang (Tambahkan ke pembeli)
             # Ini bagian paling krusial yang mungkin error sebelumnya
@@ -368,30 +363,16 @@ class MarketOfferView(discord.ui.View):
 class TransactionCog(commands.Cog, name="Transaksi"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.item_map = {}
-        self.fish_map = {}
-        self.fishing_gear_map = {}
-        self._load_data()
 
-    def _load_data(self):
-        try:
-            with open('data/items.json', 'r', encoding='utf-8') as f:
-                self.item_map = {i['id']: i for i in json.load(f)}
-        except: pass
-        try:
-            with open('data/artifacts.json', 'r', encoding='utf-8') as f:
-                for a in json.load(f):
-                    if 'type' not in a: a['type'] = 'artifact'
-                    self.item_map[a['id']] = a
-        except: pass
-        try:
-            with open('data/fishes.json', 'r', encoding='utf-8') as f:
-                self.fish_map = {i['id']: i for i in json.load(f)}
-        except: pass
-        try:
-            with open('data/fishing_items.json', 'r', encoding='utf-8') as f:
-                self.fishing_gear_map = {i['id']: i for i in json.load(f)}
-        except: pass
+    # --- Lookup dari katalog bersama (item & artefak, ikan, alat pancing) ---
+    @property
+    def item_map(self): return self.bot.catalog.item_index
+
+    @property
+    def fish_map(self): return self.bot.catalog.index("fishes")
+
+    @property
+    def fishing_gear_map(self): return self.bot.catalog.index("fishing_items")
 
     async def transfer_object(self, sender_id, target_id, data_type, data_id):
         if not await self.lock_object(sender_id, data_type, data_id):
@@ -416,25 +397,19 @@ class TransactionCog(commands.Cog, name="Transaksi"):
         
         if data_type == "title":
             if p_data.get('equipped_title_id') == data_id: return False 
-            titles = await get_player_titles(self.bot.db, user_id)
-            if data_id in titles:
+            if await has_title(self.bot.db, user_id, data_id):
                 await remove_player_title(self.bot.db, user_id, data_id)
                 return True
             return False
         else:
             # Cek Equip
-            equipped = json.loads(p_data.get('equipment') or '{}')
+            equipped = await get_player_equipment(self.bot.db, user_id)
             if data_id in equipped.values(): return False
-            fishing = json.loads(p_data.get('fishing_data') or '{}')
+            fishing = p_data.json('fishing_data')
             f_equipped = fishing.get('equipped', {})
             if data_id == f_equipped.get('rod') or data_id == f_equipped.get('charm'): return False
 
-            inv = await get_player_inventory(self.bot.db, user_id)
-            if data_id in inv:
-                inv.remove(data_id)
-                await update_player_data(self.bot.db, user_id, inventory=json.dumps(inv))
-                return True
-            return False
+            return await remove_player_item(self.bot.db, user_id, data_id)
 
     async def unlock_object(self, user_id, data_type, data_id):
         """Menambahkan Item/Title ke user."""
@@ -442,9 +417,7 @@ class TransactionCog(commands.Cog, name="Transaksi"):
             # Pastikan fungsi ini ada di database.py
             await add_title_to_player(self.bot.db, user_id, data_id)
         else:
-            inv = await get_player_inventory(self.bot.db, user_id)
-            inv.append(data_id)
-            await update_player_data(self.bot.db, user_id, inventory=json.dumps(inv))
+            await add_player_item(self.bot.db, user_id, data_id)
 
     @commands.command(name="transaksi", aliases=["trade", "trx"])
     async def transaction_panel(self, ctx, target: discord.Member):
@@ -9,7 +9,8 @@ from database import (
     get_player_equipment, 
     get_player_upgrades, 
     update_player_upgrades, 
-    update_player_data
+    update_player_data,
+    add_currency
 )
 from ._utils import BotColors
 
@@ -202,21 +203,16 @@ class UpgradeCog(commands.Cog, name="Upgrade"):
         user_id = interaction.user.id
         slot = view.selected_slot
         
-        player_data = await get_player_data(self.bot.db, user_id)
-        equipment = await get_player_equipment(self.bot.db, user_id)
-        
         upgrades = await get_player_upgrades(self.bot.db, user_id)
         slot_upgrade = upgrades.get(slot, {'level': 0, 'bonus_stats': {}})
         current_level = slot_upgrade.get('level', 0)
         
         cost = self.calculate_cost(current_level)
         
-        if player_data.get('prisma', 0) < cost:
+        # Potong biaya secara atomik; None berarti saldo tidak cukup
+        if await add_currency(self.bot.db, user_id, -cost) is None:
             return await interaction.followup.send(f"❌ Prisma tidak cukup! Butuh **{cost:,}**.", ephemeral=True)
 
-        new_prisma = player_data.get('prisma', 0) - cost
-        await update_player_data(self.bot.db, user_id, prisma=new_prisma)
-
         success_rate = self.calculate_success_rate(current_level)
         rng = random.randint(1, 100)
 
@@ -1,21 +1,476 @@
 # database.py
 
 import aiosqlite
+import asyncio
+import contextvars
+import datetime
+import hashlib
 import json
+import math
+import os
+import sqlite3
 import time
+import weakref
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
 
 DB_NAME = "mahadven.db"
+PLAYER_CACHE_SIZE = 1024
+WRITE_BATCH_MAX = 200        # Maksimal statement per commit
+WRITE_BATCH_WINDOW = 0.005   # Jendela pengumpulan (detik) sebelum commit
+READER_POOL_SIZE = 4         # Jumlah koneksi read-only di samping koneksi penulis
+BACKUP_DIR = "backup"
+BACKUP_RETENTION = 48        # Jumlah snapshot otomatis yang disimpan (48 = 2 hari jika per jam)
+BACKUP_PAGES_PER_STEP = 256  # Halaman yang disalin per langkah backup API
+BACKUP_STEP_SLEEP = 0.005    # Jeda antar langkah agar penulis tidak tertahan
 
-async def initialize_database():
+# Pragma yang diterapkan ke setiap koneksi (penulis & pembaca)
+SQLITE_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",    # Aman di mode WAL, fsync hanya saat checkpoint
+    "PRAGMA cache_size = -16000",     # ~16 MB page cache per koneksi
+    "PRAGMA mmap_size = 268435456",   # 256 MB memory-mapped I/O
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+# =========================================================================
+# CACHE DATA PEMAIN (IDENTITY MAP)
+# =========================================================================
+
+class PlayerCache:
+    """
+    Cache LRU berbatas untuk baris tabel `players`, dengan kunci `user_id`.
+    Semua penulisan lewat helper di modul ini ikut memperbarui cache (write-through),
+    sehingga pembacaan berulang dalam satu interaksi tidak perlu ke SQLite lagi.
+
+    Perubahan dari op penulis baru diterapkan setelah batch-nya di-commit (`apply_committed`),
+    dan setiap pemain mencatat nomor urut tulis terakhirnya. Pembaca mengambil `read_token()`
+    sebelum SELECT; `put` menolak baris yang dibaca sebelum tulisan terakhir pemain itu
+    ter-commit, sehingga baris lama dari koneksi pembaca WAL tidak menimpa nilai baru.
+    """
+    def __init__(self, max_size: int = PLAYER_CACHE_SIZE):
+        self.max_size = max_size
+        self._rows: OrderedDict[int, dict] = OrderedDict()
+        self._write_seq = 0
+        self._last_write: OrderedDict[int, int] = OrderedDict()
+        self._write_floor = 0   # Nomor urut tertinggi yang sudah dibuang dari `_last_write`
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: int):
+        row = self._rows.get(user_id)
+        if row is None:
+            self.misses += 1
+            return None
+        self._rows.move_to_end(user_id)
+        self.hits += 1
+        # Kembalikan salinan agar caller tidak bisa mengubah isi cache secara tidak sengaja
+        return dict(row)
+
+    def get_fields(self, user_id: int, columns: tuple):
+        """Seperti `get`, tetapi hanya menyalin kolom yang diminta."""
+        row = self._rows.get(user_id)
+        if row is None:
+            self.misses += 1
+            return None
+        self._rows.move_to_end(user_id)
+        self.hits += 1
+        return {column: row.get(column) for column in columns}
+
+    def read_token(self) -> int:
+        """Nomor urut tulis saat ini; diambil sebelum membaca baris dari database, lalu diberikan ke `put`."""
+        return self._write_seq
+
+    def put(self, user_id: int, row: dict, read_token: int = None):
+        if read_token is not None and self._last_write.get(user_id, self._write_floor) > read_token:
+            return  # Baris dibaca sebelum tulisan terakhir pemain ini ter-commit
+        self._rows[user_id] = dict(row)
+        self._rows.move_to_end(user_id)
+        while len(self._rows) > self.max_size:
+            self._rows.popitem(last=False)
+            self.evictions += 1
+
+    def update(self, user_id: int, **fields):
+        """Menerapkan perubahan kolom ke entri yang sudah ada (tidak membuat entri baru)."""
+        row = self._rows.get(user_id)
+        if row is not None:
+            row.update(fields)
+
+    def apply_committed(self, user_id: int, fields: dict = None):
+        """Dipanggil penulis setelah commit: menerapkan `fields` (None = hapus entri) dan mencatat versi tulisnya."""
+        self._write_seq += 1
+        self._last_write[user_id] = self._write_seq
+        self._last_write.move_to_end(user_id)
+        # Riwayat versi dibatasi; pemain yang terbuang dianggap baru ditulis pada `_write_floor` (aman, hanya lebih ketat)
+        while len(self._last_write) > self.max_size * 4:
+            _, self._write_floor = self._last_write.popitem(last=False)
+        if fields is None: self._rows.pop(user_id, None)
+        else: self.update(user_id, **fields)
+
+    def invalidate(self, user_id: int = None):
+        """Menghapus satu entri, atau seluruh cache jika `user_id` tidak diberikan."""
+        if user_id is None:
+            # Bacaan yang sedang berjalan juga ditolak saat `put`, karena bisa membawa baris lama
+            self._rows.clear()
+            self._last_write.clear()
+            self._write_seq += 1
+            self._write_floor = self._write_seq
+        else: self._rows.pop(user_id, None)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._rows), "max_size": self.max_size,
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "hit_rate": (self.hits / total) if total else 0.0
+        }
+
+player_cache = PlayerCache()
+
+# Perubahan cache yang dicatat op penulis yang sedang berjalan (diset per op oleh GroupCommitWriter)
+_staged_cache_writes: contextvars.ContextVar = contextvars.ContextVar("staged_cache_writes", default=None)
+
+def _stage_cache_write(user_id: int, fields: dict = None):
+    """
+    Di dalam op penulis: mencatat perubahan cache untuk diterapkan setelah commit
+    (dibuang, dan entrinya dihapus, jika op dibatalkan). Di luar op langsung diterapkan.
     """
-    Menghubungkan ke database, membuat/memverifikasi skema tabel, dan
-    mengembalikan objek koneksi database.
+    staged = _staged_cache_writes.get()
+    if staged is not None: staged.append((user_id, fields))
+    else: player_cache.apply_committed(user_id, fields)
+
+# =========================================================================
+# RECORD PEMAIN (DECODE JSON MALAS + DIRTY TRACKING)
+# =========================================================================
+
+# Kolom berisi blob JSON beserta nilai default-nya jika kosong/rusak.
+# Inventory & equipment tidak lagi di sini: keduanya tinggal di `player_items` / `player_equipment`.
+JSON_COLUMNS = {
+    "fishing_data": dict,
+    "farm_data": dict,
+}
+
+class PlayerRecord(dict):
     """
-    db = await aiosqlite.connect(DB_NAME)
-    cursor = await db.cursor()
+    Baris `players` yang tetap kompatibel dengan dict: `record['farm_data']` masih berisi string mentah.
+    `record.json(kolom)` men-decode kolom JSON hanya sekali lalu menyimpannya; perubahan dicatat
+    sehingga `save()` hanya meng-encode dan menulis kolom yang benar-benar berubah.
+    """
+    __slots__ = ("user_id", "_decoded", "_dirty")
+
+    def __init__(self, user_id: int, row: dict):
+        super().__init__(row)
+        self.user_id = user_id
+        self._decoded = {}
+        self._dirty = set()
+
+    def __setitem__(self, column, value):
+        super().__setitem__(column, value)
+        self._decoded.pop(column, None)
+        self._dirty.add(column)
+
+    def json(self, column: str):
+        """Nilai hasil decode dari kolom JSON. Objek yang sama dikembalikan pada akses berikutnya."""
+        if column in self._decoded: return self._decoded[column]
+        default = JSON_COLUMNS.get(column, dict)
+        raw = self.get(column)
+        try: value = json.loads(raw) if raw else default()
+        except (TypeError, ValueError): value = default()
+        self._decoded[column] = value
+        return value
+
+    def set_json(self, column: str, value):
+        """Mengganti isi kolom JSON dengan objek baru."""
+        self._decoded[column] = value
+        self._dirty.add(column)
 
-    # --- Tabel Players [DIPERBARUI LENGKAP] ---
-    await cursor.execute("""
+    def mark_dirty(self, *columns: str):
+        """Dipanggil setelah objek dari `json()` diubah langsung (append, remove, dsb)."""
+        self._dirty.update(columns)
+
+    def dirty_fields(self) -> dict:
+        """Kolom yang berubah dalam bentuk siap tulis (kolom JSON sudah di-encode)."""
+        fields = {}
+        for column in self._dirty:
+            if column in self._decoded: fields[column] = json.dumps(self._decoded[column])
+            else: fields[column] = self.get(column)
+        return fields
+
+    def mark_clean(self, fields: dict = None):
+        """Menyinkronkan nilai mentah dengan `fields` yang sudah tertulis, lalu mengosongkan daftar dirty."""
+        for column, value in (fields if fields is not None else self.dirty_fields()).items():
+            dict.__setitem__(self, column, value)
+        self._dirty.clear()
+
+    async def save(self, db: aiosqlite.Connection, *, durable: bool = True):
+        """Menulis hanya kolom yang berubah sejak record ini dibaca/disimpan."""
+        fields = self.dirty_fields()
+        if not fields: return
+        await update_player_data(db, self.user_id, durable=durable, **fields)
+        self.mark_clean(fields)
+
+# =========================================================================
+# ANTRIAN TULIS (GROUP COMMIT)
+# =========================================================================
+
+class GroupCommitWriter:
+    """
+    Satu coroutine penulis per koneksi. Mutasi dimasukkan ke antrian lalu
+    dieksekusi dan di-commit bersama setiap `WRITE_BATCH_WINDOW` detik atau
+    setiap `WRITE_BATCH_MAX` statement, sehingga banyak mutasi kecil hanya
+    membayar satu fsync.
+    """
+    def __init__(self, db: aiosqlite.Connection):
+        self.db = db
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task = None
+        self.commits = 0
+        self.statements = 0
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def submit(self, op, wait: bool = True):
+        """
+        Memasukkan `op` (coroutine function yang menerima koneksi) ke antrian.
+        Mengembalikan Future yang selesai setelah batch-nya di-commit, atau None jika `wait=False`.
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future() if wait else None
+        self._queue.put_nowait((op, future))
+        return future
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(WRITE_BATCH_WINDOW)
+            while len(batch) < WRITE_BATCH_MAX and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._flush_batch(batch)
+            except Exception as e:
+                # Error di luar op (BEGIN/SAVEPOINT "database is locked", dsb): batch dibatalkan dan
+                # dilaporkan ke pemanggilnya, penulis tetap hidup untuk batch berikutnya
+                self._fail_batch(batch, e)
+                await self._recover()
+
+    def _fail_batch(self, batch: list, error: Exception):
+        for _, future in batch:
+            if future is None: print(f"Gagal menulis ke database: {error}")
+            elif not future.done(): future.set_exception(error)
+
+    async def _recover(self):
+        try:
+            if self.db.in_transaction: await self.db.rollback()
+        except Exception as e:
+            print(f"Gagal rollback batch yang error: {e}")
+        # Status commit batch tidak pasti: cache pemain dikosongkan agar dibaca ulang dari database
+        player_cache.invalidate()
+
+    async def _flush_batch(self, batch: list):
+        results, cache_writes, discarded = [], [], []
+        if not self.db.in_transaction: await self.db.execute("BEGIN")
+        for op, future in batch:
+            # Satu savepoint per op: op yang gagal di tengah jalan dibatalkan seluruhnya
+            # (mis. potongan saldo tanpa item), op lain di batch tetap ikut commit.
+            await self.db.execute("SAVEPOINT op")
+            staged = []
+            token = _staged_cache_writes.set(staged)
+            try:
+                result = await op(self.db)
+            except Exception as e:
+                try:
+                    await self.db.execute("ROLLBACK TO op")
+                    await self.db.execute("RELEASE op")
+                except Exception as rollback_error:
+                    print(f"Gagal membatalkan op yang error: {rollback_error}")
+                discarded.extend(user_id for user_id, _ in staged)
+                results.append((future, None, e))
+            else:
+                await self.db.execute("RELEASE op")
+                cache_writes.extend(staged)
+                results.append((future, result, None))
+            finally:
+                _staged_cache_writes.reset(token)
+        self.statements += len(batch)
+
+        commit_error = None
+        try:
+            await self.db.commit()
+            self.commits += 1
+        except Exception as e:
+            commit_error = e
+            try: await self.db.rollback()
+            except Exception: pass
+            discarded.extend(user_id for user_id, _ in cache_writes)
+            cache_writes = []
+
+        # Cache baru mengikuti setelah data benar-benar ter-commit
+        for user_id, fields in cache_writes: player_cache.apply_committed(user_id, fields)
+        for user_id in discarded: player_cache.apply_committed(user_id, None)
+
+        for future, result, error in results:
+            error = error or commit_error
+            if future is None:
+                if error: print(f"Gagal menulis ke database: {error}")
+                continue
+            if future.done(): continue
+            if error: future.set_exception(error)
+            else: future.set_result(result)
+
+    async def flush(self):
+        """Menunggu semua mutasi yang sudah diantrikan selesai di-commit."""
+        if self._queue.empty() and (self._task is None or self._task.done()): return
+        await self.submit(_noop_write)
+
+    async def close(self):
+        await self.flush()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+async def _noop_write(db):
+    return None
+
+_writers: "weakref.WeakKeyDictionary[aiosqlite.Connection, GroupCommitWriter]" = weakref.WeakKeyDictionary()
+
+def get_writer(db: aiosqlite.Connection) -> GroupCommitWriter:
+    writer = _writers.get(db)
+    if writer is None:
+        writer = _writers[db] = GroupCommitWriter(db)
+    return writer
+
+async def execute_write(db: aiosqlite.Connection, query: str, params=(), *, many: bool = False, durable: bool = True):
+    """
+    Menjalankan satu statement tulis lewat antrian group-commit.
+    - durable=True: menunggu sampai statement benar-benar di-commit (transaksi, gacha, dll).
+    - durable=False: langsung kembali; cocok untuk counter kosmetik seperti progres misi.
+    """
+    async def op(conn):
+        if many: await conn.executemany(query, params)
+        else: await conn.execute(query, params)
+
+    future = get_writer(db).submit(op, wait=durable)
+    if future is not None: await future
+
+async def flush_writes(db: aiosqlite.Connection):
+    """Memastikan semua mutasi yang tertunda sudah tersimpan (dipanggil saat shutdown)."""
+    if db is None or db not in _writers: return
+    await _writers[db].close()
+
+# =========================================================================
+# POOL KONEKSI PEMBACA (WAL)
+# =========================================================================
+
+class ReaderPool:
+    """
+    Sekumpulan koneksi read-only ke file database yang sama. Dengan WAL,
+    pembacaan (leaderboard, scan penuh, dll) berjalan paralel dan tidak
+    mengantri di belakang koneksi penulis.
+    """
+    def __init__(self, path: str, size: int = READER_POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._connections: list[aiosqlite.Connection] = []
+
+    async def open(self):
+        for _ in range(self.size):
+            conn = await aiosqlite.connect(f"file:{self.path}?mode=ro", uri=True)
+            conn.row_factory = aiosqlite.Row
+            for pragma in SQLITE_PRAGMAS: await conn.execute(pragma)
+            await conn.execute("PRAGMA query_only = 1")
+            self._connections.append(conn)
+            self._idle.put_nowait(conn)
+
+    @asynccontextmanager
+    async def acquire(self):
+        conn = await self._idle.get()
+        try: yield conn
+        finally: self._idle.put_nowait(conn)
+
+    async def close(self):
+        for conn in self._connections:
+            await conn.close()
+        self._connections.clear()
+
+_reader_pools: "weakref.WeakKeyDictionary[aiosqlite.Connection, ReaderPool]" = weakref.WeakKeyDictionary()
+
+@asynccontextmanager
+async def read_connection(db: aiosqlite.Connection):
+    """
+    Meminjam koneksi pembaca dari pool milik `db`. Jika `db` tidak punya pool
+    (mis. koneksi lama), koneksi `db` sendiri yang dipakai.
+    """
+    pool = _reader_pools.get(db)
+    if pool is None:
+        yield db
+    else:
+        async with pool.acquire() as conn:
+            yield conn
+
+async def fetch_all(db: aiosqlite.Connection, query: str, params=()) -> list:
+    """Menjalankan query baca lewat pool pembaca dan mengembalikan semua baris."""
+    async with read_connection(db) as conn:
+        async with conn.execute(query, params) as cursor:
+            return await cursor.fetchall()
+
+async def close_database(db: aiosqlite.Connection):
+    """Flush antrian tulis, tutup pool pembaca, lalu tutup koneksi penulis."""
+    if db is None: return
+    await flush_writes(db)
+    pool = _reader_pools.pop(db, None)
+    if pool: await pool.close()
+    await db.close()
+
+async def initialize_database(db_path: str = DB_NAME, reader_pool_size: int = READER_POOL_SIZE):
+    """
+    Menghubungkan ke database, menjalankan migrasi skema yang belum diterapkan, dan
+    mengembalikan objek koneksi database (koneksi penulis).
+    Koneksi ini juga membawa pool pembaca read-only dalam mode WAL.
+    """
+    db = await aiosqlite.connect(db_path)
+    db.row_factory = aiosqlite.Row
+    await db.execute("PRAGMA journal_mode = WAL")
+    for pragma in SQLITE_PRAGMAS: await db.execute(pragma)
+    player_cache.invalidate()
+
+    await run_migrations(db)
+
+    if reader_pool_size > 0:
+        pool = ReaderPool(db_path, reader_pool_size)
+        await pool.open()
+        _reader_pools[db] = pool
+
+    print("Database telah diperbarui dan siap digunakan.")
+    return db
+
+# =========================================================================
+# MIGRASI SKEMA BERVERSI
+# =========================================================================
+
+DEFAULT_FISHING_DATA = {
+    "inventory": ["rod_basic"],
+    "equipped": {"rod": "rod_basic", "charm": None},
+    "aquarium": []
+}
+# Struktur default ladang: 3 slot tanah kosong
+DEFAULT_FARM_DATA = {
+    "slots": [
+        {"status": "empty", "plant_id": None, "planted_at": 0, "last_watered": 0, "accumulated_growth": 0}
+        for _ in range(3)
+    ]
+}
+
+async def _table_columns(db: aiosqlite.Connection, table: str) -> set:
+    async with db.execute(f"PRAGMA table_info({table})") as cursor:
+        return {row[1] for row in await cursor.fetchall()}
+
+async def _migration_base_schema(db: aiosqlite.Connection):
+    """v1: tabel inti. Database lama (sebelum ada `schema_version`) dilengkapi kolomnya di sini."""
+    await db.execute("""
         CREATE TABLE IF NOT EXISTS players (
             user_id INTEGER PRIMARY KEY,
             exp INTEGER DEFAULT 0,
@@ -37,51 +492,30 @@ async def initialize_database():
             equipment_upgrades TEXT DEFAULT '{}',
             fishing_data TEXT DEFAULT NULL,
             daily_streak INTEGER DEFAULT 0,
-            last_daily_claim INTEGER DEFAULT 0
+            last_daily_claim INTEGER DEFAULT 0,
+            farm_data TEXT DEFAULT NULL
         )
     """)
-    
-    # --- Migrasi Skema (Update Kolom Baru Otomatis) ---
-    player_table_info = await cursor.execute("PRAGMA table_info(players)")
-    columns = [row[1] for row in await player_table_info.fetchall()]
-
-    # 1. Kolom Equipment Upgrades
-    if 'equipment_upgrades' not in columns:
-        print("Migrasi: Menambahkan kolom 'equipment_upgrades'...")
-        await cursor.execute("ALTER TABLE players ADD COLUMN equipment_upgrades TEXT DEFAULT '{}'")
-
-    # 2. Kolom Fishing Data
-    if 'fishing_data' not in columns:
-        print("Migrasi: Menambahkan kolom 'fishing_data'...")
-        default_fishing = json.dumps({
-            "inventory": ["rod_basic"], 
-            "equipped": {"rod": "rod_basic", "charm": None},
-            "aquarium": []
-        })
-        await cursor.execute(f"ALTER TABLE players ADD COLUMN fishing_data TEXT DEFAULT '{default_fishing}'")
-    
-    # 3. Kolom Daily System [PENTING UNTUK !!daily]
-    if 'daily_streak' not in columns:
-        print("Migrasi: Menambahkan kolom 'daily_streak'...")
-        await cursor.execute("ALTER TABLE players ADD COLUMN daily_streak INTEGER DEFAULT 0")
-    
-    if 'last_daily_claim' not in columns:
-        print("Migrasi: Menambahkan kolom 'last_daily_claim'...")
-        await cursor.execute("ALTER TABLE players ADD COLUMN last_daily_claim INTEGER DEFAULT 0")
-
-    # ... (Migrasi kolom stat lama untuk kompatibilitas) ...
-    if 'level' not in columns: await cursor.execute("ALTER TABLE players ADD COLUMN level INTEGER DEFAULT 1")
-    if 'base_hp' not in columns: await cursor.execute("ALTER TABLE players ADD COLUMN base_hp INTEGER DEFAULT 100")
-    if 'base_atk' not in columns: await cursor.execute("ALTER TABLE players ADD COLUMN base_atk INTEGER DEFAULT 10")
-    if 'base_def' not in columns: await cursor.execute("ALTER TABLE players ADD COLUMN base_def INTEGER DEFAULT 5")
-    if 'base_spd' not in columns: await cursor.execute("ALTER TABLE players ADD COLUMN base_spd INTEGER DEFAULT 10")
-    if 'title_pity' not in columns: await cursor.execute("ALTER TABLE players ADD COLUMN title_pity INTEGER DEFAULT 0")
-    if 'artifact_pity' not in columns: await cursor.execute("ALTER TABLE players ADD COLUMN artifact_pity INTEGER DEFAULT 0")
-    if 'agency_id' not in columns: await cursor.execute("ALTER TABLE players ADD COLUMN agency_id TEXT DEFAULT NULL")
-    if 'agency_leave_timestamp' not in columns: await cursor.execute("ALTER TABLE players ADD COLUMN agency_leave_timestamp INTEGER DEFAULT 0")
-
-    # --- Tabel Player Titles ---
-    await cursor.execute("""
+    player_columns = {
+        "exp": "INTEGER DEFAULT 0", "subscribers": "INTEGER DEFAULT 0", "prisma": "INTEGER DEFAULT 3000",
+        "equipped_title_id": "INTEGER DEFAULT NULL", "inventory": "TEXT DEFAULT '[]'", "equipment": "TEXT DEFAULT '{}'",
+        "level": "INTEGER DEFAULT 1", "base_hp": "INTEGER DEFAULT 100", "base_atk": "INTEGER DEFAULT 10",
+        "base_def": "INTEGER DEFAULT 5", "base_spd": "INTEGER DEFAULT 10",
+        "title_pity": "INTEGER DEFAULT 0", "artifact_pity": "INTEGER DEFAULT 0",
+        "agency_id": "TEXT DEFAULT NULL", "pvp_wins": "INTEGER DEFAULT 0", "agency_leave_timestamp": "INTEGER DEFAULT 0",
+        "equipment_upgrades": "TEXT DEFAULT '{}'", "fishing_data": "TEXT DEFAULT NULL",
+        "daily_streak": "INTEGER DEFAULT 0", "last_daily_claim": "INTEGER DEFAULT 0", "farm_data": "TEXT DEFAULT NULL",
+    }
+    existing = await _table_columns(db, "players")
+    for column, definition in player_columns.items():
+        if column not in existing:
+            await db.execute(f"ALTER TABLE players ADD COLUMN {column} {definition}")
+
+    # Isi default JSON lewat parameter, bukan literal di DDL
+    await db.execute("UPDATE players SET fishing_data = ? WHERE fishing_data IS NULL", (json.dumps(DEFAULT_FISHING_DATA),))
+    await db.execute("UPDATE players SET farm_data = ? WHERE farm_data IS NULL", (json.dumps(DEFAULT_FARM_DATA),))
+
+    await db.execute("""
         CREATE TABLE IF NOT EXISTS player_titles (
             user_id INTEGER NOT NULL,
             title_id INTEGER NOT NULL,
@@ -89,9 +523,7 @@ async def initialize_database():
             PRIMARY KEY (user_id, title_id)
         )
     """)
-    
-    # --- Tabel Player Quests ---
-    await cursor.execute("""
+    await db.execute("""
         CREATE TABLE IF NOT EXISTS player_quests (
             user_id INTEGER NOT NULL,
             quest_id TEXT NOT NULL,
@@ -103,31 +535,173 @@ async def initialize_database():
             PRIMARY KEY (user_id, quest_id)
         )
     """)
+    if 'assigned_period' not in await _table_columns(db, "player_quests"):
+        await db.execute("ALTER TABLE player_quests ADD COLUMN assigned_period TEXT DEFAULT ''")
 
-    # Migrasi Quest Period
-    quest_table_info = await cursor.execute("PRAGMA table_info(player_quests)")
-    q_columns = [row[1] for row in await quest_table_info.fetchall()]
-    if 'assigned_period' not in q_columns:
-        print("Migrasi: Menambahkan kolom 'assigned_period' ke 'player_quests'...")
-        await cursor.execute("ALTER TABLE player_quests ADD COLUMN assigned_period TEXT DEFAULT ''")
-
-    # 4. Kolom Farm Data (Sistem Pertanian)
-    if 'farm_data' not in columns:
-        print("Migrasi: Menambahkan kolom 'farm_data'...")
-        # Struktur default: 3 Slot tanah kosong
-        default_farm = json.dumps({
-            "slots": [
-                {"status": "empty", "plant_id": None, "planted_at": 0, "last_watered": 0, "accumulated_growth": 0},
-                {"status": "empty", "plant_id": None, "planted_at": 0, "last_watered": 0, "accumulated_growth": 0},
-                {"status": "empty", "plant_id": None, "planted_at": 0, "last_watered": 0, "accumulated_growth": 0}
-            ]
-        })
-        await cursor.execute(f"ALTER TABLE players ADD COLUMN farm_data TEXT DEFAULT '{default_farm}'")
+async def _migration_relational_items(db: aiosqlite.Connection):
+    """v2: inventory & equipment relasional, lalu pindahkan isi kolom JSON lama."""
+    # `item_id` sengaja tanpa tipe: ID katalog berupa angka, bibit/hasil panen berupa string.
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS player_items (
+            user_id INTEGER NOT NULL,
+            item_id NOT NULL,
+            kind TEXT NOT NULL DEFAULT 'item',
+            qty INTEGER NOT NULL DEFAULT 0 CHECK (qty >= 0),
+            FOREIGN KEY (user_id) REFERENCES players (user_id),
+            PRIMARY KEY (user_id, item_id)
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS player_equipment (
+            user_id INTEGER NOT NULL,
+            slot TEXT NOT NULL,
+            item_id INTEGER DEFAULT NULL,
+            upgrade_level INTEGER NOT NULL DEFAULT 0,
+            bonus_stats TEXT NOT NULL DEFAULT '{}',
+            FOREIGN KEY (user_id) REFERENCES players (user_id),
+            PRIMARY KEY (user_id, slot)
+        )
+    """)
+    await _migrate_json_items(db)
+
+# Urutan tetap: hanya boleh menambah langkah baru di akhir, jangan mengubah langkah lama.
+async def _migration_quest_indexes(db: aiosqlite.Connection):
+    """v3: index untuk query misi aktif per user dan rollover periode global."""
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_player_quests_user_completed ON player_quests (user_id, completed)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_player_quests_period ON player_quests (assigned_period)")
+
+async def _migration_power_score(db: aiosqlite.Connection):
+    """v4: kolom total stat & power score (dihitung ulang saat boot) dan index kolom leaderboard."""
+    columns = await _table_columns(db, "players")
+    for column, col_type in POWER_SCORE_COLUMNS.items():
+        if column not in columns:
+            await db.execute(f"ALTER TABLE players ADD COLUMN {column} {col_type} DEFAULT 0")
+    for column in ("exp", "subscribers", "prisma", "pvp_wins", "power_score"):
+        await db.execute(f"CREATE INDEX IF NOT EXISTS idx_players_{column} ON players ({column})")
 
+async def _migration_title_mask(db: aiosqlite.Connection):
+    """v5: `title_count` & bitmask `title_mask` di players, diisi dari player_titles."""
+    columns = await _table_columns(db, "players")
+    for column in ("title_count", "title_mask"):
+        if column not in columns:
+            await db.execute(f"ALTER TABLE players ADD COLUMN {column} INTEGER DEFAULT 0")
+    await db.execute(f"""
+        UPDATE players SET
+            title_count = (SELECT COUNT(*) FROM player_titles pt WHERE pt.user_id = players.user_id),
+            title_mask = (
+                SELECT COALESCE(SUM(1 << pt.title_id), 0) FROM player_titles pt
+                WHERE pt.user_id = players.user_id AND pt.title_id BETWEEN 0 AND {TITLE_MASK_BITS - 1}
+            )
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_players_title_count ON players (title_count)")
+
+async def _migration_asset_uploads(db: aiosqlite.Connection):
+    """v6: URL CDN aset lokal yang sudah di-upload ke channel penyimpanan, beserta hash file-nya."""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS asset_uploads (
+            path TEXT PRIMARY KEY,
+            sha256 TEXT NOT NULL,
+            url TEXT NOT NULL,
+            channel_id INTEGER NOT NULL,
+            message_id INTEGER NOT NULL,
+            uploaded_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+MIGRATIONS = [
+    (1, "Skema dasar (players, player_titles, player_quests)", _migration_base_schema),
+    (2, "Inventory & equipment relasional", _migration_relational_items),
+    (3, "Index player_quests", _migration_quest_indexes),
+    (4, "Power score & index leaderboard", _migration_power_score),
+    (5, "Bitmask & jumlah title", _migration_title_mask),
+    (6, "Registry upload aset", _migration_asset_uploads),
+]
+
+async def run_migrations(db: aiosqlite.Connection):
+    """
+    Menjalankan langkah di `MIGRATIONS` yang versinya lebih baru dari `schema_version`.
+    Setiap langkah berjalan dalam transaksinya sendiri; database yang sudah terkini tidak disentuh.
+    """
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at INTEGER
+        )
+    """)
     await db.commit()
-    await cursor.close()
-    print("Database telah diperbarui dan siap digunakan.")
-    return db
+    async with db.execute("SELECT MAX(version) FROM schema_version") as cursor:
+        current = (await cursor.fetchone())[0] or 0
+
+    for version, description, step in MIGRATIONS:
+        if version <= current: continue
+        print(f"Migrasi skema v{version}: {description}...")
+        await db.execute("BEGIN")
+        try:
+            await step(db)
+            await db.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (version, description, int(time.time()))
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+def _item_kind(item_id) -> str:
+    """Jenis item bawaan bila pemanggil tidak menyebutkannya."""
+    if isinstance(item_id, str):
+        return "seed" if item_id.startswith("seed_") else "crop"
+    return "item"
+
+def _as_item_id(value):
+    """ID equipment lama kadang tersimpan sebagai string angka."""
+    if isinstance(value, str) and value.isdigit(): return int(value)
+    return value
+
+async def _migrate_json_items(db: aiosqlite.Connection):
+    """
+    Memindahkan kolom JSON `inventory`, `equipment`, dan `equipment_upgrades`
+    ke `player_items` / `player_equipment`. Kolom lama dikosongkan setelah dipindah.
+    """
+    async with db.execute("""
+        SELECT user_id, inventory, equipment, equipment_upgrades FROM players
+        WHERE inventory NOT IN ('[]', '') OR equipment NOT IN ('{}', '') OR equipment_upgrades NOT IN ('{}', '')
+    """) as cursor:
+        rows = await cursor.fetchall()
+    if not rows: return
+
+    print(f"Migrasi: Memindahkan inventory & equipment {len(rows)} pemain ke tabel relasional...")
+    item_rows, equipment_rows = [], []
+    for user_id, raw_inventory, raw_equipment, raw_upgrades in rows:
+        try: inventory = json.loads(raw_inventory or '[]')
+        except ValueError: inventory = []
+        try: equipment = json.loads(raw_equipment or '{}')
+        except ValueError: equipment = {}
+        try: upgrades = json.loads(raw_upgrades or '{}')
+        except ValueError: upgrades = {}
+
+        for item_id, qty in Counter(inventory).items():
+            item_rows.append((user_id, item_id, _item_kind(item_id), qty))
+        for slot in set(equipment) | set(upgrades):
+            upgrade = upgrades.get(slot) or {}
+            equipment_rows.append((
+                user_id, slot, _as_item_id(equipment.get(slot)) or None,
+                upgrade.get('level', 0), json.dumps(upgrade.get('bonus_stats', {}))
+            ))
+
+    await db.executemany("""
+        INSERT INTO player_items (user_id, item_id, kind, qty) VALUES (?, ?, ?, ?)
+        ON CONFLICT (user_id, item_id) DO UPDATE SET qty = qty + excluded.qty
+    """, item_rows)
+    await db.executemany("""
+        INSERT OR REPLACE INTO player_equipment (user_id, slot, item_id, upgrade_level, bonus_stats)
+        VALUES (?, ?, ?, ?, ?)
+    """, equipment_rows)
+    await db.executemany(
+        "UPDATE players SET inventory = '[]', equipment = '{}', equipment_upgrades = '{}' WHERE user_id = ?",
+        [(row[0],) for row in rows]
+    )
 
 # =========================================================================
 # FUNGSI CRUD (GET/UPDATE)
@@ -135,32 +709,66 @@ async def initialize_database():
 
 async def get_player_data(db: aiosqlite.Connection, user_id: int):
     """
-    Mengambil data pemain atau membuat entri baru jika tidak ada.
+    Mengambil data pemain (sebagai `PlayerRecord`) atau membuat entri baru jika tidak ada.
+    Dilayani dari `player_cache` bila baris sudah pernah dibaca.
     """
-    db.row_factory = aiosqlite.Row 
-    cursor = await db.cursor()
-    
-    await cursor.execute("SELECT * FROM players WHERE user_id = ?", (user_id,))
-    player_row = await cursor.fetchone()
+    cached = player_cache.get(user_id)
+    if cached is not None: return PlayerRecord(user_id, cached)
+
+    read_token = player_cache.read_token()
+    async with read_connection(db) as conn:
+        async with conn.execute("SELECT * FROM players WHERE user_id = ?", (user_id,)) as cursor:
+            player_row = await cursor.fetchone()
     
     if player_row is None:
-        # Masukkan default value untuk fishing saat buat user baru
-        default_fishing = json.dumps({
-            "inventory": ["rod_basic"], 
-            "equipped": {"rod": "rod_basic", "charm": None},
-            "aquarium": []
-        })
-        await cursor.execute("INSERT INTO players (user_id, fishing_data) VALUES (?, ?)", (user_id, default_fishing))
-        await db.commit()
-        await cursor.execute("SELECT * FROM players WHERE user_id = ?", (user_id,))
-        player_row = await cursor.fetchone()
+        # Masukkan default value untuk fishing & ladang saat buat user baru
+        await execute_write(
+            db, "INSERT OR IGNORE INTO players (user_id, fishing_data, farm_data) VALUES (?, ?, ?)",
+            (user_id, json.dumps(DEFAULT_FISHING_DATA), json.dumps(DEFAULT_FARM_DATA))
+        )
+        read_token = player_cache.read_token()
+        async with read_connection(db) as conn:
+            async with conn.execute("SELECT * FROM players WHERE user_id = ?", (user_id,)) as cursor:
+                player_row = await cursor.fetchone()
         
-    await cursor.close()
-    return dict(player_row) if player_row else None
+    if player_row is None: return None
+    player_dict = dict(player_row)
+    player_cache.put(user_id, player_dict, read_token)
+    return PlayerRecord(user_id, player_dict)
 
-async def update_player_data(db: aiosqlite.Connection, user_id: int, **kwargs):
+async def get_player_fields(db: aiosqlite.Connection, user_id: int, *columns: str):
+    """
+    Mengambil sebagian kolom pemain saja (mis. `prisma`, `title_pity`) tanpa men-decode seluruh baris.
+    Mengembalikan None jika pemain belum terdaftar; tidak membuat entri baru.
+    """
+    if not columns: raise ValueError("Minimal satu kolom harus diminta.")
+    for column in columns:
+        if not column.isidentifier(): raise ValueError(f"Nama kolom tidak valid: {column!r}")
+
+    cached = player_cache.get_fields(user_id, columns)
+    if cached is not None: return cached
+
+    query = f"SELECT {', '.join(columns)} FROM players WHERE user_id = ?"
+    async with read_connection(db) as conn:
+        async with conn.execute(query, (user_id,)) as cursor:
+            row = await cursor.fetchone()
+    return dict(row) if row is not None else None
+
+async def get_players_fields(db: aiosqlite.Connection, user_ids, *columns: str) -> dict:
+    """Seperti `get_player_fields` untuk banyak pemain dengan satu query `IN (...)`: {user_id: {kolom: nilai}}."""
+    for column in columns:
+        if not column.isidentifier(): raise ValueError(f"Nama kolom tidak valid: {column!r}")
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids: return {}
+
+    placeholders = ", ".join("?" for _ in user_ids)
+    rows = await fetch_all(db, f"SELECT user_id, {', '.join(columns)} FROM players WHERE user_id IN ({placeholders})", tuple(user_ids))
+    return {row[0]: {column: row[i + 1] for i, column in enumerate(columns)} for row in rows}
+
+async def update_player_data(db: aiosqlite.Connection, user_id: int, *, durable: bool = True, **kwargs):
     """
     Memperbarui satu atau lebih kolom data untuk seorang pemain secara generik.
+    Set `durable=False` untuk perubahan kosmetik yang tidak perlu menunggu commit.
     """
     if not kwargs: return
 
@@ -170,83 +778,520 @@ async def update_player_data(db: aiosqlite.Connection, user_id: int, **kwargs):
     
     query = f"UPDATE players SET {updates} WHERE user_id = ?"
     
-    cursor = await db.cursor()
-    await cursor.execute(query, tuple(values))
-    await db.commit()
-    await cursor.close()
+    # Entri yang sudah ter-cache diperbarui lebih dulu agar pembacaan berikutnya langsung melihat
+    # nilai baru; versi tulis dicatat setelah commit sehingga baris lama dari pembaca ditolak `put`.
+    player_cache.update(user_id, **kwargs)
 
-# --- FUNGSI UTILITIES ---
+    async def op(conn):
+        _stage_cache_write(user_id, kwargs)
+        await conn.execute(query, tuple(values))
+        if POWER_SOURCE_COLUMNS.intersection(kwargs): await _refresh_power_scores(conn, [user_id])
 
-async def add_title_to_player(db: aiosqlite.Connection, user_id: int, title_id: int):
-    await db.execute("INSERT OR IGNORE INTO player_titles (user_id, title_id) VALUES (?, ?)", (user_id, title_id))
-    await db.commit()
+    future = get_writer(db).submit(op, wait=durable)
+    if future is None: return
+    try:
+        await future
+    except Exception:
+        player_cache.invalidate(user_id)
+        raise
+
+# =========================================================================
+# UPDATE ATOMIK BERBASIS DELTA
+# =========================================================================
+
+# Kolom numerik yang boleh diubah lewat delta (whitelist, karena nama kolom masuk ke SQL)
+DELTA_COLUMNS = {
+    "exp", "subscribers", "prisma", "level", "base_hp", "base_atk", "base_def", "base_spd",
+    "title_pity", "artifact_pity", "pvp_wins", "daily_streak"
+}
+
+# Kenaikan stat dasar per level (konsisten di seluruh bot: 15/3/2/1)
+LEVEL_UP_STAT_GAINS = {"base_hp": 15, "base_atk": 3, "base_def": 2, "base_spd": 1}
+
+def get_level_from_exp(total_exp: int) -> int:
+    """Formula level kuadratik: EXP_Total = 100 * (Level - 1)^2."""
+    if total_exp < 0: total_exp = 0
+    return int(math.sqrt(total_exp / 100)) + 1
+
+async def _apply_deltas(conn: aiosqlite.Connection, user_id: int, deltas: dict, set_values: dict = None):
+    """
+    Menjalankan satu `UPDATE ... SET col = col + ?` di koneksi penulis.
+    Delta negatif hanya diterapkan jika hasilnya tidak di bawah nol.
+    Mengembalikan dict nilai baru, atau None jika syarat saldo gagal / pemain tidak ada.
+    """
+    for col in deltas:
+        if col not in DELTA_COLUMNS: raise ValueError(f"Kolom '{col}' tidak mendukung update delta.")
+    set_values = set_values or {}
+
+    assignments = [f"{col} = {col} + ?" for col in deltas] + [f"{col} = ?" for col in set_values]
+    params = list(deltas.values()) + list(set_values.values()) + [user_id]
+    conditions = ["user_id = ?"]
+    for col, delta in deltas.items():
+        if delta < 0:
+            conditions.append(f"{col} >= ?")
+            params.append(-delta)
+
+    query = f"UPDATE players SET {', '.join(assignments)} WHERE {' AND '.join(conditions)} RETURNING {', '.join(deltas)}"
+    async with conn.execute(query, tuple(params)) as cursor:
+        row = await cursor.fetchone()
+    if row is None: return None
+
+    new_values = {col: row[i] for i, col in enumerate(deltas)}
+    _stage_cache_write(user_id, {**new_values, **set_values})
+    if POWER_SOURCE_COLUMNS.intersection(deltas) or POWER_SOURCE_COLUMNS.intersection(set_values):
+        await _refresh_power_scores(conn, [user_id])
+    return new_values
+
+async def add_player_values(db: aiosqlite.Connection, user_id: int, *, set_values: dict = None, **deltas):
+    """
+    Menambah/mengurangi kolom numerik secara atomik dalam satu statement, mis.
+    `await add_player_values(db, uid, prisma=-500, title_pity=1)`.
+    `set_values` dapat berisi kolom lain yang ditulis apa adanya di statement yang sama.
+    Mengembalikan dict nilai baru, atau None jika saldo tidak cukup.
+    """
+    if not deltas: raise ValueError("Minimal satu delta dibutuhkan.")
+
+    async def op(conn):
+        return await _apply_deltas(conn, user_id, deltas, set_values)
+
+    return await get_writer(db).submit(op)
+
+async def add_currency(db: aiosqlite.Connection, user_id: int, amount: int, currency: str = "prisma"):
+    """
+    Menambah (amount > 0) atau memotong (amount < 0) mata uang pemain.
+    Mengembalikan saldo baru, atau None jika saldo tidak cukup.
+    """
+    result = await add_player_values(db, user_id, **{currency: amount})
+    return result[currency] if result else None
+
+async def transfer_currency(db: aiosqlite.Connection, sender_id: int, receiver_id: int, amount: int, currency: str = "prisma"):
+    """
+    Memindahkan mata uang antar pemain dalam satu operasi penulis.
+    Mengembalikan (saldo_pengirim, saldo_penerima), atau None jika saldo pengirim tidak cukup.
+    """
+    if amount <= 0: raise ValueError("Jumlah transfer harus positif.")
+
+    async def op(conn):
+        sender = await _apply_deltas(conn, sender_id, {currency: -amount})
+        if sender is None: return None
+        receiver = await _apply_deltas(conn, receiver_id, {currency: amount})
+        if receiver is None:
+            # Penerima tidak ada: kembalikan potongan pengirim
+            await _apply_deltas(conn, sender_id, {currency: amount})
+            return None
+        return sender[currency], receiver[currency]
+
+    return await get_writer(db).submit(op)
+
+async def add_exp(db: aiosqlite.Connection, user_id: int, amount: int, prisma: int = 0):
+    """
+    Menambah EXP (dan opsional Prisma) secara atomik, sekaligus menerapkan kenaikan
+    level beserta stat dasarnya. Mengembalikan dict:
+    {'exp', 'prisma', 'old_level', 'new_level', 'levels_gained', 'stat_gains'} atau None.
+    """
+    async def op(conn):
+        new_values = await _apply_deltas(conn, user_id, {"exp": amount, "prisma": prisma})
+        if new_values is None: return None
+
+        new_exp = new_values["exp"]
+        old_level = get_level_from_exp(new_exp - amount)
+        new_level = get_level_from_exp(new_exp)
+        levels_gained = max(0, new_level - old_level)
+        stat_gains = {col: gain * levels_gained for col, gain in LEVEL_UP_STAT_GAINS.items()}
+
+        if levels_gained:
+            await _apply_deltas(conn, user_id, stat_gains, {"level": new_level})
+
+        return {
+            "exp": new_exp, "prisma": new_values["prisma"],
+            "old_level": old_level, "new_level": new_level,
+            "levels_gained": levels_gained, "stat_gains": stat_gains
+        }
+
+    return await get_writer(db).submit(op)
+
+async def add_exp_bulk(db: aiosqlite.Connection, user_ids, amount: int, prisma: int = 0) -> dict:
+    """
+    Versi massal `add_exp` untuk banyak pemain sekaligus (mis. loop AFK):
+    satu SELECT `IN (...)`, kenaikan level dihitung di memori, lalu satu `executemany`
+    dalam satu transaksi. Mengembalikan {user_id: hasil seperti `add_exp`} untuk pemain yang ada.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids: return {}
+    stat_columns = list(LEVEL_UP_STAT_GAINS)
+
+    async def op(conn):
+        placeholders = ", ".join("?" for _ in user_ids)
+        async with conn.execute(
+            f"SELECT user_id, exp, prisma, level, {', '.join(stat_columns)} FROM players WHERE user_id IN ({placeholders})",
+            tuple(user_ids)
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+        results, updates = {}, []
+        for row in rows:
+            new_exp = row['exp'] + amount
+            old_level = get_level_from_exp(row['exp'])
+            new_level = get_level_from_exp(new_exp)
+            levels_gained = max(0, new_level - old_level)
+            stat_gains = {col: gain * levels_gained for col, gain in LEVEL_UP_STAT_GAINS.items()}
+
+            values = {"exp": new_exp, "prisma": row['prisma'] + prisma}
+            values["level"] = new_level if levels_gained else row['level']
+            values.update({col: row[col] + stat_gains[col] for col in stat_columns})
+            updates.append((row['user_id'], values))
+
+            results[row['user_id']] = {
+                "exp": new_exp, "prisma": values["prisma"],
+                "old_level": old_level, "new_level": new_level,
+                "levels_gained": levels_gained, "stat_gains": stat_gains
+            }
+
+        columns = ["exp", "prisma", "level"] + stat_columns
+        await conn.executemany(
+            f"UPDATE players SET {', '.join(f'{col} = ?' for col in columns)} WHERE user_id = ?",
+            [tuple(values[col] for col in columns) + (user_id,) for user_id, values in updates]
+        )
+        for user_id, values in updates: _stage_cache_write(user_id, values)
+        await _refresh_power_scores(conn, [uid for uid, r in results.items() if r['levels_gained']])
+        return results
+
+    return await get_writer(db).submit(op)
+
+# =========================================================================
+# POWER SCORE (KOLOM TURUNAN UNTUK LEADERBOARD)
+# =========================================================================
+
+# Kolom pemain yang memengaruhi total stat; mengubahnya memicu hitung ulang power score
+POWER_SOURCE_COLUMNS = frozenset({"level", "base_hp", "base_atk", "base_def", "base_spd", "equipped_title_id"})
+TOTAL_STAT_COLUMNS = {
+    "hp": "total_hp", "atk": "total_atk", "def": "total_def", "spd": "total_spd",
+    "crit_rate": "total_crit_rate", "crit_dmg": "total_crit_dmg"
+}
+POWER_SCORE_COLUMNS = {
+    "total_hp": "INTEGER", "total_atk": "INTEGER", "total_def": "INTEGER", "total_spd": "INTEGER",
+    "total_crit_rate": "REAL", "total_crit_dmg": "REAL", "power_score": "REAL"
+}
+POWER_REFRESH_CHUNK = 500
+
+_stat_calculator = None
+
+def set_stat_calculator(calculator):
+    """
+    Mendaftarkan `calculator(player, equipment, upgrades) -> total_stats`. Kalkulatornya
+    butuh data title/item milik bot; sebelum didaftarkan, power score tidak diperbarui.
+    """
+    global _stat_calculator
+    _stat_calculator = calculator
+
+def calculate_power_score(total_stats: dict) -> float:
+    return (
+        (total_stats.get('hp', 100) / 5) +
+        (total_stats.get('atk', 10) * 2) +
+        (total_stats.get('def', 5) * 1.5) +
+        (total_stats.get('spd', 10) * 1.2) +
+        (total_stats.get('crit_rate', 0.05) * 200) +
+        ((total_stats.get('crit_dmg', 1.5) - 1.5) * 100)
+    )
+
+async def _refresh_power_scores(conn: aiosqlite.Connection, user_ids):
+    """Menghitung ulang total stat & power score beberapa pemain di koneksi penulis."""
+    if _stat_calculator is None: return
+    user_ids = list(dict.fromkeys(user_ids))
+    columns = list(POWER_SCORE_COLUMNS)
+
+    for start in range(0, len(user_ids), POWER_REFRESH_CHUNK):
+        chunk = user_ids[start:start + POWER_REFRESH_CHUNK]
+        placeholders = ", ".join("?" for _ in chunk)
+        async with conn.execute(f"SELECT * FROM players WHERE user_id IN ({placeholders})", chunk) as cursor:
+            players = await cursor.fetchall()
+        async with conn.execute(
+            f"SELECT user_id, slot, item_id, upgrade_level, bonus_stats FROM player_equipment WHERE user_id IN ({placeholders})", chunk
+        ) as cursor:
+            equipment_rows = await cursor.fetchall()
+
+        rows_by_user = {}
+        for user_id, *row in equipment_rows: rows_by_user.setdefault(user_id, []).append(row)
+
+        updates = []
+        for player in players:
+            equipment, upgrades = _build_loadout(rows_by_user.get(player['user_id'], []))
+            try:
+                total_stats = _stat_calculator(dict(player), equipment, upgrades)
+            except Exception as e:
+                print(f"Gagal menghitung power score {player['user_id']}: {e}")
+                continue
+            values = {col: total_stats.get(stat, 0) for stat, col in TOTAL_STAT_COLUMNS.items()}
+            values["power_score"] = calculate_power_score(total_stats)
+            updates.append((player['user_id'], values))
+
+        await conn.executemany(
+            f"UPDATE players SET {', '.join(f'{col} = ?' for col in columns)} WHERE user_id = ?",
+            [tuple(values[col] for col in columns) + (user_id,) for user_id, values in updates]
+        )
+        for user_id, values in updates: _stage_cache_write(user_id, values)
+
+async def refresh_power_scores(db: aiosqlite.Connection, user_ids=None):
+    """
+    Menghitung ulang power score pemain tertentu, atau semua pemain jika `user_ids` None
+    (dipanggil saat boot karena data item/title bisa berubah antar deploy).
+    """
+    if user_ids is None:
+        user_ids = [row[0] for row in await fetch_all(db, "SELECT user_id FROM players")]
+    if not user_ids: return
+
+    async def op(conn):
+        await _refresh_power_scores(conn, user_ids)
+
+    await get_writer(db).submit(op)
+
+# --- FUNGSI UTILITIES ---
 
 async def set_equipped_title(db: aiosqlite.Connection, user_id: int, title_id: int):
     await update_player_data(db, user_id, equipped_title_id=title_id)
 
-async def get_player_titles(db: aiosqlite.Connection, user_id: int) -> list[int]:
-    cursor = await db.cursor()
-    await cursor.execute("SELECT title_id FROM player_titles WHERE user_id = ?", (user_id,))
-    rows = await cursor.fetchall()
-    await cursor.close()
-    return [row[0] for row in rows]
+# --- Inventory & Equipment (tabel relasional) ---
+
+async def _add_items(conn: aiosqlite.Connection, user_id: int, counts: dict, kind: str = None):
+    await conn.executemany("""
+        INSERT INTO player_items (user_id, item_id, kind, qty) VALUES (?, ?, ?, ?)
+        ON CONFLICT (user_id, item_id) DO UPDATE SET qty = qty + excluded.qty
+    """, [(user_id, item_id, kind or _item_kind(item_id), qty) for item_id, qty in counts.items() if qty > 0])
+
+async def _remove_item(conn: aiosqlite.Connection, user_id: int, item_id, qty: int = 1) -> bool:
+    """Mengurangi tumpukan item; False jika jumlahnya tidak cukup. Tumpukan kosong dihapus."""
+    async with conn.execute(
+        "UPDATE player_items SET qty = qty - ? WHERE user_id = ? AND item_id = ? AND qty >= ? RETURNING qty",
+        (qty, user_id, item_id, qty)
+    ) as cursor:
+        row = await cursor.fetchone()
+    if row is None: return False
+    if row[0] == 0:
+        await conn.execute("DELETE FROM player_items WHERE user_id = ? AND item_id = ?", (user_id, item_id))
+    return True
+
+async def get_inventory_counts(db: aiosqlite.Connection, user_id: int) -> dict:
+    """Inventory dalam bentuk {item_id: jumlah}, urut sesuai waktu pertama kali didapat."""
+    rows = await fetch_all(db, "SELECT item_id, qty FROM player_items WHERE user_id = ? ORDER BY rowid", (user_id,))
+    return {row[0]: row[1] for row in rows}
 
 async def get_player_inventory(db: aiosqlite.Connection, user_id: int) -> list:
-    player_data = await get_player_data(db, user_id)
-    try: return json.loads(player_data.get('inventory', '[]'))
-    except: return []
+    """Inventory sebagai list ID (duplikat = jumlah tumpukan), format yang dipakai UI lama."""
+    counts = await get_inventory_counts(db, user_id)
+    return [item_id for item_id, qty in counts.items() for _ in range(qty)]
+
+async def count_player_item(db: aiosqlite.Connection, user_id: int, item_id) -> int:
+    rows = await fetch_all(db, "SELECT qty FROM player_items WHERE user_id = ? AND item_id = ?", (user_id, item_id))
+    return rows[0][0] if rows else 0
+
+async def add_player_item(db: aiosqlite.Connection, user_id: int, item_id, qty: int = 1, *, kind: str = None, prisma: int = 0) -> bool:
+    """
+    Menambah item ke inventory. `prisma` negatif = harga beli, dipotong dalam transaksi yang sama;
+    mengembalikan False (tanpa menambah item) jika saldo tidak cukup.
+    """
+    async def op(conn):
+        if prisma and await _apply_deltas(conn, user_id, {"prisma": prisma}) is None: return False
+        await _add_items(conn, user_id, {item_id: qty}, kind)
+        return True
+
+    return await get_writer(db).submit(op)
+
+async def add_player_items(db: aiosqlite.Connection, user_id: int, item_ids: list, *, kind: str = None):
+    """Menambah banyak item sekaligus (list boleh berisi duplikat)."""
+    if not item_ids: return
+    async def op(conn):
+        await _add_items(conn, user_id, Counter(item_ids), kind)
+
+    await get_writer(db).submit(op)
+
+async def remove_player_item(db: aiosqlite.Connection, user_id: int, item_id, qty: int = 1, *, prisma: int = 0) -> bool:
+    """
+    Mengambil item dari inventory. `prisma` positif = hasil jual, dikreditkan hanya jika item benar-benar ada.
+    """
+    async def op(conn):
+        if not await _remove_item(conn, user_id, item_id, qty): return False
+        if prisma: await _apply_deltas(conn, user_id, {"prisma": prisma})
+        return True
+
+    return await get_writer(db).submit(op)
+
+async def clear_player_items(db: aiosqlite.Connection, user_id: int, item_ids, *, credit_prices: dict = None) -> dict:
+    """
+    Menghapus seluruh tumpukan untuk `item_ids`; mengembalikan {item_id: jumlah yang dihapus}.
+    `credit_prices` ({item_id: harga}) mengkreditkan hasil jualnya ke prisma dalam transaksi yang sama.
+    """
+    item_ids = list(item_ids)
+    if not item_ids: return {}
+    async def op(conn):
+        removed = {}
+        # Dipecah per 500 agar tidak melewati batas parameter SQLite
+        for start in range(0, len(item_ids), 500):
+            chunk = item_ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            async with conn.execute(
+                f"DELETE FROM player_items WHERE user_id = ? AND item_id IN ({placeholders}) RETURNING item_id, qty",
+                (user_id, *chunk)
+            ) as cursor:
+                removed.update({row[0]: row[1] for row in await cursor.fetchall()})
+        if credit_prices:
+            earnings = sum(credit_prices.get(item_id, 0) * qty for item_id, qty in removed.items())
+            if earnings: await _apply_deltas(conn, user_id, {"prisma": earnings})
+        return removed
+
+    return await get_writer(db).submit(op)
+
+# --- Kolom JSON (read-modify-write atomik) ---
+
+class _ChangeRejected(Exception):
+    """Dilempar di dalam op agar savepoint-nya dibatalkan (item tidak ada / saldo kurang)."""
+
+async def update_player_json(db: aiosqlite.Connection, user_id: int, column: str, mutate):
+    """
+    Read-modify-write atomik untuk kolom JSON pemain (`farm_data`, `fishing_data`) dalam satu op penulis.
+    `mutate(value)` menerima nilai terkini yang dibaca di koneksi penulis (sudah di-decode), mengubahnya
+    in-place, lalu mengembalikan dict efek pendamping, atau None untuk batal tanpa menulis apa pun:
+        {"deltas": {kolom: delta}, "add_items": {item_id: qty}, "remove_items": {item_id: qty}, "kind": jenis}
+    Item yang diambil harus ada dan delta negatif harus tercukupi; jika tidak, seluruh op dibatalkan.
+    Mengembalikan nilai JSON baru, atau None jika batal/ditolak.
+    """
+    if column not in JSON_COLUMNS: raise ValueError(f"Kolom JSON tidak dikenal: {column!r}")
+
+    async def op(conn):
+        async with conn.execute(f"SELECT {column} FROM players WHERE user_id = ?", (user_id,)) as cursor:
+            row = await cursor.fetchone()
+        if row is None: return None
+        try: value = json.loads(row[0]) if row[0] else JSON_COLUMNS[column]()
+        except (TypeError, ValueError): value = JSON_COLUMNS[column]()
+
+        effects = mutate(value)
+        if effects is None: return None
+        for item_id, qty in (effects.get("remove_items") or {}).items():
+            if not await _remove_item(conn, user_id, item_id, qty): raise _ChangeRejected()
+
+        raw = json.dumps(value)
+        if effects.get("deltas"):
+            if await _apply_deltas(conn, user_id, effects["deltas"], {column: raw}) is None: raise _ChangeRejected()
+        else:
+            await conn.execute(f"UPDATE players SET {column} = ? WHERE user_id = ?", (raw, user_id))
+            _stage_cache_write(user_id, {column: raw})
+        if effects.get("add_items"): await _add_items(conn, user_id, effects["add_items"], effects.get("kind"))
+        return value
+
+    try:
+        return await get_writer(db).submit(op)
+    except _ChangeRejected:
+        return None
+
+def _build_loadout(rows) -> tuple[dict, dict]:
+    """Baris (slot, item_id, upgrade_level, bonus_stats) -> ({slot: item_id}, {slot: {'level', 'bonus_stats'}})."""
+    equipment, upgrades = {}, {}
+    for slot, item_id, level, bonus_stats in rows:
+        if item_id is not None: equipment[slot] = item_id
+        if level or bonus_stats != '{}':
+            upgrades[slot] = {'level': level, 'bonus_stats': json.loads(bonus_stats or '{}')}
+    return equipment, upgrades
+
+async def get_player_loadout(db: aiosqlite.Connection, user_id: int) -> tuple[dict, dict]:
+    """Equipment terpasang dan data tempa dalam satu query: ({slot: item_id}, {slot: {'level', 'bonus_stats'}})."""
+    rows = await fetch_all(db, "SELECT slot, item_id, upgrade_level, bonus_stats FROM player_equipment WHERE user_id = ?", (user_id,))
+    return _build_loadout(rows)
 
 async def get_player_equipment(db: aiosqlite.Connection, user_id: int) -> dict:
-    player_data = await get_player_data(db, user_id)
-    try: return json.loads(player_data.get('equipment', '{}'))
-    except: return {}
+    equipment, _ = await get_player_loadout(db, user_id)
+    return equipment
 
 async def update_player_equipment_and_inventory(db: aiosqlite.Connection, user_id: int, slot: str, new_item_id: int | None):
-    player_data = await get_player_data(db, user_id)
-    inventory = json.loads(player_data.get('inventory', '[]'))
-    equipment = json.loads(player_data.get('equipment', '{}'))
+    """Memasang/melepas item pada slot; item lama kembali ke inventory dalam transaksi yang sama."""
+    async def op(conn):
+        async with conn.execute("SELECT item_id FROM player_equipment WHERE user_id = ? AND slot = ?", (user_id, slot)) as cursor:
+            row = await cursor.fetchone()
+        if row and row[0] is not None:
+            await _add_items(conn, user_id, {row[0]: 1})
+        if new_item_id:
+            await _remove_item(conn, user_id, new_item_id)
+        await conn.execute("""
+            INSERT INTO player_equipment (user_id, slot, item_id) VALUES (?, ?, ?)
+            ON CONFLICT (user_id, slot) DO UPDATE SET item_id = excluded.item_id
+        """, (user_id, slot, new_item_id or None))
+        await _refresh_power_scores(conn, [user_id])
 
-    currently_equipped_id = equipment.get(slot)
-    if currently_equipped_id:
-        inventory.append(int(currently_equipped_id))
+    await get_writer(db).submit(op)
 
-    if new_item_id:
-        if new_item_id in inventory: inventory.remove(new_item_id)
-        equipment[slot] = new_item_id
-    else:
-        if slot in equipment: del equipment[slot]
+def get_player_cache_stats() -> dict:
+    """Counter hit/miss/eviction dari cache data pemain (untuk panel developer)."""
+    return player_cache.stats()
 
-    await update_player_data(db, user_id, inventory=json.dumps(inventory), equipment=json.dumps(equipment))
+def invalidate_player_cache(user_id: int = None):
+    """Wajib dipanggil setelah menulis ke tabel `players` dengan SQL mentah di luar modul ini."""
+    player_cache.invalidate(user_id)
+
+# --- Leaderboard (paging & peringkat di sisi SQL) ---
+
+# Kategori leaderboard -> kolom `players` (whitelist, karena nama kolom masuk ke SQL)
+LEADERBOARD_COLUMNS = {
+    "level": "exp", "subs": "subscribers", "prisma": "prisma", "pvp_wins": "pvp_wins",
+    "titles": "title_count", "power": "power_score"
+}
+
+def _leaderboard_source(category: str) -> str:
+    """Subquery (user_id, value) untuk satu kategori; kolom players di-flatten SQLite sehingga index terpakai."""
+    column = LEADERBOARD_COLUMNS.get(category)
+    if column is None: raise ValueError(f"Kategori leaderboard tidak dikenal: {category!r}")
+    return f"(SELECT user_id, {column} AS value FROM players)"
+
+async def get_leaderboard_page(db: aiosqlite.Connection, category: str, limit: int = 10, offset: int = 0) -> list[tuple]:
+    """Satu halaman leaderboard: [(user_id, value)] terurut menurun, via `ORDER BY ... LIMIT/OFFSET`."""
+    rows = await fetch_all(
+        db, f"SELECT user_id, value FROM {_leaderboard_source(category)} ORDER BY value DESC, user_id LIMIT ? OFFSET ?",
+        (limit, offset)
+    )
+    return [(row[0], row[1]) for row in rows]
+
+async def get_leaderboard_rank(db: aiosqlite.Connection, category: str, user_id: int):
+    """Peringkat pemain di satu kategori: (rank, value), atau None jika tidak ada di leaderboard."""
+    source = _leaderboard_source(category)
+    rows = await fetch_all(db, f"SELECT value FROM {source} WHERE user_id = ?", (user_id,))
+    if not rows: return None
+    value = rows[0][0]
+    rows = await fetch_all(db, f"SELECT COUNT(*) FROM {source} WHERE value > ?", (value,))
+    return rows[0][0] + 1, value
+
+def get_write_version(db: aiosqlite.Connection) -> int:
+    """Jumlah commit penulis sejauh ini; berubah berarti ada data yang mungkin berubah (untuk invalidasi cache)."""
+    writer = _writers.get(db)
+    return writer.commits if writer else 0
+
+# --- Registry Aset (URL CDN Discord) ---
+
+async def get_asset_uploads(db: aiosqlite.Connection) -> dict:
+    """{path: {sha256, url, channel_id, message_id}} semua aset yang sudah di-upload."""
+    rows = await fetch_all(db, "SELECT path, sha256, url, channel_id, message_id FROM asset_uploads")
+    return {row[0]: {"sha256": row[1], "url": row[2], "channel_id": row[3], "message_id": row[4]} for row in rows}
+
+async def save_asset_upload(db: aiosqlite.Connection, path: str, sha256: str, url: str, channel_id: int, message_id: int):
+    await execute_write(db, """
+        INSERT INTO asset_uploads (path, sha256, url, channel_id, message_id) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(path) DO UPDATE SET
+            sha256 = excluded.sha256, url = excluded.url, channel_id = excluded.channel_id,
+            message_id = excluded.message_id, uploaded_at = CURRENT_TIMESTAMP
+    """, (path, sha256, url, channel_id, message_id))
 
-async def get_all_player_data(db):
-    async with db.execute("""
-        SELECT 
-            p.user_id, p.exp, p.subscribers, p.prisma, p.pvp_wins, p.base_hp, p.base_atk, p.base_def, p.base_spd,
-            (SELECT COUNT(pt.title_id) FROM player_titles pt WHERE pt.user_id = p.user_id) as title_count
-        FROM players p
-    """) as cursor:
-        rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
-    
 async def add_artifact_to_player(db: aiosqlite.Connection, user_id: int, artifact_id: int):
-    player_data = await get_player_data(db, user_id)
-    inventory = json.loads(player_data.get('inventory', '[]'))
-    inventory.append(artifact_id)
-    await update_player_data(db, user_id, inventory=json.dumps(inventory))
+    await add_player_item(db, user_id, artifact_id, kind="artifact")
 
 async def get_all_players_in_agency(db, agency_id: str):
-    async with db.cursor() as cursor:
-        await cursor.execute("SELECT user_id, exp FROM players WHERE agency_id = ? ORDER BY exp DESC", (agency_id,))
-        return await cursor.fetchall()
+    return await fetch_all(db, "SELECT user_id, exp FROM players WHERE agency_id = ? ORDER BY exp DESC", (agency_id,))
     
 async def reset_player_progress(db: aiosqlite.Connection, user_id: int):
     """Mereset semua progres pemain ke nilai default (termasuk streak)."""
-    default_fishing = json.dumps({"inventory": ["rod_basic"], "equipped": {"rod": "rod_basic", "charm": None}, "aquarium": []})
+    default_fishing = json.dumps(DEFAULT_FISHING_DATA)
     
-    async with db.cursor() as cursor:
-        await cursor.execute("DELETE FROM player_titles WHERE user_id = ?", (user_id,))
-        await cursor.execute("DELETE FROM player_quests WHERE user_id = ?", (user_id,))
-        await cursor.execute("""
+    async def op(conn):
+        await conn.execute("DELETE FROM player_titles WHERE user_id = ?", (user_id,))
+        await conn.execute("DELETE FROM player_quests WHERE user_id = ?", (user_id,))
+        await conn.execute("DELETE FROM player_items WHERE user_id = ?", (user_id,))
+        await conn.execute("DELETE FROM player_equipment WHERE user_id = ?", (user_id,))
+        await conn.execute("""
             UPDATE players 
             SET
                 exp = 0, subscribers = 0, prisma = 0, equipped_title_id = NULL,
@@ -255,50 +1300,236 @@ async def reset_player_progress(db: aiosqlite.Connection, user_id: int):
                 level = 1, base_hp = 100, base_atk = 10, base_def = 5, base_spd = 10,
                 title_pity = 0, artifact_pity = 0, 
                 agency_id = NULL, pvp_wins = 0, agency_leave_timestamp = 0,
-                daily_streak = 0, last_daily_claim = 0
+                daily_streak = 0, last_daily_claim = 0,
+                title_count = 0, title_mask = 0
             WHERE user_id = ?
         """, (default_fishing, user_id,))
-    await db.commit()
+        await _refresh_power_scores(conn, [user_id])
+        _stage_cache_write(user_id)
+
+    await get_writer(db).submit(op)
     print(f"Player progress for user_id {user_id} has been fully reset.")
 
 async def get_player_upgrades(db: aiosqlite.Connection, user_id: int) -> dict:
-    player_data = await get_player_data(db, user_id)
-    try: return json.loads(player_data.get('equipment_upgrades', '{}'))
-    except: return {}
+    _, upgrades = await get_player_loadout(db, user_id)
+    return upgrades
 
 async def update_player_upgrades(db: aiosqlite.Connection, user_id: int, slot: str, level: int, bonus_stats: dict = None):
-    upgrades = await get_player_upgrades(db, user_id)
-    if slot not in upgrades: upgrades[slot] = {}
-    upgrades[slot]['level'] = level
-    if bonus_stats is not None: upgrades[slot]['bonus_stats'] = bonus_stats
-    await update_player_data(db, user_id, equipment_upgrades=json.dumps(upgrades))
+    async def op(conn):
+        if bonus_stats is None:
+            await conn.execute("""
+                INSERT INTO player_equipment (user_id, slot, upgrade_level) VALUES (?, ?, ?)
+                ON CONFLICT (user_id, slot) DO UPDATE SET upgrade_level = excluded.upgrade_level
+            """, (user_id, slot, level))
+        else:
+            await conn.execute("""
+                INSERT INTO player_equipment (user_id, slot, upgrade_level, bonus_stats) VALUES (?, ?, ?, ?)
+                ON CONFLICT (user_id, slot) DO UPDATE SET upgrade_level = excluded.upgrade_level, bonus_stats = excluded.bonus_stats
+            """, (user_id, slot, level, json.dumps(bonus_stats)))
+        await _refresh_power_scores(conn, [user_id])
+
+    await get_writer(db).submit(op)
 
     
 # --- Tambahan untuk Transaksi Title ---
 
+# Title dengan ID 0..62 disimpan juga sebagai bit di `players.title_mask` (INTEGER 64-bit bertanda);
+# `player_titles` tetap sumber kebenaran untuk urutan dan ID di luar rentang itu.
+TITLE_MASK_BITS = 63
+
+def _title_bit(title_id: int) -> int:
+    return 1 << title_id if 0 <= title_id < TITLE_MASK_BITS else 0
+
 async def get_player_titles(db, user_id: int) -> list:
     """Mengambil list ID title yang dimiliki player."""
-    async with db.execute("SELECT title_id FROM player_titles WHERE user_id = ?", (user_id,)) as cursor:
-        rows = await cursor.fetchall()
-        return [row[0] for row in rows]
+    rows = await fetch_all(db, "SELECT title_id FROM player_titles WHERE user_id = ?", (user_id,))
+    return [row[0] for row in rows]
+
+async def get_owned_title_ids(db, user_id: int) -> set:
+    """
+    Set ID title milik player dari bitmask (dari cache, tanpa query jika pemain ter-cache).
+    Hanya jatuh ke tabel `player_titles` jika player punya title di luar rentang bitmask.
+    """
+    fields = await get_player_fields(db, user_id, 'title_mask', 'title_count')
+    if not fields: return set()
+    mask = fields['title_mask'] or 0
+    owned = {bit for bit in range(TITLE_MASK_BITS) if mask >> bit & 1}
+    if len(owned) < (fields['title_count'] or 0):
+        owned.update(await get_player_titles(db, user_id))
+    return owned
+
+async def _adjust_title_columns(conn: aiosqlite.Connection, user_id: int, title_id: int, added: bool):
+    bit = _title_bit(title_id)
+    if added:
+        query = "UPDATE players SET title_count = title_count + 1, title_mask = title_mask | ? WHERE user_id = ? RETURNING title_count, title_mask"
+    else:
+        query = "UPDATE players SET title_count = MAX(title_count - 1, 0), title_mask = title_mask & ~? WHERE user_id = ? RETURNING title_count, title_mask"
+    async with conn.execute(query, (bit, user_id)) as cursor:
+        row = await cursor.fetchone()
+    if row: _stage_cache_write(user_id, {"title_count": row[0], "title_mask": row[1]})
 
 async def add_title_to_player(db, user_id: int, title_id: int):
     """Memberikan title ke player."""
+    async def op(conn):
+        cursor = await conn.execute("INSERT OR IGNORE INTO player_titles (user_id, title_id) VALUES (?, ?)", (user_id, title_id))
+        if cursor.rowcount: await _adjust_title_columns(conn, user_id, title_id, added=True)
+
     try:
-        await db.execute("INSERT OR IGNORE INTO player_titles (user_id, title_id) VALUES (?, ?)", (user_id, title_id))
-        await db.commit()
+        await get_writer(db).submit(op)
     except Exception as e:
         print(f"Error adding title: {e}")
 
 async def remove_player_title(db, user_id: int, title_id: int):
     """Menghapus title dari player (saat dijual/diberikan)."""
+    async def op(conn):
+        cursor = await conn.execute("DELETE FROM player_titles WHERE user_id = ? AND title_id = ?", (user_id, title_id))
+        if cursor.rowcount: await _adjust_title_columns(conn, user_id, title_id, added=False)
+
     try:
-        await db.execute("DELETE FROM player_titles WHERE user_id = ? AND title_id = ?", (user_id, title_id))
-        await db.commit()
+        await get_writer(db).submit(op)
     except Exception as e:
         print(f"Error removing title: {e}")
 
 async def has_title(db, user_id: int, title_id: int) -> bool:
     """Cek apakah player sudah punya title ini (untuk mencegah duplikat)."""
-    async with db.execute("SELECT 1 FROM player_titles WHERE user_id = ? AND title_id = ?", (user_id, title_id)) as cursor:
-        return await cursor.fetchone() is not None
\ No newline at end of file
+    if bit := _title_bit(title_id):
+        fields = await get_player_fields(db, user_id, 'title_mask')
+        return bool(fields and (fields['title_mask'] or 0) & bit)
+    rows = await fetch_all(db, "SELECT 1 FROM player_titles WHERE user_id = ? AND title_id = ?", (user_id, title_id))
+    return bool(rows)
+
+# =========================================================================
+# BACKUP ONLINE (SQLITE BACKUP API)
+# =========================================================================
+
+BACKUP_PREFIX = "mahadven-"
+BACKUP_TIME_FORMAT = "%Y%m%d-%H%M%S"
+
+async def get_database_path(db: aiosqlite.Connection) -> str:
+    async with db.execute("SELECT file FROM pragma_database_list WHERE name = 'main'") as cursor:
+        return (await cursor.fetchone())[0]
+
+def _file_checksum(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''): digest.update(chunk)
+    return digest.hexdigest()
+
+def _copy_database(source_path: str, dest_path: str, pages: int, sleep: float):
+    """
+    Salinan konsisten via backup API, dijalankan di thread terpisah.
+    Sumber menahan satu transaksi baca selama proses sehingga snapshot-nya tetap
+    (mode WAL: penulis tetap jalan, backup tidak perlu mengulang dari awal).
+    """
+    source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True, isolation_level=None)
+    dest = sqlite3.connect(dest_path)
+    try:
+        source.execute("BEGIN")
+        source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        source.backup(dest, pages=pages, sleep=sleep)
+        source.execute("COMMIT")
+        # Snapshot berdiri sendiri dalam satu file, tanpa -wal
+        dest.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        dest.close()
+        source.close()
+
+def _write_checksum(path: str) -> str:
+    checksum = _file_checksum(path)
+    with open(f"{path}.sha256", 'w', encoding='utf-8') as f:
+        f.write(f"{checksum}  {os.path.basename(path)}\n")
+    return checksum
+
+async def create_backup(db: aiosqlite.Connection, backup_dir: str = BACKUP_DIR, *, label: str = None) -> dict:
+    """
+    Membuat snapshot bertanda waktu di `backup_dir` beserta file checksum `.sha256`.
+    Penyalinan berjalan per `BACKUP_PAGES_PER_STEP` halaman di thread terpisah; event loop tidak tertahan.
+    """
+    source_path = await get_database_path(db)
+    os.makedirs(backup_dir, exist_ok=True)
+    stamp = datetime.datetime.now().strftime(BACKUP_TIME_FORMAT)
+    name = f"{BACKUP_PREFIX}{stamp}{'-' + label if label else ''}.db"
+    dest_path = os.path.join(backup_dir, name)
+    tmp_path = f"{dest_path}.tmp"
+
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(_copy_database, source_path, tmp_path, BACKUP_PAGES_PER_STEP, BACKUP_STEP_SLEEP)
+        os.replace(tmp_path, dest_path)
+    finally:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+    checksum = await asyncio.to_thread(_write_checksum, dest_path)
+
+    return {
+        "name": name, "path": dest_path, "checksum": checksum,
+        "size": os.path.getsize(dest_path), "seconds": time.perf_counter() - started
+    }
+
+def list_backups(backup_dir: str = BACKUP_DIR) -> list[str]:
+    """Snapshot buatan `create_backup` (terbaru di depan). Salinan manual lain tidak ikut."""
+    if not os.path.isdir(backup_dir): return []
+    names = [n for n in os.listdir(backup_dir) if n.startswith(BACKUP_PREFIX) and n.endswith(".db")]
+    return sorted(names, reverse=True)
+
+def _is_automatic_backup(name: str) -> bool:
+    try: datetime.datetime.strptime(name[len(BACKUP_PREFIX):-len(".db")], BACKUP_TIME_FORMAT)
+    except ValueError: return False
+    return True
+
+def prune_backups(backup_dir: str = BACKUP_DIR, keep: int = BACKUP_RETENTION) -> list[str]:
+    """Menghapus snapshot otomatis terlama di luar `keep` terbaru; snapshot berlabel tidak dihapus."""
+    automatic = [n for n in list_backups(backup_dir) if _is_automatic_backup(n)]
+    removed = automatic[keep:]
+    for name in removed:
+        for path in (os.path.join(backup_dir, name), os.path.join(backup_dir, f"{name}.sha256")):
+            if os.path.exists(path): os.remove(path)
+    return removed
+
+def verify_backup(path: str) -> bool:
+    """Mencocokkan snapshot dengan file `.sha256`-nya."""
+    checksum_path = f"{path}.sha256"
+    if not os.path.exists(path) or not os.path.exists(checksum_path): return False
+    with open(checksum_path, 'r', encoding='utf-8') as f:
+        expected = f.read().split()[0]
+    return _file_checksum(path) == expected
+
+async def restore_backup(db: aiosqlite.Connection, backup_path: str, *, reader_pool_size: int = READER_POOL_SIZE) -> aiosqlite.Connection:
+    """
+    Mengembalikan database dari snapshot yang checksum-nya valid.
+    Snapshot `pre-restore` dibuat lebih dulu; koneksi lama ditutup dan koneksi baru dikembalikan.
+    """
+    if not await asyncio.to_thread(verify_backup, backup_path):
+        raise ValueError(f"Checksum snapshot tidak cocok atau file .sha256 hilang: {backup_path}")
+
+    db_path = await get_database_path(db)
+    await create_backup(db, os.path.dirname(backup_path) or BACKUP_DIR, label="pre-restore")
+
+    # Salin ke samping file aktif dulu; database lama tetap utuh jika langkah ini gagal
+    staged_path = f"{db_path}.restore"
+    await asyncio.to_thread(_copy_database, backup_path, staged_path, -1, 0)
+
+    await close_database(db)
+    # WAL/SHM sisa milik database lama tidak boleh diterapkan ke file hasil restore
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(db_path + suffix): os.remove(db_path + suffix)
+    os.replace(staged_path, db_path)
+
+    return await initialize_database(db_path, reader_pool_size)
+
+# Tabel data pemain yang dihapus saat format (registry aset dipertahankan)
+FORMAT_TABLES = ("players", "player_titles", "player_quests", "player_items", "player_equipment", "schema_version")
+
+async def format_database(db: aiosqlite.Connection, *, reader_pool_size: int = READER_POOL_SIZE) -> aiosqlite.Connection:
+    """
+    Menghapus seluruh data pemain lalu membuat ulang skemanya.
+    Koneksi lama ditutup lebih dulu (antrian tulisnya dikosongkan) agar tidak ada tulisan
+    tertunda yang mengisi ulang database yang baru diformat; koneksi baru dikembalikan.
+    """
+    db_path = await get_database_path(db)
+    await close_database(db)
+
+    async with aiosqlite.connect(db_path) as conn:
+        for table in FORMAT_TABLES: await conn.execute(f"DROP TABLE IF EXISTS {table}")
+        await conn.commit()
+
+    return await initialize_database(db_path, reader_pool_size)
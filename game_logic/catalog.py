@@ -0,0 +1,262 @@
+import copy
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from types import MappingProxyType
+
+# ===================================================================================
+# KATALOG DATA GAME (IMMUTABLE, TER-INDEX)
+# ===================================================================================
+
+DATA_DIR = "./data"
+
+# Nama tabel -> (file JSON, nilai default jika file tidak ada/rusak)
+CATALOG_FILES = {
+    "titles": ("titles.json", []),
+    "monsters": ("monsters.json", []),
+    "monster_titles": ("monsters_titles.json", []),
+    "items": ("items.json", []),
+    "artifacts": ("artifacts.json", []),
+    "agencies": ("agencies.json", []),
+    "quests": ("quests.json", {"daily": [], "weekly": []}),
+    "fishes": ("fishes.json", []),
+    "fishing_items": ("fishing_items.json", []),
+    "plants": ("plants.json", []),
+    "stream_data": ("stream_data.json", {"stream_titles": {}, "stream_events": [], "chat_data": {}}),
+}
+
+# Item yang dijual di toko (ShopCog): equipment dengan harga
+SHOP_ITEM_TYPES = {"helm", "armor", "pants", "shoes"}
+
+_MISSING = object()
+
+class RecordLayout:
+    """Urutan key yang dipakai bersama semua record dalam satu tabel."""
+    __slots__ = ("keys", "index")
+
+    def __init__(self, keys):
+        self.keys = tuple(keys)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+
+class CatalogRecord(Mapping):
+    """
+    Satu baris data game: read-only, kompatibel dengan pembacaan dict (`[]`, `.get`, `in`, `.items()`).
+    Nilainya disimpan dalam tuple dengan layout key bersama per tabel.
+    """
+    __slots__ = ("_layout", "_values")
+
+    def __init__(self, layout: RecordLayout, values: tuple):
+        self._layout = layout
+        self._values = values
+
+    @classmethod
+    def from_dict(cls, layout: RecordLayout, data: dict) -> "CatalogRecord":
+        return cls(layout, tuple(data.get(key, _MISSING) for key in layout.keys))
+
+    def __getitem__(self, key):
+        value = self._values[self._layout.index[key]]
+        if value is _MISSING: raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        return (key for key, value in zip(self._layout.keys, self._values) if value is not _MISSING)
+
+    def __len__(self):
+        return sum(1 for value in self._values if value is not _MISSING)
+
+    def __repr__(self):
+        return f"CatalogRecord({dict(self)!r})"
+
+    def copy(self) -> dict:
+        """Salinan dict biasa yang boleh diubah."""
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+def _build_records(rows: list, defaults: dict = None) -> tuple:
+    defaults = defaults or {}
+    keys = list(defaults)
+    for row in rows:
+        for key in row:
+            if key not in keys: keys.append(key)
+    layout = RecordLayout(keys)
+    return tuple(CatalogRecord.from_dict(layout, {**defaults, **row}) for row in rows)
+
+def _group_by(records, key: str) -> Mapping:
+    groups = {}
+    for record in records: groups.setdefault(record.get(key), []).append(record)
+    return MappingProxyType({value: tuple(group) for value, group in groups.items()})
+
+class CatalogFile:
+    """Jejak satu file sumber katalog: stat terakhir (mtime, ukuran), hash isi, dan data hasil parse."""
+    __slots__ = ("mtime_ns", "size", "digest", "data")
+
+    def __init__(self, mtime_ns: int, size: int, digest: str, data):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.data = data
+
+def scan_catalog_sources(data_dir: str = DATA_DIR, previous: dict = None) -> tuple[dict, set, dict]:
+    """
+    Membaca file JSON katalog secara inkremental: (files {tabel: CatalogFile}, tabel yang berubah, error {file: pesan}).
+    File dengan mtime & ukuran sama dipakai ulang tanpa dibaca; jika stat berubah, isinya di-hash
+    dan hanya di-parse ulang kalau hash-nya berbeda. File yang gagal dibaca tetap memakai data lama (atau default).
+    """
+    previous = previous or {}
+    files, changed, errors = {}, set(), {}
+    for table, (filename, default) in CATALOG_FILES.items():
+        prev = previous.get(table)
+        try:
+            with open(os.path.join(data_dir, filename), 'rb') as f:
+                stat = os.fstat(f.fileno())
+                if prev and (prev.mtime_ns, prev.size) == (stat.st_mtime_ns, stat.st_size):
+                    files[table] = prev; continue
+                raw = f.read()
+            digest = hashlib.sha1(raw).hexdigest()
+            if prev and prev.digest == digest:
+                files[table] = CatalogFile(stat.st_mtime_ns, stat.st_size, digest, prev.data); continue
+            files[table] = CatalogFile(stat.st_mtime_ns, stat.st_size, digest, json.loads(raw))
+        except (OSError, ValueError) as e:
+            errors[filename] = str(e)
+            if prev:
+                files[table] = prev; continue
+            files[table] = CatalogFile(0, 0, None, copy.deepcopy(default))
+        changed.add(table)
+    return files, changed, errors
+
+def load_catalog_sources(data_dir: str = DATA_DIR) -> dict:
+    """Membaca semua file JSON katalog: {tabel: data mentah}."""
+    files, _, errors = scan_catalog_sources(data_dir)
+    for filename, error in errors.items(): print(f"Gagal memuat {filename}: {error}")
+    return {table: catalog_file.data for table, catalog_file in files.items()}
+
+class CatalogTable:
+    """Record satu tabel beserta index-nya (by id/rarity/type); dipakai ulang antar versi jika file tidak berubah."""
+    __slots__ = ("records", "by_id", "by_rarity", "by_type")
+
+    def __init__(self, records: tuple):
+        self.records = records
+        self.by_id = MappingProxyType({r['id']: r for r in records if 'id' in r})
+        self.by_rarity = _group_by(records, 'rarity')
+        self.by_type = _group_by(records, 'type')
+
+class GameCatalog:
+    """
+    Seluruh data game dalam satu objek immutable yang dibangun sekali dan dipakai bersama semua cog.
+    Lookup berbasis dict (by id/rarity/type); turunan seperti pool rarity dan daftar toko dihitung di sini.
+    Jika `base` diberikan, tabel di luar `changed` diambil dari katalog lama tanpa di-index ulang.
+    """
+    __slots__ = ("version", "_tables", "item_index", "quests", "shop_items", "stream_data")
+
+    def __init__(self, sources: dict, version: int = 1, base: "GameCatalog" = None, changed=None):
+        self.version = version
+        rebuilt = set(CATALOG_FILES) if base is None or changed is None else set(changed)
+        tables = {}
+        for table in CATALOG_FILES:
+            if table in ("quests", "stream_data"): continue
+            if table not in rebuilt:
+                tables[table] = base._tables[table]; continue
+            rows = sources.get(table) or []
+            # Artefak yang tidak punya tipe dianggap 'artifact' (dipakai inventory & transaksi)
+            tables[table] = CatalogTable(_build_records(rows, {"type": "artifact"} if table == "artifacts" else None))
+
+        if "quests" in rebuilt:
+            quests = sources.get("quests") or {}
+            self.quests = MappingProxyType({period: _build_records(q_list) for period, q_list in quests.items()})
+            tables["quests"] = CatalogTable(tuple(q for q_list in self.quests.values() for q in q_list))
+        else:
+            self.quests, tables["quests"] = base.quests, base._tables["quests"]
+
+        if "stream_data" in rebuilt:
+            self.stream_data = MappingProxyType(dict(sources.get("stream_data") or CATALOG_FILES["stream_data"][1]))
+        else:
+            self.stream_data = base.stream_data
+        self._tables = MappingProxyType(tables)
+
+        # Item & artefak berbagi ruang ID (equipment, inventory, transaksi)
+        if rebuilt & {"items", "artifacts"}:
+            self.item_index = MappingProxyType({**tables["items"].by_id, **tables["artifacts"].by_id})
+        else:
+            self.item_index = base.item_index
+        if "items" in rebuilt:
+            self.shop_items = tuple(sorted(
+                (i for i in tables["items"].records if i.get('price', 0) > 0 and (i.get('type') or '').lower() in SHOP_ITEM_TYPES),
+                key=lambda i: (i.get('type').lower(), i['price'])
+            ))
+        else:
+            self.shop_items = base.shop_items
+
+    @classmethod
+    def load(cls, data_dir: str = DATA_DIR, version: int = 1) -> "GameCatalog":
+        return cls(load_catalog_sources(data_dir), version)
+
+    # --- Akses Tabel & Index ---
+    def all(self, table: str) -> tuple:
+        return self._tables[table].records
+
+    def index(self, table: str) -> Mapping:
+        """{id: record} satu tabel."""
+        return self._tables[table].by_id
+
+    def get(self, table: str, record_id):
+        if record_id is None: return None
+        return self._tables[table].by_id.get(record_id)
+
+    def rarity_pools(self, table: str) -> Mapping:
+        """{rarity: (record, ...)} satu tabel (mis. pool gacha)."""
+        return self._tables[table].by_rarity
+
+    def by_rarity(self, table: str, rarity: str) -> tuple:
+        return self._tables[table].by_rarity.get(rarity, ())
+
+    def by_type(self, table: str, record_type: str) -> tuple:
+        return self._tables[table].by_type.get(record_type, ())
+
+    # --- Shortcut Lookup ---
+    def item(self, item_id):
+        if item_id is None: return None
+        return self.item_index.get(item_id)
+
+    def title(self, title_id):
+        return self.get("titles", title_id)
+
+    def monster_title(self, title_id):
+        return self.get("monster_titles", title_id)
+
+    def agency(self, agency_id):
+        return self.get("agencies", agency_id)
+
+    def fish(self, fish_id):
+        return self.get("fishes", fish_id)
+
+    def fishing_item(self, item_id):
+        return self.get("fishing_items", item_id)
+
+    def plant(self, plant_id):
+        return self.get("plants", plant_id)
+
+    def quest(self, quest_id):
+        return self.get("quests", quest_id)
+
+class CatalogLoader:
+    """
+    Pemuat katalog inkremental milik bot. Menyimpan jejak file sumber sehingga reload
+    hanya mem-parse & meng-index ulang file yang berubah, lalu membangun katalog versi baru.
+    """
+    def __init__(self, data_dir: str = DATA_DIR):
+        self.data_dir = data_dir
+        self.files: dict[str, CatalogFile] = {}
+        self.catalog = GameCatalog({}, version=0)
+        self.errors: dict[str, str] = {}
+
+    def reload(self) -> tuple[GameCatalog, frozenset]:
+        """(katalog terbaru, tabel yang berubah). Katalog lama dikembalikan apa adanya jika tidak ada perubahan."""
+        files, changed, self.errors = scan_catalog_sources(self.data_dir, self.files)
+        self.files = files
+        if changed:
+            sources = {table: files[table].data for table in changed}
+            self.catalog = GameCatalog(sources, self.catalog.version + 1, base=self.catalog, changed=changed)
+        return self.catalog, frozenset(changed)
@@ -0,0 +1,484 @@
+# game_logic/combat_engine.py
+
+import random
+from collections import Counter, defaultdict
+
+from . import skills as skill_handler
+from .combat_records import Effect, Participant, StatBlock
+from .status_effects import StatusEffects
+
+# ===================================================================================
+# MESIN PERTARUNGAN HEADLESS (TANPA DISCORD / DATABASE)
+# ===================================================================================
+
+# Batas putaran untuk pertarungan otomatis penuh (simulasi / instant-resolve)
+MAX_ROUNDS = 100
+
+# --- Snapshot Partisipan ---
+
+def _stat_key(stat: str) -> str:
+    return 'crit_damage' if stat == 'crit_dmg' else stat
+
+def player_base_stats(player_data: dict) -> dict:
+    """Base stat pemain dari data DB, termasuk bonus/penalti agensi khusus pertarungan."""
+    base_stats = {
+        'hp': player_data.get('base_hp', 100), 'atk': player_data.get('base_atk', 10),
+        'def': player_data.get('base_def', 5), 'spd': player_data.get('base_spd', 10),
+        'crit_rate': 0.05, 'crit_damage': 1.5
+    }
+    agency_id = player_data.get('agency_id')
+    if agency_id == "mahavirtual": base_stats['atk'] += 5
+    elif agency_id == "prism_project": base_stats['def'] += 4
+    elif agency_id == "meisoncafe":
+        base_stats['hp'] += 20; base_stats['atk'] += 2
+        base_stats['def'] += 2; base_stats['spd'] += 1
+    elif agency_id == "ateliernova":
+        base_stats['spd'] += 3; base_stats['hp'] = int(base_stats['hp'] * 0.9)
+    elif agency_id == "react_entertainment":
+        base_stats['def'] = int(base_stats['def'] * 0.85)
+    return base_stats
+
+def monster_base_stats(monster: dict) -> dict:
+    return {
+        'hp': monster.get('hp', 100), 'atk': monster.get('atk', 10),
+        'def': monster.get('def', 5), 'spd': monster.get('spd', 10),
+        'crit_rate': monster.get('crit_rate', 0.05), 'crit_damage': monster.get('crit_damage', 1.5)
+    }
+
+def apply_title_boost(stats: dict, title_data: dict):
+    for k, v in title_data.get('stat_boost', {}).items():
+        key = _stat_key(k)
+        if key in stats: stats[key] += v
+
+def apply_equipment(stats: dict, equipment: dict, upgrades: dict, get_item):
+    """Menambahkan stat equipment (dengan scaling level upgrade) dan sub-stat upgrade ke `stats`."""
+    for slot, item_id in equipment.items():
+        if not (item_id and (item := get_item(item_id))): continue
+        slot_upgrade = upgrades.get(slot, {})
+        level = slot_upgrade.get('level', 0)
+
+        # Stat utama item (scaling sama dengan ProfileCog & UpgradeCog)
+        for k, v in item.get('stat_boost', {}).items():
+            key = _stat_key(k)
+            final_val = v
+            if v > 0:
+                if key in ['crit_rate', 'crit_damage']:
+                    # 5% per level untuk Crit
+                    final_val = v * (1 + (level * 0.05))
+                else:
+                    # 10% per level untuk Stat Biasa
+                    final_val = int(v * (1 + (level * 0.10)))
+            elif v < 0 and key not in ['crit_rate', 'crit_damage']:
+                # Stat minus membaik tiap 3 level
+                final_val = min(0, v + level // 3)
+            if key in stats: stats[key] += final_val
+
+        # Sub-stat (bonus stats)
+        for k, v in slot_upgrade.get('bonus_stats', {}).items():
+            if k in stats: stats[k] += v
+
+def new_participant(identity: dict, stats: dict, title_data: dict) -> Participant:
+    """Snapshot partisipan siap tarung dari identitas (id, name, is_player, ...) dan total stat."""
+    skills = title_data.get('skills', [])
+    stats = StatBlock(stats)
+    return skill_handler.index_passives(Participant(
+        identity,
+        stats=stats,                    # Stat dinamis (bisa di-buff/debuff)
+        base_stats=stats.copy(),        # Stat awal battle (acuan buff/debuff)
+        hp=stats.hp,
+        max_hp=stats.hp,
+        skills=skills,
+        raw_title_data=title_data,
+        status_effects=StatusEffects(),
+        skill_cooldowns={s['name']: 0 for s in skills if s.get('type') == 'active'}
+    ))
+
+def fresh_participant(snapshot: Participant) -> Participant:
+    """Salinan snapshot dengan state battle baru; untuk menjalankan banyak pertarungan dari satu snapshot."""
+    participant = snapshot.copy()
+    participant.stats = snapshot.base_stats.copy()
+    participant.base_stats = snapshot.base_stats.copy()
+    participant.hp = snapshot.max_hp
+    participant.status_effects = StatusEffects()
+    participant.skill_cooldowns = dict.fromkeys(snapshot.skill_cooldowns, 0)
+    participant.pop('passive_flags', None)
+    return participant
+
+def as_participant(participant) -> Participant:
+    """
+    Menormalkan snapshot lama (dict biasa, mis. dari turnamen) menjadi Participant
+    beserta StatBlock, StatusEffects berisi Effect, dan index pasif.
+    """
+    if not isinstance(participant, Participant): participant = Participant(participant)
+    for field in ("id", "avatar_url", "is_player", "agency_id"): participant.setdefault(field, None)
+    if not isinstance(participant.stats, StatBlock): participant.stats = StatBlock(participant.stats)
+    if not isinstance(participant.base_stats, StatBlock): participant.base_stats = StatBlock(participant.base_stats)
+    effects = participant.get('status_effects', ())
+    if not isinstance(effects, StatusEffects) or not all(isinstance(e, Effect) for e in effects):
+        participant.status_effects = StatusEffects(e if isinstance(e, Effect) else Effect(e) for e in effects)
+    if 'passive_hooks' not in participant: skill_handler.index_passives(participant)
+    return participant
+
+def build_player_participant(player_id, name: str, player_data: dict, title_data: dict, equipment: dict, upgrades: dict, get_item, avatar_url: str = None) -> dict:
+    stats = player_base_stats(player_data)
+    apply_title_boost(stats, title_data)
+    apply_equipment(stats, equipment, upgrades, get_item)
+    identity = {"id": player_id, "name": name, "avatar_url": avatar_url, "is_player": True, "agency_id": player_data.get('agency_id')}
+    return new_participant(identity, stats, title_data)
+
+def build_monster_participant(monster: dict, title_data: dict, avatar_url: str = None) -> dict:
+    stats = monster_base_stats(monster)
+    apply_title_boost(stats, title_data)
+    identity = {
+        "id": None, "name": monster.get('name', 'Monster'), "avatar_url": avatar_url,
+        "is_player": False, "agency_id": None,
+        "rewards": {"exp": monster.get('exp_reward', 0), "prisma": monster.get('money_reward', 0)}
+    }
+    return new_participant(identity, stats, title_data)
+
+# --- Policy Aksi ---
+
+def ai_policy(engine: "CombatEngine", participant: dict) -> tuple[str, dict]:
+    """Policy bawaan AI: 70% memakai skill aktif yang siap (jika tidak dibungkam), selain itu menyerang."""
+    is_silenced = participant.status_effects.has_type('silence')
+    usable_skills = [s['name'] for s in participant.skills if s.get('type') == 'active' and participant.skill_cooldowns.get(s['name'], 0) == 0]
+    if usable_skills and not is_silenced and random.random() < 0.7:
+        return 'skill', {'skill_name': random.choice(usable_skills)}
+    return 'attack', {}
+
+# --- Hasil ---
+
+class CombatResult:
+    """
+    Hasil akhir pertarungan. `winner`/`loser` None jika seri; `damage` = {'p1': x, 'p2': y} damage ke HP lawan;
+    `events` = {user_id: Counter(event)} untuk misi.
+    """
+    __slots__ = ("winner", "loser", "reason", "rounds", "damage", "events")
+
+    def __init__(self, winner: dict | None, loser: dict | None, reason: str, rounds: int, damage: dict, events: dict):
+        self.winner = winner
+        self.loser = loser
+        self.reason = reason
+        self.rounds = rounds
+        self.damage = damage
+        self.events = events
+
+    @property
+    def is_draw(self) -> bool:
+        return self.winner is None
+
+    def __repr__(self):
+        winner = self.winner.name if self.winner else None
+        return f"CombatResult(winner={winner!r}, reason={self.reason!r}, rounds={self.rounds})"
+
+# ===================================================================================
+# ENGINE
+# ===================================================================================
+
+class CombatEngine:
+    """
+    Alur pertarungan lengkap (efek awal giliran, aksi, pasif, revive) atas dua snapshot partisipan.
+    Tidak bergantung pada Discord maupun database; adapter (CombatSession) meng-override `on_fight_end`.
+    `on_event(user_id, event_type, amount)` menerima event misi (LAND_CRIT, USE_SKILL) saat terjadi.
+    """
+    def __init__(self, p1: dict, p2: dict, *, is_pve: bool = False, on_event=None):
+        self.p1 = p1
+        self.p2 = p2
+        self.is_pve = is_pve
+        self.on_event = on_event
+        self.round_count = 1
+        self.has_moved_in_round = set()
+        self.log = []
+        self.game_over = False
+        self.result: CombatResult | None = None
+        self.events = defaultdict(Counter)
+        self.damage_dealt = {'p1': 0, 'p2': 0}
+        self.current_turn_participant = None
+        self.turn_order = []
+
+    # --- Setup ---
+    async def start(self):
+        """Pasif awal, penentuan giliran pertama berdasarkan SPD, lalu pasif pasca cek kecepatan."""
+        self.p1, self.p2 = as_participant(self.p1), as_participant(self.p2)
+        await self._apply_initial_passives()
+        self.log.append(f"⚔️ {self.p1.name} vs {self.p2.name}!")
+
+        if self.p1.stats.spd >= self.p2.stats.spd:
+            self.turn_order = [self.p1, self.p2]
+        else:
+            self.turn_order = [self.p2, self.p1]
+        self.current_turn_participant = self.turn_order[0]
+
+        self.log.append(f"💨 {self.current_turn_participant.name} lebih cepat dan mendapat giliran pertama!")
+        self.log.append(f"--- Putaran #{self.round_count} ---")
+
+        await self._apply_post_speed_check_passives()
+
+    async def _apply_initial_passives(self):
+        """Menerapkan semua pasif yang aktif di awal pertarungan."""
+        for p in [self.p1, self.p2]:
+            opponent = self.get_opponent(p)
+            for skill in p.skills:
+                if skill.get('type') != 'passive': continue
+                passive_func = skill_handler.passive_implementations.get(skill['name'])
+                if not passive_func: continue
+
+                if skill['name'] in ["Ancestors Sight"]:
+                    passive_func(self, p, opponent)
+                elif skill['name'] in ["Haunting Presence", "Firewall Protocol"]:
+                    await passive_func(self, p)
+
+    async def _apply_post_speed_check_passives(self):
+        """Menerapkan pasif yang bergantung pada siapa yang lebih cepat."""
+        if skill_handler._has_passive(self.p1, "Master Tactician") and self.p1.stats.spd > self.p2.stats.spd:
+            await skill_handler.passive_implementations['Master Tactician'](self, self.p1, self.p2)
+        elif skill_handler._has_passive(self.p2, "Master Tactician") and self.p2.stats.spd > self.p1.stats.spd:
+            await skill_handler.passive_implementations['Master Tactician'](self, self.p2, self.p1)
+
+    # --- Helper ---
+    def get_opponent(self, participant: dict) -> dict:
+        if participant is self.p1: return self.p2
+        if participant is self.p2: return self.p1
+        return self.p2 if participant.id == self.p1.id else self.p1
+
+    def get_skill_cooldown(self, participant: dict, skill_name: str) -> int:
+        for skill_data in participant.skills:
+            if skill_data.get('name') == skill_name:
+                return skill_data.get('cooldown', 3)
+        return 0
+
+    def record_damage(self, attacker: dict, amount: int):
+        """Mencatat damage yang benar-benar mengurangi HP lawan (statistik hasil/simulasi)."""
+        if amount > 0: self.damage_dealt['p1' if attacker is self.p1 else 'p2'] += amount
+
+    def record_event(self, participant: dict, event_type: str, amount: int = 1):
+        """Mencatat event misi milik pemain (monster diabaikan)."""
+        if not participant.is_player or participant.id is None: return
+        self.events[participant.id][event_type] += amount
+        if self.on_event: self.on_event(participant.id, event_type, amount)
+
+    # --- Giliran ---
+    async def begin_turn(self, participant: dict) -> bool:
+        """
+        Memproses semua efek awal giliran (cooldown, DoT, HoT, pasif)
+        dan mengurangi durasi status SATU KALI.
+        Mengembalikan True jika giliran harus dilewati (mis. karena stun).
+        """
+        if self.game_over: return True
+
+        # 1. Kurangi cooldown skill
+        for name in participant.skill_cooldowns:
+            if participant.skill_cooldowns[name] > 0:
+                participant.skill_cooldowns[name] -= 1
+
+        # 2. Terapkan pasif awal giliran
+        opponent = self.get_opponent(participant)
+        if participant.passive_hooks['turn_start']:
+            await skill_handler.trigger_passives(self, "turn_start", participant, opponent)
+
+        # 3. Terapkan efek DoT, HoT, dan efek berbasis giliran lainnya
+        if participant.status_effects.named('Blossom Strike'):
+            damage, _ = await skill_handler._apply_damage(self, participant, opponent, 1.0)
+            self.log.append(f"💮 **{participant.name}** muncul dari kelopak bunga, memberikan **{damage}** kerusakan!")
+        if participant.status_effects.named('Summoned Skeleton'):
+            damage, _ = await skill_handler._apply_damage(self, participant, opponent, 0.40)
+            self.log.append(f"💀 Tengkorak **{participant.name}** menyerang, memberikan **{damage}** kerusakan!")
+
+        for effect in participant.status_effects.of_type('dot', 'hot'):
+            if effect.get('type') == 'dot':
+                dot_damage = effect.get('damage', 0)
+                caster = self.p1 if self.p1.id == effect.caster_id else self.p2
+                if caster and skill_handler._has_passive(caster, "Lingering Malice"):
+                    dot_damage = int(dot_damage * 1.25)
+                hp_before = participant.hp
+                participant.hp = max(0, participant.hp - dot_damage)
+                self.record_damage(opponent, hp_before - participant.hp)
+                self.log.append(f"🔥 **{participant.name}** menerima **{dot_damage}** kerusakan dari **{effect.name}**!")
+            elif effect.get('type') == 'hot':
+                heal_amount = effect.get('heal_amount', 0)
+                if not participant.status_effects.has_type('heal_block'):
+                    if participant.agency_id == 'projectabyssal':
+                        heal_amount = int(heal_amount * 0.9)
+                    participant.hp = min(participant.max_hp, participant.hp + heal_amount)
+                    self.log.append(f"💖 **{participant.name}** memulihkan **{heal_amount}** HP dari **{effect.name}**!")
+
+        if await self.check_game_over():
+            return True
+
+        # 4. Cek efek yang melumpuhkan (stun, freeze, paralyze); durasi tetap berkurang
+        if participant.status_effects.has_type('stun', 'freeze'):
+            self.log.append(f"😵 **{participant.name}** tidak bisa bergerak karena pingsan!")
+            self._countdown_effects(participant)
+            return True
+        if participant.status_effects.has_type('paralyze') and random.random() < 0.5:
+            self.log.append(f"⚡ **{participant.name}** lumpuh dan gagal bergerak!")
+            self._countdown_effects(participant)
+            return True
+
+        # 5. Kurangi durasi semua efek yang tersisa
+        self._countdown_effects(participant)
+        return False
+
+    def _countdown_effects(self, participant: dict):
+        """Mengurangi durasi semua efek dalam satu lintasan, lalu memulihkan stat dari efek yang habis."""
+        if not participant.status_effects:
+            return
+
+        for effect in participant.status_effects.countdown():
+            self.log.append(f"✨ Efek **{effect.name}** pada **{participant.name}** telah berakhir.")
+
+            # Kembalikan stat normal jika efek ini mengubah stat
+            if 'stat' in effect and 'amount_abs' in effect:
+                stat_key = effect['stat']
+                if stat_key in participant.stats:
+                    participant.stats[stat_key] = max(0, participant.stats[stat_key] - effect.get('amount_abs', 0))
+
+            # Pembersihan khusus Stat Swap: kembalikan stat kedua pihak dan hapus pasangan efeknya
+            if effect.get('name') == "Stat Swap (Self)":
+                caster = participant
+                target = self.get_opponent(caster)
+                target_effect = target.status_effects.named("Stat Swap (Target)")
+                if 'original_atk' in effect and target_effect:
+                    caster.stats.atk = effect['original_atk']
+                    caster.stats['def'] = effect['original_def']
+                    target.stats.atk = target_effect.get('original_atk', target.stats.atk)
+                    target.stats['def'] = target_effect.get('original_def', target.stats['def'])
+                    target.status_effects.discard(target_effect)
+
+    async def switch_turn(self):
+        if self.game_over: return
+
+        if skill_handler._has_passive(self.current_turn_participant, "Perfect Symmetry"):
+            skill_handler.passive_implementations['Perfect Symmetry'](self, self.current_turn_participant)
+
+        self.has_moved_in_round.add('p1' if self.current_turn_participant is self.p1 else 'p2')
+        self.current_turn_participant = self.get_opponent(self.current_turn_participant)
+
+        # Jika kedua pihak sudah bergerak, mulai ronde baru dari urutan awal
+        if len(self.has_moved_in_round) >= 2:
+            self.round_count += 1
+            self.has_moved_in_round.clear()
+            self.log.append(f"--- Putaran #{self.round_count} ---")
+            self.current_turn_participant = self.turn_order[0]
+
+    async def process_turn_action(self, user_id, action: str, **kwargs):
+        """Aksi partisipan aktif ('attack' / 'skill'). `user_id` None = tanpa cek pemilik giliran (AI/policy)."""
+        if self.game_over: return
+        attacker = self.current_turn_participant
+        if user_id is not None and user_id != attacker.id: return
+
+        defender = self.get_opponent(attacker)
+        if defender.status_effects.has('Untargetable'):
+            self.log.append(f"💨 Serangan **{attacker.name}** gagal karena **{defender.name}** tidak dapat ditargetkan!")
+            await self.switch_turn()
+            return
+
+        log_message = ""
+        if action == 'attack':
+            if attacker.status_effects.has('Disarmed'):
+                self.log.append(f"🚫 **{attacker.name}** tidak bisa menyerang!")
+            else:
+                stun_guarantee = attacker.status_effects.named('Guaranteed Stun')
+                damage, is_crit = await skill_handler._apply_damage(self, attacker, defender)
+
+                if stun_guarantee:
+                    await skill_handler._apply_status(self, attacker, defender, "Glacial Stun", 2, 'stun')
+                    log_message += f"\n> 🧊 Serangan berikutnya memberikan **Stun**!"
+                    attacker.status_effects.remove(stun_guarantee)
+
+                if damage == 0 and not defender.status_effects.has_type('invincibility'):
+                    log_message = f"🍃 **{attacker.name}** menyerang, namun **{defender.name}** berhasil menghindar!"
+                else:
+                    crit_text = "✨ **KRITIKAL!** " if is_crit else ""
+                    log_message = f"💥 {crit_text}**{attacker.name}** menyerang, memberikan **{damage}** kerusakan!" + log_message
+                    for text in await skill_handler.trigger_passives(self, "on_attack", attacker, defender):
+                        log_message += "\n" + text
+
+        elif action == 'skill':
+            log_message = await skill_handler.apply_skill(self, attacker, defender, **kwargs)
+            for text in await skill_handler.trigger_passives(self, "on_skill", attacker, defender):
+                log_message += "\n" + text
+            await skill_handler.trigger_passives(self, "on_enemy_skill", defender, attacker)
+
+        if log_message.strip(): self.log.append(log_message.strip())
+        if await self.check_game_over(): return
+
+        await self.switch_turn()
+
+    async def play_turn(self, policy=ai_policy):
+        """Satu giliran penuh partisipan aktif: efek awal giliran lalu aksi pilihan `policy(engine, participant)`."""
+        if self.game_over: return
+        actor = self.current_turn_participant
+        if await self.begin_turn(actor):
+            if not self.game_over: await self.switch_turn()
+            return
+        action, kwargs = policy(self, actor)
+        await self.process_turn_action(None, action, **kwargs)
+
+    async def run(self, policy=ai_policy, max_rounds: int = MAX_ROUNDS) -> CombatResult:
+        """
+        Menjalankan pertarungan sampai selesai tanpa jeda. `policy` boleh satu callable untuk
+        kedua pihak atau dict {participant_id: policy}; yang tidak terdaftar memakai `ai_policy`.
+        """
+        if self.current_turn_participant is None: await self.start()
+        while not self.game_over:
+            if self.round_count > max_rounds:
+                await self._finish(None, None, "round_limit")
+                break
+            actor = self.current_turn_participant
+            actor_policy = policy.get(actor.id, ai_policy) if isinstance(policy, dict) else policy
+            await self.play_turn(actor_policy)
+        return self.result
+
+    # --- Akhir Pertarungan ---
+    async def check_game_over(self) -> bool:
+        """True jika pertarungan benar-benar berakhir (False juga jika ada yang hidup kembali)."""
+        if self.game_over: return True
+        if self.p1.hp <= 0 or self.p2.hp <= 0:
+            return await self._handle_game_over()
+        return False
+
+    async def _handle_game_over(self) -> bool:
+        revived_this_turn = False
+        for p in [self.p1, self.p2]:
+            if p.hp > 0: continue
+            for passive_name in p.passive_hooks['on_death']:
+                if await skill_handler.PASSIVE_HOOKS['on_death'][passive_name](self, p, self.get_opponent(p)):
+                    revived_this_turn = True
+                    break
+
+        # Ada yang hidup kembali: pertarungan BELUM berakhir
+        if revived_this_turn: return False
+
+        p1_dead, p2_dead = self.p1.hp <= 0, self.p2.hp <= 0
+        if p1_dead and p2_dead:
+            await self._finish(None, None, "draw")
+            return True
+        winner, loser = (self.p2, self.p1) if p1_dead else (self.p1, self.p2)
+
+        if skill_handler._has_passive(loser, "Encore of Shadows"):
+            await skill_handler.passive_implementations["Encore of Shadows"](self, loser, winner)
+        if skill_handler._has_passive(loser, "Final Vengeance"):
+            await skill_handler.passive_implementations["Final Vengeance"](self, loser, winner)
+
+        if winner.hp <= 0:
+            await self._finish(None, None, "draw_after_passive")
+        else:
+            await self._finish(winner, loser, "knockout")
+        return True
+
+    async def surrender(self, user_id):
+        if self.game_over: return
+        loser = self.p1 if user_id == self.p1.id else self.p2
+        await self._finish(self.get_opponent(loser), loser, "surrender")
+
+    async def _finish(self, winner: dict | None, loser: dict | None, reason: str):
+        self.game_over = True
+        self.result = CombatResult(
+            winner, loser, reason, self.round_count, dict(self.damage_dealt),
+            {uid: Counter(c) for uid, c in self.events.items()}
+        )
+        await self.on_fight_end(self.result)
+
+    async def on_fight_end(self, result: CombatResult):
+        """Hook adapter: dipanggil sekali ketika pertarungan selesai."""
@@ -0,0 +1,111 @@
+# game_logic/combat_records.py
+
+from collections.abc import MutableMapping
+
+_MISSING = object()
+
+# ===================================================================================
+# RECORD PERTARUNGAN RINGKAS (__SLOTS__ + SHIM DICT)
+# ===================================================================================
+
+class SlotRecord(MutableMapping):
+    """
+    Basis record __slots__ untuk data pertarungan. Jalur panas engine membaca atribut (`p.hp`);
+    shim dict (`p['hp']`, `.get`, `in`, `**p`, `.update`) menjaga fungsi skill lama tetap jalan.
+    Field yang belum diisi dianggap key tidak ada; key di luar field disimpan di dict `extra`
+    yang baru dibuat saat pertama dipakai.
+    """
+    __slots__ = ("extra",)
+    FIELDS: tuple = ()
+    _field_set: frozenset = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.FIELDS = tuple(s for klass in reversed(cls.__mro__) for s in vars(klass).get('__slots__', ()) if s != "extra")
+        cls._field_set = frozenset(cls.FIELDS)
+
+    def __init__(self, data=(), **kwargs):
+        self.extra = None
+        if data: self.update(data)
+        for key, value in kwargs.items():
+            if key in self._field_set: setattr(self, key, value)
+            else: self[key] = value
+
+    def update(self, data=(), **kwargs):
+        """Seperti dict.update; field diisi langsung sebagai atribut tanpa lewat shim per key."""
+        for source in (data, kwargs):
+            for key, value in (source.items() if hasattr(source, 'keys') else source):
+                if key in self._field_set: setattr(self, key, value)
+                elif self.extra is None: self.extra = {key: value}
+                else: self.extra[key] = value
+
+    # --- Shim dict ---
+    def __getitem__(self, key):
+        if key in self._field_set:
+            try: return getattr(self, key)
+            except AttributeError: raise KeyError(key) from None
+        if self.extra is None: raise KeyError(key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        if key in self._field_set: setattr(self, key, value)
+        elif self.extra is None: self.extra = {key: value}
+        else: self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._field_set:
+            try: delattr(self, key)
+            except AttributeError: raise KeyError(key) from None
+        elif self.extra is None: raise KeyError(key)
+        else: del self.extra[key]
+
+    def __contains__(self, key):
+        if key in self._field_set: return hasattr(self, key)
+        return self.extra is not None and key in self.extra
+
+    def get(self, key, default=None):
+        if key in self._field_set: return getattr(self, key, default)
+        return default if self.extra is None else self.extra.get(key, default)
+
+    def __iter__(self):
+        for field in self.FIELDS:
+            if getattr(self, field, _MISSING) is not _MISSING: yield field
+        if self.extra: yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __bool__(self):
+        # `if effect:` tidak perlu menghitung seluruh field seperti __len__
+        return any(getattr(self, field, _MISSING) is not _MISSING for field in self.FIELDS) or bool(self.extra)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def copy(self):
+        """Salinan dangkal bertipe sama (nilai field tidak ikut disalin)."""
+        clone = type(self).__new__(type(self))
+        for field in self.FIELDS:
+            value = getattr(self, field, _MISSING)
+            if value is not _MISSING: setattr(clone, field, value)
+        clone.extra = dict(self.extra) if self.extra else None
+        return clone
+
+class StatBlock(SlotRecord):
+    """Stat partisipan (`stats` dinamis / `base_stats` acuan). Key 'def' tetap bisa dipakai via shim/getattr."""
+    __slots__ = ("hp", "atk", "def", "spd", "crit_rate", "crit_damage", "lifesteal")
+
+class Effect(SlotRecord):
+    """Satu efek status. Parameter khusus skill (vulnerability, evasion_boost, ...) masuk ke `extra`."""
+    __slots__ = (
+        "name", "duration", "type", "caster_id", "stat", "amount", "amount_abs",
+        "damage", "heal_amount", "shield_hp", "miss_chance",
+    )
+
+class Participant(SlotRecord):
+    """Snapshot partisipan battle. Data khusus (rewards monster, dll.) masuk ke `extra`."""
+    __slots__ = (
+        "id", "name", "avatar_url", "is_player", "agency_id",
+        "stats", "base_stats", "hp", "max_hp", "skills", "raw_title_data",
+        "status_effects", "skill_cooldowns", "passive_flags", "passives", "passive_hooks",
+    )
@@ -1,11 +1,14 @@
 # game_logic/skills.py
 
+import inspect
 import random
 from typing import TYPE_CHECKING, Tuple
 
+from .combat_records import Effect
+
 # Mencegah circular import dengan type checking
 if TYPE_CHECKING:
-    from .combat_logic import CombatSession
+    from .combat_engine import CombatEngine
 
 # ===================================================================================
 # [BARU] KONSTANTA UNTUK MEKANIK EVASION BERBASIS SPD
@@ -18,42 +21,44 @@ MAX_EVA_FROM_SPD = 0.70
 # --- FUNGSI HELPER (ALAT BANTU) ---
 # ===================================================================================
 
+def passive_names(title_data: dict) -> frozenset:
+    """Nama semua skill pasif sebuah title."""
+    return frozenset(s.get('name') for s in title_data.get('skills', []) if s.get('type') == 'passive')
+
 def _has_passive(participant: dict, passive_name: str) -> bool:
-    """Fungsi helper untuk mengecek apakah partisipan memiliki skill pasif tertentu."""
+    """Fungsi helper untuk mengecek apakah partisipan memiliki skill pasif tertentu (lookup di index `passives`)."""
     if passive_name == "Extra Life" and participant.get('passive_flags', {}).get('extra_life_used'):
         return False
-    return any(skill.get('name') == passive_name for skill in participant.get('raw_title_data', {}).get('skills', []))
+    return passive_name in participant.passives
 
-async def _apply_damage(session: "CombatSession", attacker: dict, defender: dict, multiplier: float = 1.0, fixed_damage: int = None, bonus_crit_rate: float = 0.0, bonus_crit_dmg: float = 0.0, ignores_def_percent: float = 0.0, force_crit: bool = False, is_counter_attack: bool = False, bypass_evasion: bool = False) -> Tuple[int, bool]:
+async def _apply_damage(session: "CombatEngine", attacker: dict, defender: dict, multiplier: float = 1.0, fixed_damage: int = None, bonus_crit_rate: float = 0.0, bonus_crit_dmg: float = 0.0, ignores_def_percent: float = 0.0, force_crit: bool = False, is_counter_attack: bool = False, bypass_evasion: bool = False) -> Tuple[int, bool]:
     """
     Fungsi terpusat untuk menghitung dan menerapkan damage.
     [PERUBAHAN] Dibuat async untuk bisa memanggil pasif yang async.
     """
-    blind_effect = next((e for e in attacker.get('status_effects', []) if e.get('name') in ["Duskfall Blind", "Blind", "Whispers of Fear"]), None)
+    blind_effect = attacker.status_effects.named("Duskfall Blind", "Blind", "Whispers of Fear")
     if blind_effect and random.random() < blind_effect.get('miss_chance', 0.0):
-        session.log.append(f"😵 Serangan **{attacker['name']}** meleset karena efek negatif!")
+        session.log.append(f"😵 Serangan **{attacker.name}** meleset karena efek negatif!")
         return 0, False
 
-    if any(e.get('type') == 'invincibility' for e in defender.get('status_effects', [])):
-        session.log.append(f"🛡️ Serangan terhadap **{defender['name']}** tidak mempan karena kebal!")
+    if defender.status_effects.has_type('invincibility'):
+        session.log.append(f"🛡️ Serangan terhadap **{defender.name}** tidak mempan karena kebal!")
         return 0, False
     
     if not bypass_evasion:
-        defender_spd = defender['stats'].get('spd', 0)
+        defender_spd = defender.stats.spd
         eva_from_spd = (defender_spd / (defender_spd + EVA_SCALING_FACTOR)) * MAX_EVA_FROM_SPD
         passive_eva_bonus = 0.10 if _has_passive(defender, "Keen Senses") else 0.0
-        flowing_evasion_effect = next((e for e in defender.get('status_effects', []) if e.get('name') == "Flowing Evasion"), None)
-        buff_eva_bonus = flowing_evasion_effect.get('evasion_boost', 0.0) if flowing_evasion_effect else 0.0
-        total_evasion_chance = min(eva_from_spd + passive_eva_bonus + buff_eva_bonus, EVA_CAP)
+        total_evasion_chance = min(eva_from_spd + passive_eva_bonus + defender.status_effects.evasion_bonus, EVA_CAP)
         if random.random() < total_evasion_chance:
-            session.log.append(f"💨 **{defender['name']}** dengan gesit menghindari serangan!")
+            session.log.append(f"💨 **{defender.name}** dengan gesit menghindari serangan!")
             return 0, False
 
-    confection_buff = next((e for e in attacker.get('status_effects', []) if e.get('name') == 'Perfect Confection Ready'), None)
+    confection_buff = attacker.status_effects.named('Perfect Confection Ready')
     if confection_buff:
         bonus_crit_dmg += 0.50
-        attacker['status_effects'].remove(confection_buff)
-        session.log.append(f"🍬 **Perfect Confection**! Serangan **{attacker['name']}** menjadi jauh lebih kuat!")
+        attacker.status_effects.remove(confection_buff)
+        session.log.append(f"🍬 **Perfect Confection**! Serangan **{attacker.name}** menjadi jauh lebih kuat!")
 
     actual_damage = 0
     is_crit = False
@@ -61,87 +66,79 @@ async def _apply_damage(session: "CombatSession", attacker: dict, defender: dict
     if fixed_damage is not None:
         actual_damage = fixed_damage
     else:
-        total_crit_rate = attacker['stats'].get('crit_rate', 0.05) + bonus_crit_rate
+        total_crit_rate = attacker.stats.crit_rate + bonus_crit_rate
         is_crit = force_crit or random.random() < total_crit_rate
-        base_damage = attacker['stats'].get('atk', 10) * multiplier
-        final_damage = base_damage * (attacker['stats'].get('crit_damage', 1.5) + bonus_crit_dmg) if is_crit else base_damage
-        brand_effect = next((e for e in defender.get('status_effects', []) if e.get('name') == "Branded"), None)
+        base_damage = attacker.stats.atk * multiplier
+        final_damage = base_damage * (attacker.stats.crit_damage + bonus_crit_dmg) if is_crit else base_damage
+        brand_effect = defender.status_effects.named("Branded")
         if brand_effect:
             final_damage *= (1 + brand_effect.get('vulnerability', 0.0))
             session.log.append(f"🎯 Tanda **Inferno Brand** membuat serangan ini lebih menyakitkan!")
-        target_def = defender['stats'].get('def', 0) * (1 - ignores_def_percent)
+        target_def = getattr(defender.stats, 'def', 0) * (1 - ignores_def_percent)
         reduced_damage = final_damage - target_def
         actual_damage = max(1, int(reduced_damage))
 
     damage_to_hp = actual_damage
-    for effect in list(defender['status_effects']):
-        if effect.get('type') == 'shield':
-            shield_hp = effect.get('shield_hp', 0)
-            absorbed = min(damage_to_hp, shield_hp)
-            effect['shield_hp'] -= absorbed
-            damage_to_hp -= absorbed
-            session.log.append(f"🛡️ Perisai **{defender['name']}** menyerap **{absorbed}** kerusakan!")
-            if effect['shield_hp'] <= 0:
-                defender['status_effects'].remove(effect)
-                session.log.append(f"🛡️ Perisai **{defender['name']}** hancur!")
-            if damage_to_hp <= 0: break
-
-    lifesteal_percent = attacker['stats'].get('lifesteal', 0.0)
-    is_heal_blocked = any(e.get('type') == 'heal_block' for e in attacker.get('status_effects', []))
+    for effect in defender.status_effects.of_type('shield'):
+        shield_hp = effect.get('shield_hp', 0)
+        absorbed = min(damage_to_hp, shield_hp)
+        effect['shield_hp'] -= absorbed
+        damage_to_hp -= absorbed
+        session.log.append(f"🛡️ Perisai **{defender.name}** menyerap **{absorbed}** kerusakan!")
+        if effect['shield_hp'] <= 0:
+            defender.status_effects.remove(effect)
+            session.log.append(f"🛡️ Perisai **{defender.name}** hancur!")
+        if damage_to_hp <= 0: break
+
+    lifesteal_percent = getattr(attacker.stats, 'lifesteal', 0.0)
+    is_heal_blocked = attacker.status_effects.has_type('heal_block')
     if lifesteal_percent > 0 and not is_heal_blocked:
         healed_amount = int(actual_damage * lifesteal_percent)
-        attacker['hp'] = min(attacker['max_hp'], attacker['hp'] + healed_amount)
-        session.log.append(f"🩸 **{attacker['name']}** memulihkan **{healed_amount}** HP dari serangan.")
-    defender['hp'] = max(0, defender['hp'] - damage_to_hp)
+        attacker.hp = min(attacker.max_hp, attacker.hp + healed_amount)
+        session.log.append(f"🩸 **{attacker.name}** memulihkan **{healed_amount}** HP dari serangan.")
+    hp_before = defender.hp
+    defender.hp = max(0, defender.hp - damage_to_hp)
+    session.record_damage(attacker, hp_before - defender.hp)
 
-    counter_effect = next((e for e in defender.get('status_effects', []) if e.get('type') == 'counter'), None)
+    counter_effect = defender.status_effects.first_of_type('counter')
     if counter_effect and actual_damage > 0 and not is_counter_attack:
-        session.log.append(f"🔄 **{defender['name']}** membalas serangan karena efek **{counter_effect['name']}**!")
+        session.log.append(f"🔄 **{defender.name}** membalas serangan karena efek **{counter_effect['name']}**!")
         # [PERBAIKAN] Tambahkan await di sini
         counter_damage, is_counter_crit = await _apply_damage(session, attacker=defender, defender=attacker, multiplier=0.75, is_counter_attack=True)
         crit_text = "✨ **KRITIKAL!** " if is_counter_crit else ""
         session.log.append(f"> {crit_text}Serangan balasan memberikan **{counter_damage}** kerusakan!")
 
-    # [PERBAIKAN] Tambahkan await untuk memanggil pasif
-    if is_crit and _has_passive(attacker, "Static Resonance"):
-        await passive_implementations["Static Resonance"](session, attacker)
+    # Pasif penyerang setelah damage (Static Resonance, Soul Siphon)
+    if attacker.passive_hooks['on_damage']:
+        await trigger_passives(session, "on_damage", attacker, defender, damage=actual_damage, is_crit=is_crit)
 
-    if _has_passive(attacker, "Soul Siphon"):
-        await passive_implementations["Soul Siphon"](session, attacker, actual_damage)
-
-    # [TAMBAHKAN INI] Hook untuk misi serangan kritikal
-    if is_crit and attacker.get('is_player'):
-        quest_cog = session.bot.get_cog("Misi")
-        if quest_cog:
-            await quest_cog.update_quest_progress(attacker['id'], 'LAND_CRIT')
+    # Event misi serangan kritikal (diteruskan adapter ke QuestCog)
+    if is_crit: session.record_event(attacker, 'LAND_CRIT')
 
     return actual_damage, is_crit
     
     
-async def _apply_status(session: "CombatSession", caster: dict, target: dict, name: str, duration: int, effect_type: str, **kwargs):
+async def _apply_status(session: "CombatEngine", caster: dict, target: dict, name: str, duration: int, effect_type: str, **kwargs):
     """Fungsi helper untuk menambahkan efek status dengan logika agensi dan interaksi Heal Block."""
-    caster_agency_id = caster.get('agency_id')
-    target_agency_id = target.get('agency_id')
+    caster_agency_id = caster.agency_id
+    target_agency_id = target.agency_id
     
     is_debuff = effect_type in ['debuff', 'stun', 'silence', 'paralyze', 'heal_block', 'dot']
     is_buff = effect_type in ['buff', 'shield', 'hot', 'counter', 'reflect', 'invincibility', 'immunity']
 
     # --- LOGIKA HEAL BLOCK (BARU) ---
     # Cek apakah target memiliki Heal Block
-    has_heal_block = any(e.get('type') == 'heal_block' for e in target.get('status_effects', []))
+    has_heal_block = target.status_effects.has_type('heal_block')
 
     # 1. Jika mencoba memberikan HoT tapi target kena Heal Block -> Gagal
     if effect_type == 'hot' and has_heal_block:
-        return f"🚫 Efek **{name}** gagal diterapkan pada **{target['name']}** karena Heal Block!"
+        return f"🚫 Efek **{name}** gagal diterapkan pada **{target.name}** karena Heal Block!"
 
     # 2. Jika efek yang diberikan adalah Heal Block -> Hapus semua HoT yang ada
     if effect_type == 'heal_block':
-        original_count = len(target['status_effects'])
         # Hapus efek tipe 'hot'
-        target['status_effects'] = [e for e in target['status_effects'] if e.get('type') != 'hot']
-        
-        if len(target['status_effects']) < original_count:
-            session.log.append(f"🚫 **Heal Block** menghapus efek regenerasi yang ada pada **{target['name']}**!")
+        if target.status_effects.remove_types('hot'):
+            session.log.append(f"🚫 **Heal Block** menghapus efek regenerasi yang ada pada **{target.name}**!")
     # --------------------------------
 
     if is_debuff and caster_agency_id == 'projectabyssal':
@@ -150,14 +147,14 @@ async def _apply_status(session: "CombatSession", caster: dict, target: dict, na
         duration = max(2, int(duration * 0.9))
 
     # Update durasi jika efek sudah ada (kecuali shield/hot/dot yang biasanya menumpuk/terpisah)
-    if effect_type not in ['shield', 'hot', 'dot'] and any(e['name'] == name for e in target['status_effects']):
-        for effect in target['status_effects']:
-            if effect['name'] == name:
-                effect['duration'] = max(effect['duration'], duration)
-        return f"Durasi efek **{name}** pada **{target['name']}** diperbarui."
+    if effect_type not in ['shield', 'hot', 'dot'] and target.status_effects.has(name):
+        for effect in target.status_effects:
+            if effect.name == name:
+                effect.duration = max(effect.duration, duration)
+        return f"Durasi efek **{name}** pada **{target.name}** diperbarui."
 
-    effect = {'name': name, 'duration': duration, 'type': effect_type, 'caster_id': caster.get('id')}
-    effect.update(kwargs)
+    effect = Effect(name=name, duration=duration, type=effect_type, caster_id=caster.id)
+    if kwargs: effect.update(kwargs)
     
     if 'stat' in kwargs and 'amount' in kwargs:
         stat_name, amount = kwargs['stat'], kwargs['amount']
@@ -165,30 +162,30 @@ async def _apply_status(session: "CombatSession", caster: dict, target: dict, na
             percentage = float(amount.strip('%')) / 100
             if is_buff and target_agency_id == 'projectabyssal':
                 percentage *= 0.9
-            actual_amount = int(target['base_stats'][stat_name] * percentage)
+            actual_amount = int(target.base_stats[stat_name] * percentage)
             effect['amount_abs'] = actual_amount
         else:
             actual_amount = amount
             effect['amount_abs'] = actual_amount
-        target['stats'][stat_name] = max(0, target['stats'].get(stat_name, 0) + actual_amount)
+        target.stats[stat_name] = max(0, target.stats.get(stat_name, 0) + actual_amount)
     
-    target['status_effects'].append(effect)
+    target.status_effects.append(effect)
         
-    return f"✨ **{target['name']}** terkena efek **{name}**!"
+    return f"✨ **{target.name}** terkena efek **{name}**!"
 
 # ===================================================================================
 # --- IMPLEMENTASI SKILL AKTIF ---
 # ===================================================================================
 
 # --- Twilight Guardian of the Archipelago ---
-async def tidal_bulwark(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def tidal_bulwark(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     shield_amount = int(caster['max_hp'] * 0.50)
     await _apply_status(session, caster, caster, "Tidal Shield", 3, 'shield', shield_hp=shield_amount)
     await _apply_status(session, caster, caster, "Tidal Counter", 3, 'counter')
     await _apply_status(session, caster, caster, "Tidal Defense", 3, 'buff', stat='def', amount='+30%')
     return f"🌊 **{caster['name']}** memanggil **Tidal Bulwark**, menciptakan perisai **{shield_amount}** HP dan bersiap membalas serangan!"
 
-async def duskfall_strike(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def duskfall_strike(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.50)
     await _apply_status(session, caster, target, "Duskfall Blind", 3, 'debuff', miss_chance=0.35)
     await _apply_status(session, caster, target, "Duskfall Slow", 3, 'debuff', stat='spd', amount='-25%')
@@ -196,7 +193,7 @@ async def duskfall_strike(session: "CombatSession", caster: dict, target: dict,
     return f"🌇 {crit_text}**{caster['name']}** melancarkan **Duskfall Strike**, memberikan **{damage}** kerusakan dan mengaburkan pandangan lawan!"
 
 # --- Shadowborne Diva of Sorrow ---
-async def sorrowful_aria(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def sorrowful_aria(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, target, "Sorrowful ATK Down", 4, 'debuff', stat='atk', amount='-30%')
     await _apply_status(session, caster, target, "Sorrowful DEF Down", 4, 'debuff', stat='def', amount='-30%')
     log_message = f"🎶 **{caster['name']}** menyanyikan **Sorrowful Aria**, meremukkan semangat juang **{target['name']}**!"
@@ -205,11 +202,11 @@ async def sorrowful_aria(session: "CombatSession", caster: dict, target: dict, *
         log_message += f"\n> 🔇 Suara merdunya membungkam **{target['name']}**!"
     return log_message
 
-async def phantom_crescendo(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def phantom_crescendo(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.60, ignores_def_percent=0.30)
     
     # Cek Heal Block
-    is_heal_blocked = any(e.get('type') == 'heal_block' for e in caster.get('status_effects', []))
+    is_heal_blocked = caster['status_effects'].has_type('heal_block')
     heal_msg = ""
     
     if not is_heal_blocked:
@@ -223,7 +220,7 @@ async def phantom_crescendo(session: "CombatSession", caster: dict, target: dict
     return f"👻 {crit_text}**{caster['name']}** mencapai **Phantom Crescendo**, memberikan **{damage}** kerusakan{heal_msg}"
 
 # --- Sun of Dual Symphonies ---
-async def solar_overture(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def solar_overture(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     heal_per_turn = int(caster['max_hp'] * 0.15)
     await _apply_status(session, caster, caster, "Solar Regeneration", 4, 'hot', heal_amount=heal_per_turn)
     
@@ -240,9 +237,9 @@ async def solar_overture(session: "CombatSession", caster: dict, target: dict, *
     passive_implementations['Harmonious Resonance'](session, caster, skill_type='support')
     return log_message
 
-async def blazing_finale(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def blazing_finale(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     multiplier = 1.40
-    has_buff = any(e.get('type') == 'buff' for e in caster.get('status_effects', []))
+    has_buff = caster['status_effects'].has_type('buff')
     if has_buff:
         # [PERBAIKAN] Menggunakan perkalian untuk "peningkatan 50%"
         multiplier *= 1.50
@@ -258,7 +255,7 @@ async def blazing_finale(session: "CombatSession", caster: dict, target: dict, *
     return log_message
 
 # --- Flame Within the Crimson Soul ---
-async def inferno_brand(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def inferno_brand(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.20)
     burn_damage = int(target['max_hp'] * 0.10)
     await _apply_status(session, caster, target, "Inferno Burn", 3, 'dot', damage=burn_damage)
@@ -266,7 +263,7 @@ async def inferno_brand(session: "CombatSession", caster: dict, target: dict, **
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🔥 **{caster['name']}** meninggalkan **Inferno Brand**, memberikan **{damage}** kerusakan dan membuat target rentan!"
 
-async def soul_combustion(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def soul_combustion(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     hp_percent = caster['hp'] / caster['max_hp']
     # Peningkatan damage berbanding terbalik dengan sisa HP
     # Saat HP 100%, bonus = 0. Saat HP 1%, bonus = 1.5
@@ -277,7 +274,7 @@ async def soul_combustion(session: "CombatSession", caster: dict, target: dict,
     return f"💥 {crit_text}**{caster['name']}** meledakkan jiwanya dengan **Soul Combustion**, memberikan **{damage}** kerusakan!"
 
 # --- Monk of Ancestral Echoes ---
-async def hundred_spirits_palm(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def hundred_spirits_palm(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     total_damage = 0
     debuffs_applied = []
     debuff_options = [
@@ -300,15 +297,15 @@ async def hundred_spirits_palm(session: "CombatSession", caster: dict, target: d
         log_message += f"\n> Arwah leluhur memberikan efek: {', '.join(debuffs_applied)}!"
     return log_message
 
-async def flowing_mantra(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def flowing_mantra(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     # Fungsi ini sudah benar
-    caster['status_effects'] = [e for e in caster['status_effects'] if e.get('type') not in ['debuff', 'dot', 'stun', 'silence', 'paralyze', 'heal_block']]
+    caster['status_effects'].remove_types('debuff', 'dot', 'stun', 'silence', 'paralyze', 'heal_block')
     await _apply_status(session, caster, caster, "Flowing Evasion", 3, 'buff', evasion_boost=0.35)
     await _apply_status(session, caster, caster, "Flowing Attack", 3, 'buff', stat='atk', amount='+15%')
     return f"🧘 **{caster['name']}** menggunakan **Flowing Mantra**, membersihkan diri dan meningkatkan Evasion serta Buff ATK!"
 
 # --- Last Dream of Falling Snow ---
-async def absolute_zero(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def absolute_zero(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.30)
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     log_message = f"❄️ {crit_text}**{caster['name']}** menciptakan **Absolute Zero**, memberikan **{damage}** kerusakan!"
@@ -317,7 +314,7 @@ async def absolute_zero(session: "CombatSession", caster: dict, target: dict, **
         log_message += f"\n> 🥶 **{target['name']}** membeku di tempat!"
     return log_message
 
-async def snowflake_dance(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def snowflake_dance(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     is_slowed = any(e.get('stat') == 'spd' and e.get('amount') < 0 for e in target.get('status_effects', []))
     total_damage = 0
     damage1, _ = await _apply_damage(session, caster, target, 0.70, force_crit=is_slowed)
@@ -329,7 +326,7 @@ async def snowflake_dance(session: "CombatSession", caster: dict, target: dict,
     return log_message
 
 # --- Architect of Fantastical Harmony ---
-async def reality_s_blueprint(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def reality_s_blueprint(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, caster, "Stat Swap (Self)", 3, 'stat_swap', target_id=target['id'])
     await _apply_status(session, caster, target, "Stat Swap (Target)", 3, 'stat_swap', target_id=caster['id'])
     
@@ -338,9 +335,9 @@ async def reality_s_blueprint(session: "CombatSession", caster: dict, target: di
     return f"📐 **{caster['name']}** menggunakan **Realitys Blueprint**, menukar ATK dan DEF dengan **{target['name']}**!"
 
     
-async def harmonic_convergence(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def harmonic_convergence(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     # Cek Heal Block
-    is_heal_blocked = any(e.get('type') == 'heal_block' for e in caster.get('status_effects', []))
+    is_heal_blocked = caster['status_effects'].has_type('heal_block')
     
     caster_hp_percent = caster['hp'] / caster['max_hp']
     target_hp_percent = target['hp'] / target['max_hp']
@@ -362,15 +359,15 @@ async def harmonic_convergence(session: "CombatSession", caster: dict, target: d
     return f"🎶 **{caster['name']}** menciptakan **Harmonic Convergence**, menyeimbangkan HP{heal_msg}"
 
 # --- Amethyst Witchfire Gleam ---
-async def crystallize_mana(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def crystallize_mana(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.40)
     for skill_name in target['skill_cooldowns']:
         target['skill_cooldowns'][skill_name] += 2
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"💎 {crit_text}**{caster['name']}** menembakkan **Crystallize Mana**, memberikan **{damage}** kerusakan dan mengunci skill lawan!"
 
-async def amethyst_purge(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
-    buffs_to_remove = [e for e in target['status_effects'] if e.get('type') == 'buff']
+async def amethyst_purge(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
+    buffs_to_remove = target['status_effects'].of_type('buff')
     buff_count = len(buffs_to_remove)
     
     for buff in buffs_to_remove:
@@ -387,48 +384,48 @@ async def amethyst_purge(session: "CombatSession", caster: dict, target: dict, *
     return log_message
 
 # --- Princess of the Imagined Sea ---
-async def summon_leviathan_s_mirage(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def summon_leviathan_s_mirage(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.60)
     await _apply_status(session, caster, target, "Mirage DEF Down", 4, 'debuff', stat='def', amount='-30%')
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🐉 {crit_text}**{caster['name']}** memanggil **Leviathans Mirage**, memberikan **{damage}** kerusakan dahsyat!"
 
-async def dreamtide(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def dreamtide(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, target, "Dreamtide Stun", 2, 'stun')
     await _apply_status(session, caster, target, "Dreamtide Heal Block", 3, 'heal_block')
     return f"🌊 **{caster['name']}** menenggelamkan **{target['name']}** dalam **Dreamtide**, membuatnya tertidur!"
 
 # --- Poet of Winged Mystery ---
-async def verse_of_the_griffin(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def verse_of_the_griffin(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.50, ignores_def_percent=0.50)
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🦅 {crit_text}**{caster['name']}** mendeklamasikan **Verse of the Griffin**, memberikan **{damage}** kerusakan menembus!"
 
-async def rhyme_of_the_roc(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def rhyme_of_the_roc(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, caster, "Rocs ATK Up", 3, 'buff', stat='atk', amount='+30%')
     await _apply_status(session, caster, caster, "Rocs Crit Up", 3, 'buff', stat='crit_rate', amount=0.50)
     return f"🐦 **{caster['name']}** membisikkan **Rhyme of the Roc**, mempersiapkan serangan mematikan!"
 
 # --- Silken Marionette Gallery ---
-async def puppet_s_vow(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def puppet_s_vow(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     session.log.append(f"🧵 **{caster['name']}** menggunakan **Puppets Vow**, memaksa **{target['name']}** menyerang dirinya sendiri!")
     # Simulate self-attack
     damage, is_crit = await _apply_damage(session, target, target, 0.75)
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"> {crit_text}Serangan boneka memberikan **{damage}** kerusakan pada **{target['name']}**!"
 
-async def strings_of_fate(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def strings_of_fate(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, caster, "Strings of Fate Link", 4, 'damage_link', target_id=target['id'])
     return f"🔗 **{caster['name']}** mengikat takdirnya dengan **{target['name']}** melalui **Strings of Fate**!"
 
 # --- Violet Nocturne of Thunder ---
-async def thunderclap_sonata(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def thunderclap_sonata(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, _ = await _apply_damage(session, caster, target, 1.0, force_crit=True)
     recoil_damage = int(damage * 0.15)
     caster['hp'] = max(0, caster['hp'] - recoil_damage)
     return f"⚡ **{caster['name']}** memainkan **Thunderclap Sonata**, memberikan **{damage}** kerusakan kritikal dan menerima **{recoil_damage}** recoil!"
 
-async def lightning_etude(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def lightning_etude(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     total_damage = 0
     paralyze_count = 0
     for _ in range(3):
@@ -444,13 +441,13 @@ async def lightning_etude(session: "CombatSession", caster: dict, target: dict,
     return log_message
 
 # --- Ballad of the Winterborn ---
-async def glacial_prison(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def glacial_prison(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.20)
     await _apply_status(session, caster, caster, "Guaranteed Stun", 2, 'internal_buff')
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🧊 {crit_text}**{caster['name']}** menciptakan **Glacial Prison**, memberikan **{damage}** kerusakan dan mempersiapkan stun!"
 
-async def winter_s_heart(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def winter_s_heart(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     # [PERBAIKAN] Gunakan session.round_count bukan session.turn_count
     turn_bonus_hp = int(caster['max_hp'] * (0.02 * session.round_count))
     turn_bonus_shield = int(caster['max_hp'] * (0.01 * session.round_count))
@@ -464,9 +461,9 @@ async def winter_s_heart(session: "CombatSession", caster: dict, target: dict, *
     return f"❤️‍🩹 **{caster['name']}** memanggil **Winters Heart**, memulihkan **{heal_amount}** HP dan mendapatkan perisai **{shield_amount}** HP!"
 
 # --- Whispers of the Netopia Café ---
-async def data_leak(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def data_leak(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     # Hapus semua buff
-    buffs_to_remove = [e for e in target['status_effects'] if e.get('type') == 'buff']
+    buffs_to_remove = target['status_effects'].of_type('buff')
     for buff in buffs_to_remove:
         if 'stat' in buff: target['stats'][buff['stat']] -= buff['amount']
         target['status_effects'].remove(buff)
@@ -479,7 +476,7 @@ async def data_leak(session: "CombatSession", caster: dict, target: dict, **kwar
         log_message += f"\n> Pertahanan **{target['name']}** hancur!"
     return log_message
 
-async def system_crash(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def system_crash(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     # Menggunakan fixed_damage untuk mengabaikan DEF secara total
     damage_amount = int(caster['stats']['atk'] * 0.80)
     damage, _ = await _apply_damage(session, caster, target, fixed_damage=damage_amount)
@@ -487,20 +484,20 @@ async def system_crash(session: "CombatSession", caster: dict, target: dict, **k
     return f"💥 **{caster['name']}** menyebabkan **System Crash**, memberikan **{damage}** kerusakan dan mencegah pemulihan!"
 
 # --- Soft Silence of Sakura ---
-async def sakura_flash(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def sakura_flash(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0) + 0.50
     # [PERBAIKAN] Gunakan flag bypass_evasion
     damage, is_crit = await _apply_damage(session, caster, target, 1.50, bonus_crit_dmg=bonus_crit_dmg, bypass_evasion=True)
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🌸 {crit_text}**{caster['name']}** menebas dengan **Sakura Flash**, memberikan **{damage}** kerusakan yang tak terhindarkan!"
 
-async def falling_blossom(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def falling_blossom(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, caster, "Untargetable", 2, 'ungettable') # Efek akan berlangsung 1 giliran
     await _apply_status(session, caster, caster, "Blossom Strike", 2, 'internal_buff') # Tanda untuk menyerang giliran berikutnya
     return f"💮 **{caster['name']}** menghilang dalam **Falling Blossom**, menjadi tidak dapat diserang!"
 
 # --- The Adamant Colossus (BARU) ---
-async def sundering_quake(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def sundering_quake(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
     damage, is_crit = await _apply_damage(session, caster, target, 1.30, bonus_crit_rate=bonus_crit_rate, bonus_crit_dmg=bonus_crit_dmg)
@@ -513,7 +510,7 @@ async def sundering_quake(session: "CombatSession", caster: dict, target: dict,
         
     return log_message
 
-async def ironclad_resolve(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def ironclad_resolve(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     # Memberikan 3 efek: Taunt (untuk logika AI), DEF buff, dan Disarm (mencegah serangan)
     await _apply_status(session, caster, caster, "Taunt", 2, 'taunt')
     await _apply_status(session, caster, caster, "Ironclad Defense", 2, 'buff', stat='def', amount='+60%')
@@ -521,13 +518,13 @@ async def ironclad_resolve(session: "CombatSession", caster: dict, target: dict,
     return f"🛡️ **{caster['name']}** menggunakan **Ironclad Resolve**, memfokuskan semua serangan pada dirinya dan memperkuat pertahanan!"
 
 # --- The Sentinels Vow (BARU) ---
-async def barricade_of_thorns(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def barricade_of_thorns(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     shield_amount = int(caster['max_hp'] * 0.35)
     await _apply_status(session, caster, caster, "Thorns Shield", 3, 'shield', shield_hp=shield_amount)
     await _apply_status(session, caster, caster, "Thorns Reflect", 3, 'reflect', reflect_percent=0.20)
     return f"🛡️ **{caster['name']}** mendirikan **Barricade of Thorns**, menciptakan perisai **{shield_amount}** HP yang memantulkan serangan!"
 
-async def retribution_bash(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def retribution_bash(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -537,7 +534,7 @@ async def retribution_bash(session: "CombatSession", caster: dict, target: dict,
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     log_message = f"👊 {crit_text}**{caster['name']}** menghantam dengan **Retribution Bash**, memberikan **{damage}** kerusakan!"
     
-    is_shield_active = any(e.get('type') == 'shield' for e in caster.get('status_effects', []))
+    is_shield_active = caster['status_effects'].has_type('shield')
     if is_shield_active:
         await _apply_status(session, caster, target, "Bash Stun", 2, 'stun')
         log_message += f"\n> 😵 Kekuatan perisai membuat **{target['name']}** pingsan!"
@@ -545,7 +542,7 @@ async def retribution_bash(session: "CombatSession", caster: dict, target: dict,
     return log_message
 
 # --- Howling Gale (BARU) ---
-async def lancer_s_cometfall(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def lancer_s_cometfall(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -556,24 +553,24 @@ async def lancer_s_cometfall(session: "CombatSession", caster: dict, target: dic
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"☄️ {crit_text}**{caster['name']}** melesat dengan **Lancers Cometfall**, memberikan **{damage}** kerusakan dan meningkatkan fokus kritikal!"
 
-async def ride_the_wind(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def ride_the_wind(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, caster, "Wind Rider (SPD)", 3, 'buff', stat='spd', amount='+25%')
     await _apply_status(session, caster, caster, "Wind Rider (ATK)", 3, 'buff', stat='atk', amount='+15%')
     return f"🏇 **{caster['name']}** memacu tunggangannya dengan **Ride the Wind**, meningkatkan kecepatan dan kekuatan serangan!"
 
 # --- The Weaver Commander (BARU) ---
-async def foresights_gambit(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def foresights_gambit(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, target, "Blind", 3, 'debuff', miss_chance=0.25)
     return f"👁️ **{caster['name']}** menggunakan **Foresights Gambit**, mengaburkan pandangan **{target['name']}**!"
 
-async def orchestrated_assault(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def orchestrated_assault(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, caster, "Orchestrated Crit Rate", 4, 'buff', stat='crit_rate', amount=0.20)
     await _apply_status(session, caster, caster, "Orchestrated Crit Dmg", 4, 'buff', stat='crit_damage', amount=0.20)
     return f"🎼 **{caster['name']}** melakukan **Orchestrated Assault**, mempersiapkan serangan mematikan berikutnya!"
 
 # --- Bulwark of the Dawns Light (BARU) ---
-async def hallowed_ground(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
-    is_heal_blocked = any(e.get('type') == 'heal_block' for e in caster.get('status_effects', []))
+async def hallowed_ground(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
+    is_heal_blocked = caster['status_effects'].has_type('heal_block')
     if is_heal_blocked:
         return f"❤️‍🩹 **{caster['name']}** mencoba menggunakan **Hallowed Ground**, tetapi gagal karena efek Heal Block!"
         
@@ -581,32 +578,32 @@ async def hallowed_ground(session: "CombatSession", caster: dict, target: dict,
     await _apply_status(session, caster, caster, "Hallowed Ground", 3, 'hot', heal_amount=heal_per_turn)
     return f"✨ **{caster['name']}** memberkati tanah dengan **Hallowed Ground**, memulihkan diri setiap giliran!"
 
-async def sacred_intervention(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def sacred_intervention(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, caster, "Invincibility", 2, 'invincibility')
     return f"🛡️ **{caster['name']}** dilindungi oleh **Sacred Intervention**, menjadi kebal terhadap semua serangan!"
 
 # --- Phantom in the Code (BARU) ---
-async def cascading_logic_bomb(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def cascading_logic_bomb(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 0.80)
     burn_damage = int(target['max_hp'] * 0.05)
     await _apply_status(session, caster, target, "Logic Bomb Burn", 4, 'dot', damage=burn_damage)
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"💻 {crit_text}**{caster['name']}** mengirim **Cascading Logic Bomb**, memberikan **{damage}** kerusakan dan menanam virus!"
 
-async def protocol_override(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def protocol_override(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, target, "Heal Block", 3, 'heal_block')
     await _apply_status(session, caster, target, "Protocol Slow", 3, 'debuff', stat='spd', amount='-25%')
     return f"🚫 **{caster['name']}** menggunakan **Protocol Override**, merusak sistem **{target['name']}** dan mencegah pemulihan!"
 
 # --- Venomous Koala (BARU) ---
-async def neurotoxin_bloom(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def neurotoxin_bloom(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 0.50)
     poison_damage = int(target['max_hp'] * 0.07)
     await _apply_status(session, caster, target, "Neurotoxin", 3, 'dot', damage=poison_damage)
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🐨 {crit_text}**{caster['name']}** melepaskan **Neurotoxin Bloom**, memberikan **{damage}** kerusakan dan meracuni target!"
 
-async def paralyzing_venom(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def paralyzing_venom(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 0.70)
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     log_message = f"🐍 {crit_text}**{caster['name']}** menyuntikkan **Paralyzing Venom**, memberikan **{damage}** kerusakan!"
@@ -618,13 +615,13 @@ async def paralyzing_venom(session: "CombatSession", caster: dict, target: dict,
     return log_message
 
 # --- Gilded Rose of Sunstone (BARU) ---
-async def caramelized_shot(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def caramelized_shot(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.15)
     await _apply_status(session, caster, target, "Caramelized", 3, 'debuff', stat='spd', amount='-15%')
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🍮 {crit_text}**{caster['name']}** menembakkan **Caramelized Shot**, memberikan **{damage}** kerusakan dan memperlambat target!"
 
-async def flourish_and_fire(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def flourish_and_fire(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, caster, "Flourish", 3, 'buff', stat='crit_rate', amount=0.25)
     
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0) + 0.25
@@ -637,12 +634,12 @@ async def flourish_and_fire(session: "CombatSession", caster: dict, target: dict
     return f"🌹 **{caster['name']}** melakukan **Flourish and Fire**, meningkatkan Crit Rate dan langsung menembak, memberikan **{damage}** kerusakan!"
 
 # --- Curse of a Broken Moon (BARU) ---
-async def whispers_of_decay(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def whispers_of_decay(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, target, "Attack Down (Decay)", 3, 'debuff', stat='atk', amount='-20%')
     await _apply_status(session, caster, target, "Defense Down (Decay)", 3, 'debuff', stat='def', amount='-20%')
     return f"🌙 **{caster['name']}** membisikkan **Whispers of Decay**, merapuhkan kekuatan dan pertahanan **{target['name']}**!"
 
-async def blood_price_offering(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def blood_price_offering(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     hp_cost = int(caster['hp'] * 0.15)
     caster['hp'] = max(1, caster['hp'] - hp_cost)
     
@@ -655,13 +652,13 @@ async def blood_price_offering(session: "CombatSession", caster: dict, target: d
     return f"💔 **{caster['name']}** menggunakan **Blood Price Offering**, mengorbankan **{hp_cost}** HP untuk memberikan **{damage_dealt}** kerusakan dan menyebabkan pendarahan!"
 
 # --- Gambler of the Fickle Fate (BARU) ---
-async def chaotic_roll(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def chaotic_roll(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     roll = random.random()
     if roll < 0.25: # 25% Stun
         await _apply_status(session, caster, target, "Chaotic Stun", 2, 'stun')
         return f"🎲 **Chaotic Roll**! **{caster['name']}** membuat **{target['name']}** pingsan!"
     elif roll < 0.50: # 25% Heal
-        is_heal_blocked = any(e.get('type') == 'heal_block' for e in caster.get('status_effects', []))
+        is_heal_blocked = caster['status_effects'].has_type('heal_block')
         if is_heal_blocked:
             return f"🎲 **Chaotic Roll**! **{caster['name']}** mencoba memulihkan diri, tetapi gagal karena efek Heal Block!"
         
@@ -678,7 +675,7 @@ async def chaotic_roll(session: "CombatSession", caster: dict, target: dict, **k
         crit_text = "✨ **KRITIKAL!** " if is_crit else ""
         return f"🎲 **Chaotic Roll**! {crit_text}**{caster['name']}** memberikan **{damage}** kerusakan besar!"
 
-async def all_in(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def all_in(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     if random.random() < 0.50:
         # Sukses: Critical Hit dengan bonus 100% Crit Damage
         damage, _ = await _apply_damage(session, caster, target, 1.0, force_crit=True, bonus_crit_dmg=1.00) # bonus_crit_dmg +100%
@@ -688,7 +685,7 @@ async def all_in(session: "CombatSession", caster: dict, target: dict, **kwargs)
         return f"💸 **ALL IN!** Serangan **{caster['name']}** terlalu berisiko dan meleset sepenuhnya!"
 
 # --- Crimson Lotus Dancer (BARU) ---
-async def blade_of_ephemeral_grace(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def blade_of_ephemeral_grace(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.35)
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     log_message = f"🌸 {crit_text}**{caster['name']}** menyerang dengan **Blade of Ephemeral Grace**, memberikan **{damage}** kerusakan!"
@@ -699,14 +696,14 @@ async def blade_of_ephemeral_grace(session: "CombatSession", caster: dict, targe
         
     return log_message
 
-async def arcane_silence(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def arcane_silence(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.00)
     await _apply_status(session, caster, target, "Arcane Silence", 2, 'silence')
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🤫 {crit_text}**{caster['name']}** menggunakan **Arcane Silence**, memberikan **{damage}** kerusakan dan membungkam sihir **{target['name']}**!"
 
 # --- Whisper of the Gilded Cage (BARU) ---
-async def golden_shackle(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def golden_shackle(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 0.80)
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     log_message = f"⛓️ {crit_text}**{caster['name']}** menggunakan **Golden Shackle**, memberikan **{damage}** kerusakan!"
@@ -717,7 +714,7 @@ async def golden_shackle(session: "CombatSession", caster: dict, target: dict, *
         
     return log_message
 
-async def gilded_prison(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def gilded_prison(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     if random.random() < 0.50:
         await _apply_status(session, caster, target, "Paralyze", 3, 'paralyze') # Durasi 3 untuk 2 giliran efektif
         return f"🏛️ **{caster['name']}** menciptakan **Gilded Prison**, melumpuhkan **{target['name']}**!"
@@ -725,11 +722,11 @@ async def gilded_prison(session: "CombatSession", caster: dict, target: dict, **
         return f"💨 **{caster['name']}** mencoba menciptakan **Gilded Prison**, tetapi **{target['name']}** berhasil lolos!"
 
 # --- The Undying Taboo (BARU) ---
-async def raise_dead(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def raise_dead(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, caster, "Summoned Skeleton", 3, 'summon') # Durasi 3 agar aktif selama 2 giliran
     return f"💀 **{caster['name']}** menggunakan **Raise Dead**, membangkitkan sesosok tengkorak dari tanah!"
 
-async def soul_drain(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def soul_drain(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -737,7 +734,7 @@ async def soul_drain(session: "CombatSession", caster: dict, target: dict, **kwa
                                     bonus_crit_rate=bonus_crit_rate,
                                     bonus_crit_dmg=bonus_crit_dmg)
     
-    is_heal_blocked = any(e.get('type') == 'heal_block' for e in caster.get('status_effects', []))
+    is_heal_blocked = caster['status_effects'].has_type('heal_block')
     log_message = ""
     if is_heal_blocked:
         log_message = "\n> ❤️‍🩹 Pemulihan HP gagal karena efek Heal Block!"
@@ -750,7 +747,7 @@ async def soul_drain(session: "CombatSession", caster: dict, target: dict, **kwa
     return f"👻 {crit_text}**{caster['name']}** menggunakan **Soul Drain**, memberikan **{damage}** kerusakan{log_message}"
 
 # --- Wail of the Mourning Moon ---
-async def crescent_weep(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def crescent_weep(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 0.80)
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     log_message = f"🌙 {crit_text}**{caster['name']}** melepaskan **Crescent Weep**, memberikan **{damage}** kerusakan!"
@@ -762,7 +759,7 @@ async def crescent_weep(session: "CombatSession", caster: dict, target: dict, **
         
     return log_message
 
-async def lunar_curse(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def lunar_curse(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, caster, "Lunar Blessing", 3, 'buff', stat='atk', amount='+15%')
     log_message = f"诅 **{caster['name']}** merapal **Lunar Curse**, meningkatkan kekuatan serangannya!"
 
@@ -776,7 +773,7 @@ async def lunar_curse(session: "CombatSession", caster: dict, target: dict, **kw
     return log_message
 
 # --- Canvas of the World Tree (BARU) ---
-async def vine_lash(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def vine_lash(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 0.85)
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     log_message = f"🌿 {crit_text}**{caster['name']}** menggunakan **Vine Lash**, memberikan **{damage}** kerusakan!"
@@ -787,18 +784,18 @@ async def vine_lash(session: "CombatSession", caster: dict, target: dict, **kwar
         
     return log_message
 
-async def nature_s_blessing(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def nature_s_blessing(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     heal_per_turn = int(caster['max_hp'] * 0.07)
     await _apply_status(session, caster, caster, "Natures Blessing", 4, 'hot', heal_amount=heal_per_turn) # Durasi 4 untuk 3 giliran efektif
     return f"🌳 **{caster['name']}** menerima **Natures Blessing**, memulihkan HP setiap giliran!"
 
 # --- Smile from the Shadows (BARU) ---
-async def shadow_bolt(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def shadow_bolt(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 0.95)
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"⚫ {crit_text}**{caster['name']}** menembakkan **Shadow Bolt**, memberikan **{damage}** kerusakan!"
 
-async def whispers_of_fear(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def whispers_of_fear(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     if random.random() < 0.50:
         await _apply_status(session, caster, target, "Fear", 3, 'debuff', miss_chance=0.25) # Durasi 3 untuk 2 giliran efektif
         return f"😨 **{caster['name']}** membisikkan **Whispers of Fear**, membuat **{target['name']}** diliputi rasa takut!"
@@ -806,33 +803,33 @@ async def whispers_of_fear(session: "CombatSession", caster: dict, target: dict,
         return f"💨 **{caster['name']}** membisikkan **Whispers of Fear**, tetapi **{target['name']}** berhasil menepisnya!"
 
 # --- Fate of the Twin Blades (BARU) ---
-async def cross_slash(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def cross_slash(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage1, is_crit1 = await _apply_damage(session, caster, target, 0.60)
     damage2, is_crit2 = await _apply_damage(session, caster, target, 0.60)
     total_damage = damage1 + damage2
     crit_count = (1 if is_crit1 else 0) + (1 if is_crit2 else 0)
     return f"⚔️ **{caster['name']}** menggunakan **Cross Slash**, memberikan 2 serangan dengan total **{total_damage}** kerusakan! ({crit_count} kritikal)"
 
-async def blade_dance(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def blade_dance(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, caster, "Blade Dance", 3, 'buff', stat='spd', amount='+20%')
     return f"💃 **{caster['name']}** melakukan **Blade Dance**, meningkatkan SPD secara drastis!"
 
 # --- Guardian of the Soul Gate (BARU) ---
-async def fel_flame(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def fel_flame(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 0.75)
     burn_damage = int(caster['stats']['atk'] * 0.05)
     await _apply_status(session, caster, target, "Fel Flame Burn", 3, 'dot', damage=burn_damage) # Durasi 3 untuk 2 turn
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🔥 {crit_text}**{caster['name']}** menembakkan **Fel Flame**, memberikan **{damage}** kerusakan dan membakar jiwa target!"
 
-async def demonic_pact(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def demonic_pact(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     hp_cost = int(caster['hp'] * 0.10)
     caster['hp'] = max(1, caster['hp'] - hp_cost)
     await _apply_status(session, caster, caster, "Demonic Pact", 2, 'buff', stat='atk', amount='+30%') # Durasi 2 untuk 1 turn efektif
     return f"😈 **{caster['name']}** membuat **Demonic Pact**, mengorbankan **{hp_cost}** HP untuk kekuatan yang lebih besar!"
 
 # --- The Pixelated Prodigy (BARU) ---
-async def button_mash(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def button_mash(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     total_damage = 0
     crit_count = 0
     for _ in range(3):
@@ -842,7 +839,7 @@ async def button_mash(session: "CombatSession", caster: dict, target: dict, **kw
             crit_count += 1
     return f"👾 **{caster['name']}** melakukan **Button Mash**, memberikan 3 serangan dengan total **{total_damage}** kerusakan! ({crit_count} kritikal)"
 
-async def rage_quit(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def rage_quit(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     if (caster['hp'] / caster['max_hp']) > 0.25:
         return f"🤬 **{caster['name']}** mencoba menggunakan **Rage Quit**, tetapi HP-nya masih di atas 25%!"
 
@@ -852,7 +849,7 @@ async def rage_quit(session: "CombatSession", caster: dict, target: dict, **kwar
     return f"🤬 {crit_text}**{caster['name']}** menggunakan **Rage Quit**, memberikan **{damage}** kerusakan besar tetapi akan terkena stun!"
 
 # --- Blessing of the Food Goddess (BARU) ---
-async def spicy_dish(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def spicy_dish(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 0.80)
     # Efek burn akan memberikan damage setara 10% ATK caster setiap giliran
     burn_damage = int(caster['stats']['atk'] * 0.10)
@@ -860,8 +857,8 @@ async def spicy_dish(session: "CombatSession", caster: dict, target: dict, **kwa
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🌶️ {crit_text}**{caster['name']}** melempar **Spicy Dish**, memberikan **{damage}** kerusakan dan membakar target!"
 
-async def hearty_meal(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
-    is_heal_blocked = any(e.get('type') == 'heal_block' for e in caster.get('status_effects', []))
+async def hearty_meal(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
+    is_heal_blocked = caster['status_effects'].has_type('heal_block')
     if is_heal_blocked:
         return f"❤️‍🩹 **{caster['name']}** mencoba memakan **Hearty Meal**, tetapi gagal karena efek Heal Block!"
 
@@ -879,7 +876,7 @@ async def hearty_meal(session: "CombatSession", caster: dict, target: dict, **kw
     return f"🍲 **{caster['name']}** memakan **Hearty Meal**, memulihkan **{final_heal}** HP!"
 
 # --- Nameless Blade ---
-async def first_cut(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def first_cut(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
     
@@ -890,13 +887,13 @@ async def first_cut(session: "CombatSession", caster: dict, target: dict, **kwar
     return f"🔪 {crit_text}**{caster['name']}** menggunakan **First Cut**, memberikan **{damage}** kerusakan!"
 
     
-async def steady_guard(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def steady_guard(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, caster, "Steady Guard", duration=2, effect_type='buff', stat='def', amount='+15%')
     return f"🛡️ **{caster['name']}** menggunakan **Steady Guard**, meningkatkan DEF!"
 
 # --- Altars Whisper ---
-async def mending_light(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
-    is_heal_blocked = any(e.get('type') == 'heal_block' for e in caster.get('status_effects', []))
+async def mending_light(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
+    is_heal_blocked = caster['status_effects'].has_type('heal_block')
     if is_heal_blocked:
         return f"❤️‍🩹 **{caster['name']}** mencoba menggunakan **Mending Light**, tetapi gagal karena efek Heal Block!"
 
@@ -913,13 +910,13 @@ async def mending_light(session: "CombatSession", caster: dict, target: dict, **
     caster['hp'] = min(caster['max_hp'], caster['hp'] + final_heal)
     return f"💖 **{caster['name']}** menggunakan **Mending Light**, memulihkan **{final_heal}** HP!"
 
-async def hallowed_ward(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def hallowed_ward(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     shield_amount = int(caster['max_hp'] * 0.10)
     await _apply_status(session, caster, caster, "Hallowed Ward", duration=99, effect_type='shield', shield_hp=shield_amount)
     return f"🌟 **{caster['name']}** menggunakan **Hallowed Ward**, menciptakan perisai sebesar **{shield_amount}** HP!"
 
 # --- Leafs Shadow ---
-async def swift_strike(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def swift_strike(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -932,12 +929,12 @@ async def swift_strike(session: "CombatSession", caster: dict, target: dict, **k
     return f"💨 {crit_text}**{caster['name']}** menggunakan **Swift Strike**, memberikan **{damage}** kerusakan!"
 
     
-async def wind_step(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def wind_step(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, caster, "Wind Step", duration=2, effect_type='buff', stat='spd', amount='+20%')
     return f"🌬️ **{caster['name']}** menggunakan **Wind Step**, meningkatkan SPD!"
 
 # --- First Spark ---
-async def ember_cast(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def ember_cast(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -950,12 +947,12 @@ async def ember_cast(session: "CombatSession", caster: dict, target: dict, **kwa
     return f"🔥 {crit_text}**{caster['name']}** merapal **Ember Cast**, memberikan **{damage}** kerusakan sihir!"
 
     
-async def fading_curse(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def fading_curse(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, target, "Fading Curse", duration=2, effect_type='debuff', stat='atk', amount='-10%')
     return f"📉 **{caster['name']}** merapal **Fading Curse**, mengurangi ATK **{target['name']}**!"
 
 # --- Concrete Will ---
-async def heavy_blow(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def heavy_blow(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -967,14 +964,14 @@ async def heavy_blow(session: "CombatSession", caster: dict, target: dict, **kwa
     crit_text = "✨ **KRITIKAL!** " if is_crit else ""
     return f"👊 {crit_text}**{caster['name']}** melancarkan **Heavy Blow**, memberikan **{damage}** kerusakan!"
 
-async def iron_resolve(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def iron_resolve(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, caster, "Iron Resolve", duration=2, effect_type='buff', damage_reduction=0.30)
     return f"굳 **{caster['name']}** menggunakan **Iron Resolve**, mengeraskan diri untuk serangan berikutnya!"
 
 
 # --- Enemy Skills (Baru) ---
 # --- Wanderer ---
-async def silent_strike(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def silent_strike(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     # Gabungkan bonus crit dari buff dengan bonus bawaan skill
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0) + 0.20
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
@@ -984,7 +981,7 @@ async def silent_strike(session: "CombatSession", caster: dict, target: dict, **
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"💨 {crit}**{caster['name']}** menggunakan **Silent Strike**, memberikan **{damage}** kerusakan!"
 
-async def flowing_blade(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def flowing_blade(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
     
@@ -996,7 +993,7 @@ async def flowing_blade(session: "CombatSession", caster: dict, target: dict, **
     return f"🌊 {crit}**{caster['name']}** menggunakan **Flowing Blade**, memberikan **{damage}** kerusakan dan memperlambat target!"
 
 # --- Puppet Knight ---
-async def mechanical_slash(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def mechanical_slash(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1005,7 +1002,7 @@ async def mechanical_slash(session: "CombatSession", caster: dict, target: dict,
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"⚙️ {crit}**{caster['name']}** menggunakan **Mechanical Slash**, memberikan **{damage}** kerusakan!"
 
-async def core_overload(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def core_overload(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1017,7 +1014,7 @@ async def core_overload(session: "CombatSession", caster: dict, target: dict, **
     return f"💥 {crit}**{caster['name']}** menggunakan **Core Overload**, memberikan **{damage}** kerusakan dan menerima **{recoil_damage}** recoil!"
 
 # --- Berserker ---
-async def vengeful_fist(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def vengeful_fist(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1026,7 +1023,7 @@ async def vengeful_fist(session: "CombatSession", caster: dict, target: dict, **
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"👊 {crit}**{caster['name']}** menggunakan **Vengeful Fist**, memberikan **{damage}** kerusakan!"
 
-async def savage_rampage(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def savage_rampage(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1038,7 +1035,7 @@ async def savage_rampage(session: "CombatSession", caster: dict, target: dict, *
     return f"😡 {crit}**{caster['name']}** mengamuk dengan **Savage Rampage**, memberikan **{damage}** kerusakan dan menerima **{recoil_damage}** recoil!"
 
 # --- Forest Reaper ---
-async def root_bind(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def root_bind(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1048,7 +1045,7 @@ async def root_bind(session: "CombatSession", caster: dict, target: dict, **kwar
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🌲 {crit}**{caster['name']}** menggunakan **Root Bind**, memberikan **{damage}** kerusakan dan mengikat target!"
 
-async def concentrated_venom(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def concentrated_venom(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1060,7 +1057,7 @@ async def concentrated_venom(session: "CombatSession", caster: dict, target: dic
     return f"🧪 {crit}**{caster['name']}** menggunakan **Concentrated Venom**, memberikan **{damage}** kerusakan dan meracuni target!"
 
 # --- Dark Champion ---
-async def arenas_cleave(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def arenas_cleave(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
     
@@ -1072,7 +1069,7 @@ async def arenas_cleave(session: "CombatSession", caster: dict, target: dict, **
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"⚔️ {crit}**{caster['name']}** menggunakan **Arenas Cleave**, memberikan total **{final_damage}** kerusakan!"
     
-async def finishing_blow(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def finishing_blow(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0) + 0.25
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1082,7 +1079,7 @@ async def finishing_blow(session: "CombatSession", caster: dict, target: dict, *
     return f"🎯 {crit}**{caster['name']}** menggunakan **Finishing Blow**, memberikan **{damage}** kerusakan!"
 
 # --- Swordsman Phantom ---
-async def shadow_slash(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def shadow_slash(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1090,7 +1087,7 @@ async def shadow_slash(session: "CombatSession", caster: dict, target: dict, **k
                                     bonus_crit_rate=bonus_crit_rate, bonus_crit_dmg=bonus_crit_dmg)
     
     log_message = ""
-    is_heal_blocked = any(e.get('type') == 'heal_block' for e in caster.get('status_effects', []))
+    is_heal_blocked = caster['status_effects'].has_type('heal_block')
     if is_heal_blocked:
         log_message = " tetapi pemulihan HP gagal karena Heal Block!"
     else:
@@ -1101,7 +1098,7 @@ async def shadow_slash(session: "CombatSession", caster: dict, target: dict, **k
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"👻 {crit}**{caster['name']}** menggunakan **Shadow Slash**, memberikan **{damage}** kerusakan{log_message}"
 
-async def splitting_shadow(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def splitting_shadow(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1112,7 +1109,7 @@ async def splitting_shadow(session: "CombatSession", caster: dict, target: dict,
     return f"👥 **{caster['name']}** menggunakan **Splitting Shadow**, memberikan 2 serangan dengan total **{total_damage}** kerusakan! ({crit_count} kritikal)"
 
 # --- Blade Dancer ---
-async def crimson_edge(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def crimson_edge(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1123,7 +1120,7 @@ async def crimson_edge(session: "CombatSession", caster: dict, target: dict, **k
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🩸 {crit}**{caster['name']}** menggunakan **Crimson Edge**, memberikan **{damage}** kerusakan dan menyebabkan pendarahan!"
 
-async def blade_fury(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def blade_fury(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0) + 0.10
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1137,7 +1134,7 @@ async def blade_fury(session: "CombatSession", caster: dict, target: dict, **kwa
     return f"💃 **{caster['name']}** menari dengan **Blade Fury**, memberikan 3 serangan dengan total **{total_damage}** kerusakan! ({crit_count} kritikal)"
 
 # Corrupt Alchemist
-async def poison_vial(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def poison_vial(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1148,7 +1145,7 @@ async def poison_vial(session: "CombatSession", caster: dict, target: dict, **kw
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"☠️ {crit}**{caster['name']}** melempar **Poison Vial**, memberikan **{damage}** kerusakan dan meracuni target dengan kuat!"
 
-async def acid_splash(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def acid_splash(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
     
@@ -1160,13 +1157,13 @@ async def acid_splash(session: "CombatSession", caster: dict, target: dict, **kw
     return f"⚗️ {crit}**{caster['name']}** menyiram **Acid Splash**, memberikan **{damage}** kerusakan dan mengurangi DEF target!"
 
 # Thorn Witch
-async def binding_thorns(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def binding_thorns(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.00)
     await _apply_status(session, caster, target, "Rooted", 2, 'stun')
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🥀 {crit}**{caster['name']}** menggunakan **Binding Thorns**, memberikan **{damage}** kerusakan dan mengikat target!"
 
-async def wilted_rose(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def wilted_rose(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 0.80)
     poison_damage = int(target['max_hp'] * 0.10)
     await _apply_status(session, caster, target, "Wilted Rose Curse", 3, 'dot', damage=poison_damage)
@@ -1174,7 +1171,7 @@ async def wilted_rose(session: "CombatSession", caster: dict, target: dict, **kw
     return f"🌹 {crit}**{caster['name']}** mengutuk dengan **Wilted Rose**, memberikan **{damage}** kerusakan dan meracuni target!"
 
 # Chain Warden
-async def prison_chain(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def prison_chain(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_damage = int(caster['stats'].get('def', 0) * 0.20)
     base_dmg, is_crit = await _apply_damage(session, caster, target, 1.0)
     total_damage = base_dmg + bonus_damage
@@ -1185,7 +1182,7 @@ async def prison_chain(session: "CombatSession", caster: dict, target: dict, **k
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🔗 {crit}**{caster['name']}** melempar **Prison Chain**, memberikan **{total_damage}** kerusakan dan memperlambat target!"
 
-async def drag_to_the_abyss(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def drag_to_the_abyss(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.80)
     if random.random() < 0.25:
         await _apply_status(session, caster, target, "Stunned", 2, 'stun')
@@ -1194,14 +1191,14 @@ async def drag_to_the_abyss(session: "CombatSession", caster: dict, target: dict
     return f"⛓️ {crit}**{caster['name']}** menggunakan **Drag to the Abyss**, memberikan **{damage}** kerusakan!"
 
 # Sun Sentinel
-async def burning_light(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def burning_light(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.60)
     burn_damage = int(target['max_hp'] * 0.05)
     await _apply_status(session, caster, target, "Burned", 3, 'dot', damage=burn_damage)
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"☀️ {crit}**{caster['name']}** menembakkan **Burning Light**, memberikan **{damage}** kerusakan dan membakar target!"
 
-async def solar_spear(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def solar_spear(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_damage = int(caster['stats'].get('def', 0) * 0.10)
     base_dmg, is_crit = await _apply_damage(session, caster, target, 1.80)
     total_damage = base_dmg + bonus_damage
@@ -1210,19 +1207,19 @@ async def solar_spear(session: "CombatSession", caster: dict, target: dict, **kw
     return f"🌞 {crit}**{caster['name']}** menghantam dengan **Solar Spear**, memberikan **{total_damage}** kerusakan!"
 
 # Ghost Captain
-async def cursed_cannonball(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def cursed_cannonball(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.70, ignores_def_percent=0.15)
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"💣 {crit}**{caster['name']}** menembakkan **Cursed Cannonball**, menembus pertahanan dan memberikan **{damage}** kerusakan!"
 
-async def deep_sea_curse(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def deep_sea_curse(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     damage, is_crit = await _apply_damage(session, caster, target, 1.30)
     await _apply_status(session, caster, target, "Deep Sea Curse", 2, 'debuff', stat='atk', amount='-20%')
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🌊 {crit}**{caster['name']}** melepaskan **Deep Sea Curse**, memberikan **{damage}** kerusakan dan melemahkan serangan target!"
 
 # Doppelgänger
-async def lifes_mirror(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def lifes_mirror(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     target_skills = [s for s in target.get('raw_title_data', {}).get('skills', []) if s['type'] == 'active']
     if not target_skills:
         return f"🎭 **{caster['name']}** mencoba meniru, tetapi **{target['name']}** tidak memiliki skill aktif untuk ditiru!"
@@ -1243,7 +1240,7 @@ async def lifes_mirror(session: "CombatSession", caster: dict, target: dict, **k
     
     return f"🎭 **{caster['name']}** menggunakan **Lifes Mirror**, meniru **{copied_skill['name']}** dengan 50% kekuatan!\n> {log_message}"
 
-async def dual_face(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def dual_face(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1253,7 +1250,7 @@ async def dual_face(session: "CombatSession", caster: dict, target: dict, **kwar
     return f"🎭 {crit}**{caster['name']}** melancarkan serangan **Dual Face** yang tak terduga, memberikan **{damage}** kerusakan!"
 
 # Flame Revenant
-async def lava_burst(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def lava_burst(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1263,7 +1260,7 @@ async def lava_burst(session: "CombatSession", caster: dict, target: dict, **kwa
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🌋 {crit}**{caster['name']}** meledakkan **Lava Burst**, memberikan **{damage}** kerusakan dan menyebabkan luka bakar parah!"
 
-async def incinerate(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def incinerate(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1274,7 +1271,7 @@ async def incinerate(session: "CombatSession", caster: dict, target: dict, **kwa
     return f"🔥 {crit}**{caster['name']}** menembakkan **Incinerate**, memberikan **{damage}** kerusakan dan membakar target!"
 
 # Dark Bard
-async def draining_note(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def draining_note(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1284,7 +1281,7 @@ async def draining_note(session: "CombatSession", caster: dict, target: dict, **
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🎵 {crit}**{caster['name']}** memainkan **Draining Note**, memberikan **{damage}** kerusakan dan melemahkan target!"
 
-async def lullaby_of_nightmares(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def lullaby_of_nightmares(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1299,7 +1296,7 @@ async def lullaby_of_nightmares(session: "CombatSession", caster: dict, target:
     return log
 
 # Fog Lord
-async def blinding_mist(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def blinding_mist(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1309,7 +1306,7 @@ async def blinding_mist(session: "CombatSession", caster: dict, target: dict, **
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🌫️ {crit}**{caster['name']}** meniupkan **Blinding Mist**, memberikan **{damage}** kerusakan dan mengganggu penglihatan target!"
 
-async def hand_of_fog(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def hand_of_fog(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1320,7 +1317,7 @@ async def hand_of_fog(session: "CombatSession", caster: dict, target: dict, **kw
     return f"✋ {crit}**{caster['name']}** menggunakan **Hand of Fog**, memberikan **{damage}** kerusakan dan memperlambat target!"
 
 # Shadow Dragon
-async def dark_claw(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def dark_claw(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     # Gabungkan bonus crit damage dari buff dengan bonus bawaan skill
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0) + 0.15
@@ -1330,7 +1327,7 @@ async def dark_claw(session: "CombatSession", caster: dict, target: dict, **kwar
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🐉 {crit}**{caster['name']}** mencakar dengan **Dark Claw**, memberikan **{damage}** kerusakan!"
 
-async def shadow_breath(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def shadow_breath(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1341,7 +1338,7 @@ async def shadow_breath(session: "CombatSession", caster: dict, target: dict, **
     return f"💨 {crit}**{caster['name']}** menghembuskan **Shadow Breath**, memberikan **{damage}** kerusakan dan membutakan target!"
 
 # Fallen Emperor
-async def imperial_sword(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def imperial_sword(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1350,7 +1347,7 @@ async def imperial_sword(session: "CombatSession", caster: dict, target: dict, *
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"👑 {crit}**{caster['name']}** menebas dengan **Imperial Sword**, memberikan **{damage}** kerusakan agung!"
 
-async def decree_of_ruin(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def decree_of_ruin(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1361,8 +1358,8 @@ async def decree_of_ruin(session: "CombatSession", caster: dict, target: dict, *
     return f"📜 {crit}**{caster['name']}** mengeluarkan **Decree of Ruin**, memberikan **{damage}** kerusakan dan meremukkan pertahanan!"
 
 # Cult Priest
-async def blood_offering(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
-    is_heal_blocked = any(e.get('type') == 'heal_block' for e in caster.get('status_effects', []))
+async def blood_offering(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
+    is_heal_blocked = caster['status_effects'].has_type('heal_block')
     recoil = int(caster['max_hp'] * 0.15)
     caster['hp'] = max(0, caster['hp'] - recoil)
     
@@ -1373,7 +1370,7 @@ async def blood_offering(session: "CombatSession", caster: dict, target: dict, *
     caster['hp'] = min(caster['max_hp'], caster['hp'] + heal)
     return f"🩸 **{caster['name']}** menggunakan **Blood Offering**, mengorbankan **{recoil}** HP untuk memulihkan **{heal}** HP!"
 
-async def ivory_curse(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def ivory_curse(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1384,11 +1381,11 @@ async def ivory_curse(session: "CombatSession", caster: dict, target: dict, **kw
     return f"💀 {crit}**{caster['name']}** merapal **Ivory Curse**, memberikan **{damage}** kerusakan dan merapuhkan pertahanan!"
 
 # Fate Weaver
-async def thread_of_life(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def thread_of_life(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     drain_amount = int(target['hp'] * 0.15)
     target['hp'] = max(0, target['hp'] - drain_amount)
     
-    is_heal_blocked = any(e.get('type') == 'heal_block' for e in caster.get('status_effects', []))
+    is_heal_blocked = caster['status_effects'].has_type('heal_block')
     if is_heal_blocked:
         return f"🧵 **{caster['name']}** menarik **Thread of Life** dan memberikan **{drain_amount}** kerusakan, tetapi pemulihan gagal karena Heal Block!"
     
@@ -1396,8 +1393,8 @@ async def thread_of_life(session: "CombatSession", caster: dict, target: dict, *
     return f"🧵 **{caster['name']}** menarik **Thread of Life**, menyerap **{drain_amount}** HP dari **{target['name']}**!"
 
 
-async def self_mending(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
-    is_heal_blocked = any(e.get('type') == 'heal_block' for e in caster.get('status_effects', []))
+async def self_mending(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
+    is_heal_blocked = caster['status_effects'].has_type('heal_block')
     if is_heal_blocked:
         return f"🧶 **{caster['name']}** mencoba menggunakan **Self Mending**, tetapi gagal karena efek Heal Block!"
         
@@ -1406,7 +1403,7 @@ async def self_mending(session: "CombatSession", caster: dict, target: dict, **k
     return f"🧶 **{caster['name']}** menggunakan **Self Mending**, memulihkan **{heal_amount}** HP."
 
 # Abyss Guardian
-async def abyss_strike(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def abyss_strike(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1415,7 +1412,7 @@ async def abyss_strike(session: "CombatSession", caster: dict, target: dict, **k
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"💥 {crit}**{caster['name']}** melancarkan **Abyss Strike**, memberikan **{damage}** kerusakan!"
 
-async def hellfire_chains(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def hellfire_chains(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
 
@@ -1427,7 +1424,7 @@ async def hellfire_chains(session: "CombatSession", caster: dict, target: dict,
     return f"⛓️ {crit}**{caster['name']}** mengikat dengan **Hellfire Chains**, memberikan **{damage}** kerusakan, membakar, dan meracuni!"
 
 # Mythic Kitsune
-async def spirit_fireball(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def spirit_fireball(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     bonus_crit_rate = kwargs.get('bonus_crit_rate', 0.0)
     bonus_crit_dmg = kwargs.get('bonus_crit_dmg', 0.0)
     
@@ -1437,10 +1434,10 @@ async def spirit_fireball(session: "CombatSession", caster: dict, target: dict,
     crit = "✨ **KRITIKAL!** " if is_crit else ""
     return f"🦊 {crit}**{caster['name']}** menembakkan **Spirit Fireball**, memberikan **{damage}** kerusakan dan meninggalkan api roh!"
 
-async def red_moon_charm(session: "CombatSession", caster: dict, target: dict, **kwargs) -> str:
+async def red_moon_charm(session: "CombatEngine", caster: dict, target: dict, **kwargs) -> str:
     await _apply_status(session, caster, target, "Charmed", 2, 'stun')
     
-    is_heal_blocked = any(e.get('type') == 'heal_block' for e in caster.get('status_effects', []))
+    is_heal_blocked = caster['status_effects'].has_type('heal_block')
     if is_heal_blocked:
         return f"🌕 **{caster['name']}** menggunakan **Red Moon Charm** dan memesona **{target['name']}**, tetapi pemulihan gagal karena Heal Block!"
         
@@ -1452,12 +1449,12 @@ async def red_moon_charm(session: "CombatSession", caster: dict, target: dict, *
 # --- IMPLEMENTASI SKILL PASIF ---
 # ===================================================================================
 
-async def archipelagos_blessing(session: "CombatSession", participant: dict):
+async def archipelagos_blessing(session: "CombatEngine", participant: dict):
     """HOOK: Dipanggil dari _apply_damage saat 'participant' menerima damage."""
     if 'passive_flags' not in participant: participant['passive_flags'] = {}
     
     # Cek Heal Block
-    if any(e.get('type') == 'heal_block' for e in participant.get('status_effects', [])):
+    if participant['status_effects'].has_type('heal_block'):
         return
 
     used = participant['passive_flags'].get('archipelago_blessing_used', False)
@@ -1465,17 +1462,17 @@ async def archipelagos_blessing(session: "CombatSession", participant: dict):
         heal_amount = int(participant['max_hp'] * 0.20)
         participant['hp'] = min(participant['max_hp'], participant['hp'] + heal_amount)
         # Cleanse debuffs
-        participant['status_effects'] = [e for e in participant['status_effects'] if e.get('type') not in ['debuff', 'dot', 'stun', 'silence', 'paralyze', 'heal_block']]
+        participant['status_effects'].remove_types('debuff', 'dot', 'stun', 'silence', 'paralyze', 'heal_block')
         participant['passive_flags']['archipelago_blessing_used'] = True
         session.log.append(f"🏝️ **Archipelagos Blessing** aktif! **{participant['name']}** memulihkan **{heal_amount}** HP dan membersihkan diri!")
 
-async def encore_of_shadows(session: "CombatSession", loser: dict, attacker: dict):
+async def encore_of_shadows(session: "CombatEngine", loser: dict, attacker: dict):
     """HOOK: Dipanggil dari _handle_game_over saat 'loser' (pemilik pasif) dikalahkan."""
     damage = int(loser['max_hp'] * 0.25)
     attacker['hp'] = max(0, attacker['hp'] - damage)
     session.log.append(f"🎤 **Encore of Shadows**! **{loser['name']}** melepaskan nada terakhir, memberikan **{damage}** kerusakan pada **{attacker['name']}**!")
 
-def harmonious_resonance(session: "CombatSession", caster: dict, skill_type: str):
+def harmonious_resonance(session: "CombatEngine", caster: dict, skill_type: str):
     """HOOK: Dipanggil secara manual dari skill aktif Sun of Dual Symphonies."""
     if 'passive_flags' not in caster: caster['passive_flags'] = {}
 
@@ -1488,7 +1485,7 @@ def harmonious_resonance(session: "CombatSession", caster: dict, skill_type: str
             caster['skill_cooldowns']["Blazing Finale"] -= 1
             session.log.append("🎶 **Harmonious Resonance** mengurangi cooldown **Blazing Finale**!")
 
-async def raging_phoenix(session: "CombatSession", participant: dict) -> bool:
+async def raging_phoenix(session: "CombatEngine", participant: dict) -> bool:
     """HOOK: Panggil saat HP <= 0. Mengembalikan True jika hidup kembali."""
     # [PERBAIKAN] Cek flag di awal untuk mencegah eksekusi lebih lanjut.
     if participant.get('passive_flags', {}).get('raging_phoenix_used', False):
@@ -1506,52 +1503,52 @@ async def raging_phoenix(session: "CombatSession", participant: dict) -> bool:
         return True
     return False
 
-def ancestors_sight(session: "CombatSession", caster: dict, target: dict):
-    """HOOK: Dipanggil dari combat_logic.py di awal pertarungan."""
+def ancestors_sight(session: "CombatEngine", caster: dict, target: dict):
+    """HOOK: Dipanggil dari combat_engine.py di awal pertarungan."""
     target['stats']['crit_rate'] = max(0, target['stats']['crit_rate'] - 0.15)
     target['stats']['crit_damage'] = max(0, target['stats']['crit_damage'] - 0.15)
     session.log.append(f"👁️ **Ancestors Sight** dari **{caster['name']}** melihat kelemahan **{target['name']}**!")
 
-async def winters_embrace(session: "CombatSession", attacker: dict, target: dict):
+async def winters_embrace(session: "CombatEngine", attacker: dict, target: dict):
     """HOOK: Dipanggil dari _apply_damage setelah 'attacker' berhasil mendaratkan serangan."""
     if random.random() < 0.25:
         await _apply_status(session, attacker, target, "Winters Chill", 3, 'debuff', stat='spd', amount='-15%')
         session.log.append(f"🥶 **Winters Embrace** dari **{attacker['name']}** memperlambat **{target['name']}**!")
 
-def perfect_symmetry(session: "CombatSession", participant: dict):
+def perfect_symmetry(session: "CombatEngine", participant: dict):
     """HOOK: Panggil di akhir giliran (misal: di awal fungsi switch_turn)."""
     # Cleanse self
-    debuff_to_remove = next((e for e in participant['status_effects'] if e.get('type') in ['debuff', 'dot']), None)
+    debuff_to_remove = participant['status_effects'].first_of_type('debuff', 'dot')
     if debuff_to_remove:
         participant['status_effects'].remove(debuff_to_remove)
         session.log.append(f"⚖️ **Perfect Symmetry** menghapus **{debuff_to_remove['name']}** dari **{participant['name']}**.")
     # Purge enemy
     opponent = session.get_opponent(participant)
-    buff_to_remove = next((e for e in opponent['status_effects'] if e.get('type') == 'buff'), None)
+    buff_to_remove = opponent['status_effects'].first_of_type('buff')
     if buff_to_remove:
         if 'stat' in buff_to_remove: opponent['stats'][buff_to_remove['stat']] -= buff_to_remove['amount']
         opponent['status_effects'].remove(buff_to_remove)
         session.log.append(f"⚖️ **Perfect Symmetry** menghapus **{buff_to_remove['name']}** dari **{opponent['name']}**.")
 
-async def spellthief_s_gleam(session: "CombatSession", skill_user: dict, self_participant: dict):
+async def spellthief_s_gleam(session: "CombatEngine", skill_user: dict, self_participant: dict):
     """HOOK: Panggil setelah musuh ('skill_user') menggunakan skill."""
     if random.random() < 0.20:
-        buffs_on_enemy = [e for e in skill_user['status_effects'] if e.get('type') == 'buff' and e.get('duration') > 1]
+        buffs_on_enemy = [e for e in skill_user['status_effects'].of_type('buff') if e.get('duration') > 1]
         if buffs_on_enemy:
             stolen_buff = random.choice(buffs_on_enemy)
             # Terapkan buff yang dicuri ke diri sendiri
             await _apply_status(session, self_participant, self_participant, f"Stolen: {stolen_buff['name']}", 3, **stolen_buff)
             session.log.append(f"✨ **Spellthiefs Gleam**! **{self_participant['name']}** mencuri efek **{stolen_buff['name']}**!")
 
-async def oceans_lullaby(session: "CombatSession", participant: dict):
+async def oceans_lullaby(session: "CombatEngine", participant: dict):
     """HOOK: Panggil di awal giliran 'participant'._process_turn_effects."""
     if random.random() < 0.25:
-        debuff_to_remove = next((e for e in participant['status_effects'] if e.get('type') in ['debuff', 'dot']), None)
+        debuff_to_remove = participant['status_effects'].first_of_type('debuff', 'dot')
         if debuff_to_remove:
             participant['status_effects'].remove(debuff_to_remove)
             session.log.append(f"🌊 **Oceans Lullaby** menenangkan jiwa **{participant['name']}**, menghapus **{debuff_to_remove['name']}**.")
 
-async def feathered_sonnet(session: "CombatSession", caster: dict):
+async def feathered_sonnet(session: "CombatEngine", caster: dict):
     """HOOK: Panggil setelah 'caster' berhasil menggunakan skill."""
     if 'passive_flags' not in caster: caster['passive_flags'] = {}
     stacks = caster['passive_flags'].get('sonnet_stacks', 0)
@@ -1560,34 +1557,34 @@ async def feathered_sonnet(session: "CombatSession", caster: dict):
         caster['passive_flags']['sonnet_stacks'] = stacks
         spd_boost = int(caster['base_stats']['spd'] * (stacks * 0.05))
         # Hapus buff lama dan terapkan yang baru untuk menumpuk
-        caster['status_effects'] = [e for e in caster['status_effects'] if e['name'] != "Feathered Sonnet"]
+        caster['status_effects'].remove_named("Feathered Sonnet")
         await _apply_status(session, caster, caster, "Feathered Sonnet", 99, 'buff', stat='spd', amount=spd_boost)
         session.log.append(f"🕊️ **Feathered Sonnet**! Kecepatan **{caster['name']}** meningkat permanen!")
 
-async def master_of_puppets(session: "CombatSession", target: dict, debuff_name: str):
+async def master_of_puppets(session: "CombatEngine", target: dict, debuff_name: str):
     """HOOK: Panggil setelah berhasil memberikan debuff Stun, Paralyze, atau Silence."""
-    target_debuff = next((e for e in target['status_effects'] if e['name'] == debuff_name), None)
+    target_debuff = target['status_effects'].named(debuff_name)
     if target_debuff:
         target_debuff['duration'] += 1
         session.log.append(f"MASTER OF PUPPETS MENAMBAH DURASI")
 
-async def static_resonance(session: "CombatSession", attacker: dict):
+async def static_resonance(session: "CombatEngine", attacker: dict):
     """HOOK: Dipanggil dari _apply_damage saat 'attacker' mendaratkan serangan kritikal."""
     await _apply_status(session, attacker, attacker, "Static Resonance", 3, 'buff', stat='spd', amount='+15%')
     session.log.append(f"⚡ **Static Resonance**! Serangan kritikal meningkatkan kecepatan **{attacker['name']}**!")
 
-async def rimefrost_aura(session: "CombatSession", attacker: dict, defender: dict):
+async def rimefrost_aura(session: "CombatEngine", attacker: dict, defender: dict):
     """HOOK: Dipanggil dari _apply_damage saat 'defender' (pemilik pasif) diserang."""
     if random.random() < 0.30:
         _apply_status(session, defender, attacker, "Rimefrost Slow", 3, 'debuff', stat='spd', amount='-10%')
         session.log.append(f"❄️ **Rimefrost Aura** dari **{defender['name']}** memperlambat **{attacker['name']}**!")
 
-async def firewall_protocol(session: "CombatSession", participant: dict):
-    """HOOK: Dipanggil dari combat_logic.py di awal pertarungan."""
+async def firewall_protocol(session: "CombatEngine", participant: dict):
+    """HOOK: Dipanggil dari combat_engine.py di awal pertarungan."""
     await _apply_status(session, participant, participant, "Immunity", 3, 'immunity') # Durasi 3 untuk 2 giliran
     session.log.append(f"🛡️ **Firewall Protocol** aktif! **{participant['name']}** kebal terhadap debuff.")
 
-async def blade_of_serenity(session: "CombatSession", attacker: dict, target: dict):
+async def blade_of_serenity(session: "CombatEngine", attacker: dict, target: dict):
     """HOOK: Panggil sebelum serangan. Cek flag 'tidak menerima damage'."""
     if attacker.get('passive_flags', {}).get('serenity_active', False):
         bleed_damage = int(target['max_hp'] * 0.08)
@@ -1595,13 +1592,13 @@ async def blade_of_serenity(session: "CombatSession", attacker: dict, target: di
         session.log.append(f"🍃 **Blade of Serenity**! Tebasan **{attacker['name']}** menyebabkan pendarahan hebat!")
         attacker['passive_flags']['serenity_active'] = False # Reset flag
 
-def stat_swap_logic(session: "CombatSession"):
+def stat_swap_logic(session: "CombatEngine"):
     """Fungsi Logika Khusus. Dipanggil oleh skill dan saat efek berakhir."""
     # Fungsi ini kompleks dan perlu dipanggil saat efek aktif dan berakhir.
     # Implementasi sederhana:
     p1, p2 = session.p1, session.p2
-    p1_swap = next((e for e in p1['status_effects'] if e['name'] == "Stat Swap (Self)"), None)
-    p2_swap = next((e for e in p2['status_effects'] if e['name'] == "Stat Swap (Self)"), None)
+    p1_swap = p1['status_effects'].named("Stat Swap (Self)")
+    p2_swap = p2['status_effects'].named("Stat Swap (Self)")
     
     # Simpan stat asli jika belum disimpan
     if p1_swap and 'original_atk' not in p1_swap:
@@ -1613,7 +1610,7 @@ def stat_swap_logic(session: "CombatSession"):
         p2['stats']['atk'], p2['stats']['def'] = p1_swap['original_atk'], p1_swap['original_def']
 
 # --- The Adamant Colossus (BARU) ---
-async def stonewill_resilience(session: "CombatSession", participant: dict):
+async def stonewill_resilience(session: "CombatEngine", participant: dict):
     """
     HOOK: Dipanggil dari _apply_damage saat 'participant' menerima damage.
     """
@@ -1624,7 +1621,7 @@ async def stonewill_resilience(session: "CombatSession", participant: dict):
         session.log.append(f"💎 **Stonewill Resilience** aktif! **{participant['name']}** mendapatkan perisai **{shield_amount}** HP!")
 
 # --- The Sentinels Vow (BARU) ---
-async def unyielding_heart(session: "CombatSession", participant: dict):
+async def unyielding_heart(session: "CombatEngine", participant: dict):
     """
     HOOK: Dipanggil dari _apply_damage saat 'participant' menerima damage.
     """
@@ -1640,7 +1637,7 @@ async def unyielding_heart(session: "CombatSession", participant: dict):
         participant['passive_flags']['unyielding_heart_triggered'] = True
 
 # --- Howling Gale (BARU) ---
-async def spirit_of_the_pack(session: "CombatSession", attacker: dict):
+async def spirit_of_the_pack(session: "CombatEngine", attacker: dict):
     """
     HOOK: Dipanggil dari _apply_damage saat 'attacker' mendaratkan serangan kritikal.
     """
@@ -1651,7 +1648,7 @@ async def spirit_of_the_pack(session: "CombatSession", attacker: dict):
     attacker['passive_flags']['spirit_of_pack_stacks'] = current_stacks
     
     # Hapus buff lama (jika ada) untuk menumpuknya
-    existing_buff = next((e for e in attacker['status_effects'] if e.get('name') == 'Spirit of the Pack'), None)
+    existing_buff = attacker['status_effects'].named('Spirit of the Pack')
     if existing_buff:
         attacker['stats']['spd'] -= existing_buff['amount']
         attacker['status_effects'].remove(existing_buff)
@@ -1665,15 +1662,15 @@ async def spirit_of_the_pack(session: "CombatSession", attacker: dict):
     session.log.append(f"🐺 **Spirit of the Pack**! Kecepatan **{attacker['name']}** meningkat secara permanen!")
 
 # --- The Weaver Commander (BARU) ---
-async def master_tactician(session: "CombatSession", caster: dict, target: dict):
+async def master_tactician(session: "CombatEngine", caster: dict, target: dict):
     """
-    HOOK: Dipanggil dari combat_logic.py di awal pertarungan.
+    HOOK: Dipanggil dari combat_engine.py di awal pertarungan.
     """
     await _apply_status(session, caster, target, "Tacticians Ploy", 3, 'debuff', stat='atk', amount='-15%')
     session.log.append(f"🧠 **Master Tactician**! Kecepatan **{caster['name']}** membuatnya bisa melemahkan **{target['name']}** di awal!")
 
 # --- Bulwark of the Dawns Light (BARU) ---
-async def resolute_guardian(session: "CombatSession", participant: dict):
+async def resolute_guardian(session: "CombatEngine", participant: dict):
     """
     HOOK: Dipanggil dari _apply_status saat 'participant' menerima debuff.
     """
@@ -1681,7 +1678,7 @@ async def resolute_guardian(session: "CombatSession", participant: dict):
     session.log.append(f"💪 **Resolute Guardian**! **{participant['name']}** menjadi lebih kuat setelah menerima efek negatif!")
 
 # --- Phantom in the Code (BARU) ---
-async def volatile_encryption(session: "CombatSession", attacker: dict, defender: dict):
+async def volatile_encryption(session: "CombatEngine", attacker: dict, defender: dict):
     """
     HOOK: Dipanggil dari _apply_damage saat 'defender' (pemilik pasif) menerima damage.
     """
@@ -1690,7 +1687,7 @@ async def volatile_encryption(session: "CombatSession", attacker: dict, defender
         session.log.append(f"🔒 **Volatile Encryption** dari **{defender['name']}** merusak data serangan **{attacker['name']}**!")
 
 # --- Gilded Rose of Sunstone (BARU) ---
-async def perfect_confection(session: "CombatSession", participant: dict):
+async def perfect_confection(session: "CombatEngine", participant: dict):
     """
     HOOK: Panggil di awal giliran. Menghitung giliran untuk buff berikutnya.
     """
@@ -1706,11 +1703,11 @@ async def perfect_confection(session: "CombatSession", participant: dict):
         participant['passive_flags']['confection_counter'] = counter
 
 # --- Curse of a Broken Moon (BARU) ---
-async def sanguine_pact(session: "CombatSession", participant: dict):
+async def sanguine_pact(session: "CombatEngine", participant: dict):
     """
     HOOK: Panggil di awal giliran. Mengecek kondisi HP untuk memberikan buff.
     """
-    has_buff = any(e.get('name') == "Sanguine Pact" for e in participant.get('status_effects', []))
+    has_buff = participant['status_effects'].has("Sanguine Pact")
     is_low_hp = (participant['hp'] / participant['max_hp']) < 0.60
     
     # Cek apakah pasifnya pernah aktif sebelumnya (untuk mencegah re-trigger terus menerus)
@@ -1726,7 +1723,7 @@ async def sanguine_pact(session: "CombatSession", participant: dict):
         participant['passive_flags']['sanguine_pact_triggered'] = False
 
 # --- Gambler of the Fickle Fate (BARU) ---
-async def whims_of_fortune(session: "CombatSession", participant: dict):
+async def whims_of_fortune(session: "CombatEngine", participant: dict):
     """
     HOOK: Panggil di awal giliran.
     """
@@ -1735,7 +1732,7 @@ async def whims_of_fortune(session: "CombatSession", participant: dict):
         session.log.append(f"🍀 **Whims of Fortune** tersenyum! **{participant['name']}** siap untuk melakukan serangan balasan!")
 
 # --- Crimson Lotus Dancer (BARU) ---
-async def dance_of_a_thousand_cuts(session: "CombatSession", attacker: dict, target: dict):
+async def dance_of_a_thousand_cuts(session: "CombatEngine", attacker: dict, target: dict):
     """
     HOOK: Panggil setelah attacker berhasil mendaratkan serangan.
     """
@@ -1752,7 +1749,7 @@ async def dance_of_a_thousand_cuts(session: "CombatSession", attacker: dict, tar
         attacker['passive_flags']['thousand_cuts_counter'] = counter
 
 # --- Whisper of the Gilded Cage (BARU) ---
-async def warden_s_grace(session: "CombatSession", caster: dict):
+async def warden_s_grace(session: "CombatEngine", caster: dict):
     """
     HOOK: Dipanggil dari _apply_status ketika caster berhasil memberikan debuff.
     """
@@ -1760,11 +1757,11 @@ async def warden_s_grace(session: "CombatSession", caster: dict):
     session.log.append(f"✨ **Wardens Grace** aktif! SPD **{caster['name']}** meningkat!")
 
 # --- The Undying Taboo (BARU) ---
-async def grave_pact(session: "CombatSession", participant: dict):
+async def grave_pact(session: "CombatEngine", participant: dict):
     """
     HOOK: Panggil di awal giliran. Mengelola status buff DEF.
     """
-    has_buff = any(e.get('name') == "Grave Pact" for e in participant.get('status_effects', []))
+    has_buff = participant['status_effects'].has("Grave Pact")
     is_low_hp = (participant['hp'] / participant['max_hp']) < 0.30
 
     if is_low_hp and not has_buff:
@@ -1773,9 +1770,8 @@ async def grave_pact(session: "CombatSession", participant: dict):
         session.log.append(f"묘 **Grave Pact** aktif, **{participant['name']}** menjadi lebih tangguh!")
     elif not is_low_hp and has_buff:
         # Hapus buff jika HP sudah pulih
-        effects_to_remove = [e for e in participant['status_effects'] if e.get('name') == "Grave Pact"]
-        if effects_to_remove:
-            effect = effects_to_remove[0]
+        effect = participant['status_effects'].named("Grave Pact")
+        if effect:
             # Kembalikan stat secara manual
             original_amount = effect.get('amount', 0)
             participant['stats'][effect['stat']] -= original_amount
@@ -1784,9 +1780,9 @@ async def grave_pact(session: "CombatSession", participant: dict):
             session.log.append(f"묘 **Grave Pact** nonaktif.")
 
 # --- Fate of the Twin Blades (BARU) ---
-async def twin_s_harmony(session: "CombatSession", attacker: dict, defender: dict) -> str:
+async def twin_s_harmony(session: "CombatEngine", attacker: dict, defender: dict) -> str:
     """
-    HOOK: Panggil fungsi ini di `combat_logic.py` setelah serangan dasar ('attack') berhasil.
+    HOOK: Panggil fungsi ini di `combat_engine.py` setelah serangan dasar ('attack') berhasil.
     """
     if 'passive_flags' not in attacker: attacker['passive_flags'] = {}
     
@@ -1802,12 +1798,12 @@ async def twin_s_harmony(session: "CombatSession", attacker: dict, defender: dic
     return ""
 
 # --- Guardian of the Soul Gate (BARU) ---
-async def soul_siphon(session: "CombatSession", attacker: dict, damage_dealt: int):
+async def soul_siphon(session: "CombatEngine", attacker: dict, damage_dealt: int):
     """
     HOOK: Panggil di dalam `_apply_damage` setelah damage dihitung.
     """
     # Cek Heal Block
-    if any(e.get('type') == 'heal_block' for e in attacker.get('status_effects', [])):
+    if attacker['status_effects'].has_type('heal_block'):
         return
 
     if random.random() < 0.15 and damage_dealt > 0:
@@ -1816,7 +1812,7 @@ async def soul_siphon(session: "CombatSession", attacker: dict, damage_dealt: in
         session.log.append(f"👻 **Soul Siphon** menyerap **{healed_amount}** HP untuk **{attacker['name']}**!")
 
 # --- The Pixelated Prodigy (BARU) ---
-async def extra_life(session: "CombatSession", participant: dict) -> bool:
+async def extra_life(session: "CombatEngine", participant: dict) -> bool:
     """HOOK: Panggil saat HP <= 0. Mengembalikan True jika hidup kembali."""
     # [PERBAIKAN] Cek flag di awal.
     if participant.get('passive_flags', {}).get('extra_life_used', False):
@@ -1835,9 +1831,9 @@ async def extra_life(session: "CombatSession", participant: dict) -> bool:
     return False
 
 # --- Nameless Blade ---
-async def eager_heart(session: "CombatSession", attacker: dict) -> str:
+async def eager_heart(session: "CombatEngine", attacker: dict) -> str:
     """
-    HOOK: Panggil fungsi ini di `combat_logic.py` setelah serangan dasar (`'attack'`) berhasil.
+    HOOK: Panggil fungsi ini di `combat_engine.py` setelah serangan dasar (`'attack'`) berhasil.
     """
     if random.random() < 0.05:
         await _apply_status(session, attacker, attacker, "Eager Heart", duration=1, effect_type='buff', stat='atk', amount='+10%')
@@ -1845,7 +1841,7 @@ async def eager_heart(session: "CombatSession", attacker: dict) -> str:
     return ""
 
 # --- Altars Whisper ---
-def steadfast_faith(session: "CombatSession", target: dict, heal_amount: int) -> int:
+def steadfast_faith(session: "CombatEngine", target: dict, heal_amount: int) -> int:
     """
     HOOK: Panggil fungsi ini di dalam skill penyembuhan apa pun (seperti Mending Light)
     untuk memodifikasi nilai penyembuhan sebelum diterapkan.
@@ -1857,7 +1853,7 @@ def steadfast_faith(session: "CombatSession", target: dict, heal_amount: int) ->
     return heal_amount
 
 # --- Leafs Shadow ---
-def keen_senses(session: "CombatSession", defender: dict) -> bool:
+def keen_senses(session: "CombatEngine", defender: dict) -> bool:
     """
     HOOK: Panggil di awal fungsi `_apply_damage`. Jika mengembalikan True,
     batalkan damage dan kembalikan pesan menghindar.
@@ -1868,9 +1864,9 @@ def keen_senses(session: "CombatSession", defender: dict) -> bool:
     return False # Gagal menghindar
 
 # --- First Spark ---
-def arcane_echo(session: "CombatSession", caster: dict) -> str:
+def arcane_echo(session: "CombatEngine", caster: dict) -> str:
     """
-    HOOK: Panggil fungsi ini di `combat_logic.py` setelah sebuah skill (`'skill'`) berhasil digunakan.
+    HOOK: Panggil fungsi ini di `combat_engine.py` setelah sebuah skill (`'skill'`) berhasil digunakan.
     """
     has_passive = any(skill.get('name') == "Arcane Echo" for skill in caster['raw_title_data'].get('skills', []))
     if has_passive and random.random() < 0.05:
@@ -1881,7 +1877,7 @@ def arcane_echo(session: "CombatSession", caster: dict) -> str:
     return ""
 
 # --- Concrete Will ---
-def cornered_fury(session: "CombatSession", participant: dict, current_atk: int) -> int:
+def cornered_fury(session: "CombatEngine", participant: dict, current_atk: int) -> int:
     """
     HOOK: Panggil di dalam `_apply_damage` sebelum menghitung `base_damage`
     untuk memodifikasi stat ATK secara sementara untuk serangan tersebut.
@@ -1893,7 +1889,7 @@ def cornered_fury(session: "CombatSession", participant: dict, current_atk: int)
     return current_atk
 
 # --- Enemy Passives ---
-async def unbroken_threads(session: "CombatSession", participant: dict) -> bool:
+async def unbroken_threads(session: "CombatEngine", participant: dict) -> bool:
     """HOOK: Panggil saat HP <= 0. Mengembalikan True jika hidup kembali."""
     # [PERBAIKAN KUNCI] Tambahkan sistem flag yang sama untuk pasif monster.
     if participant.get('passive_flags', {}).get('unbroken_threads_used', False):
@@ -1911,10 +1907,10 @@ async def unbroken_threads(session: "CombatSession", participant: dict) -> bool:
         return True
     return False
 
-async def forests_breath(session: "CombatSession", participant):
+async def forests_breath(session: "CombatEngine", participant):
     """HOOK: Panggil di awal giliran."""
     # Cek Heal Block
-    if any(e.get('type') == 'heal_block' for e in participant.get('status_effects', [])):
+    if participant['status_effects'].has_type('heal_block'):
         return
 
     if _has_passive(participant, "Forests Breath"):
@@ -1922,59 +1918,59 @@ async def forests_breath(session: "CombatSession", participant):
         participant['hp'] = min(participant['max_hp'], participant['hp'] + regen_hp)
         session.log.append(f"🌿 **Forests Breath** memulihkan **{regen_hp}** HP untuk **{participant['name']}**.")
 
-async def dark_honor(session: "CombatSession", participant):
+async def dark_honor(session: "CombatEngine", participant):
     """HOOK: Panggil di awal giliran, cek kondisi HP."""
     if _has_passive(participant, "Dark Honor") and (participant['hp'] / participant['max_hp']) < 0.40:
         # Cek apakah buff belum aktif
-        if not any(e['name'] == 'Dark Honor' for e in participant['status_effects']):
+        if not participant['status_effects'].has('Dark Honor'):
             spd_boost = int(participant['stats']['spd'] * 0.20)
             await _apply_status(session, participant, participant, "Dark Honor", 99, 'buff', stat='spd', amount=spd_boost)
             session.log.append(f"🔥 **Dark Honor** aktif, meningkatkan SPD **{participant['name']}**!")
 
-async def immortal_blade(session: "CombatSession", participant):
+async def immortal_blade(session: "CombatEngine", participant):
     """HOOK: Panggil di awal giliran, cek kondisi HP."""
     if _has_passive(participant, "Immortal Blade") and (participant['hp'] / participant['max_hp']) < 0.30:
-        if not any(e['name'] == 'Immortal Blade' for e in participant['status_effects']):
+        if not participant['status_effects'].has('Immortal Blade'):
             crit_boost = 0.20
             await _apply_status(session, participant, participant, "Immortal Blade", 3, 'buff', stat='crit_rate', amount=crit_boost)
             session.log.append(f"🗡️ **Immortal Blade** aktif, meningkatkan CRIT Rate **{participant['name']}**!")
 
-async def blood_frenzy(session: "CombatSession", attacker):
+async def blood_frenzy(session: "CombatEngine", attacker):
     """HOOK: Panggil setelah serangan kritikal."""
     if _has_passive(attacker, "Blood Frenzy"):
         atk_boost = int(attacker['stats']['atk'] * 0.10)
         await _apply_status(session, attacker, attacker, "Blood Frenzy", 3, 'buff', stat='atk', amount=atk_boost)
         session.log.append(f"🩸 **Blood Frenzy** aktif karena kritikal, meningkatkan ATK **{attacker['name']}**!")
 
-async def toxic_body(session: "CombatSession", attacker, defender):
+async def toxic_body(session: "CombatEngine", attacker, defender):
     """HOOK: Panggil setelah defender menerima serangan."""
     if _has_passive(defender, "Toxic Body"):
         poison_damage = int(attacker['max_hp'] * 0.03)
         await _apply_status(session, defender, attacker, "Toxic Body", 2, 'dot', damage=poison_damage)
         session.log.append(f"☣️ **Toxic Body** dari **{defender['name']}** meracuni **{attacker['name']}**!")
 
-async def thorny_garden(session: "CombatSession", attacker, defender, damage_dealt):
+async def thorny_garden(session: "CombatEngine", attacker, defender, damage_dealt):
     """HOOK: Panggil setelah defender menerima serangan."""
     if _has_passive(defender, "Thorny Garden"):
         reflect_damage = int(damage_dealt * 0.10)
         attacker['hp'] = max(0, attacker['hp'] - reflect_damage)
         session.log.append(f"🌵 **Thorny Garden** memantulkan **{reflect_damage}** kerusakan ke **{attacker['name']}**!")
 
-async def bound_soul(session: "CombatSession", caster):
+async def bound_soul(session: "CombatEngine", caster):
     """HOOK: Panggil setelah caster berhasil mendaratkan debuff."""
     if _has_passive(caster, "Bound Soul"):
         def_boost = int(caster['stats']['def'] * 0.15)
         await _apply_status(session, caster, caster, "Bound Soul", 99, 'buff', stat='def', amount=def_boost)
         session.log.append(f"🔗 **Bound Soul** memperkuat DEF **{caster['name']}**!")
         
-async def retribution_aura(session: "CombatSession", defender):
+async def retribution_aura(session: "CombatEngine", defender):
     """HOOK: Panggil setelah defender menerima serangan."""
     if _has_passive(defender, "Retribution Aura") and random.random() < 0.20:
         def_boost = int(defender['stats']['def'] * 0.15)
         await _apply_status(session, defender, defender, "Retribution Aura", 3, 'buff', stat='def', amount=def_boost)
         session.log.append(f"☀️ **Retribution Aura** meningkatkan DEF **{defender['name']}**!")
 
-async def ghostly_rage(session: "CombatSession", attacker):
+async def ghostly_rage(session: "CombatEngine", attacker):
     """HOOK: Panggil sebelum `_apply_damage`. Mengembalikan multiplier damage tambahan."""
     if _has_passive(attacker, "Ghostly Rage"):
         # `turn_count` di sini merujuk pada giliran global, bukan giliran individual
@@ -1984,22 +1980,22 @@ async def ghostly_rage(session: "CombatSession", attacker):
             return 1.50 
     return 1.0
 
-async def body_of_fire(session: "CombatSession", attacker, defender):
+async def body_of_fire(session: "CombatEngine", attacker, defender):
     """HOOK: Panggil setelah defender (pemilik pasif) menerima damage."""
     await _apply_status(session, defender, attacker, "Body of Fire", 1, 'dot', damage=int(defender['stats']['atk'] * 0.10))
     session.log.append(f"🔥 Tubuh api **{defender['name']}** membakar **{attacker['name']}**!")
     
-async def haunting_presence(session: "CombatSession", caster):
+async def haunting_presence(session: "CombatEngine", caster):
     """HOOK: Panggil di awal pertarungan. Menerapkan debuff aura."""
     if _has_passive(caster, "Haunting Presence"):
         opponent = session.get_opponent(caster)
         await _apply_status(session, caster, opponent, "Haunting Presence", 999, 'debuff', stat='spd', amount='-5%')
         session.log.append(f"🎶 Kehadiran **{caster['name']}** memperlambat semua lawan!")
 
-async def final_prayer(session: "CombatSession", user):
+async def final_prayer(session: "CombatEngine", user):
     """HOOK: Panggil setelah `user` menerima damage."""
     # Cek Heal Block
-    if any(e.get('type') == 'heal_block' for e in user.get('status_effects', [])):
+    if user['status_effects'].has_type('heal_block'):
         return
 
     hp_percent = user['hp'] / user['max_hp']
@@ -2011,21 +2007,21 @@ async def final_prayer(session: "CombatSession", user):
         user['passive_flags']['final_prayer_used'] = True
         session.log.append(f"🙏 **Final Prayer** aktif, memulihkan **{heal_amount}** HP untuk **{user['name']}**!")
 
-async def written_fate(session: "CombatSession", attacker, defender):
+async def written_fate(session: "CombatEngine", attacker, defender):
     """HOOK: Panggil di awal giliran `attacker`."""
     if _has_passive(attacker, "Written Fate"):
         if (session.turn_count - 1) % 4 == 0 and random.random() < 0.40:
              await _apply_status(session, attacker, defender, "Stunned by Fate", 2, 'stun')
              session.log.append(f"📜 Takdir tertulis! **{attacker['name']}** membuat **{defender['name']}** pingsan!")
 
-async def final_vengeance(session: "CombatSession", loser, winner):
+async def final_vengeance(session: "CombatEngine", loser, winner):
     """HOOK: Panggil saat `loser` (pemilik pasif) dikalahkan."""
     if _has_passive(loser, "Final Vengeance"):
         damage = int(loser['stats']['atk'] * 1.20)
         winner['hp'] = max(0, winner['hp'] - damage)
         session.log.append(f"💥 Balas dendam terakhir! **{loser['name']}** meledak saat kalah, memberikan **{damage}** kerusakan pada **{winner['name']}**!")
 
-async def eternal_power(session: "CombatSession", user):
+async def eternal_power(session: "CombatEngine", user):
     """HOOK: Panggil di awal giliran `user` (pemilik pasif)."""
     if 'passive_flags' not in user: user['passive_flags'] = {}
     
@@ -2036,7 +2032,7 @@ async def eternal_power(session: "CombatSession", user):
         user['passive_flags']['eternal_power_stacks'] = stacks
         
         # Hapus buff lama jika ada, lalu terapkan yang baru
-        user['status_effects'] = [e for e in user['status_effects'] if e['name'] != "Eternal Power"]
+        user['status_effects'].remove_named("Eternal Power")
         
         atk_boost_percent = stacks * 5
         base_atk = user['base_stats']['atk']
@@ -2247,17 +2243,77 @@ passive_implementations = {
     "Eternal Power": eternal_power,
 }
 
-async def apply_skill(session: "CombatSession", caster: dict, target: dict, skill_name: str, **kwargs) -> str:
+# ===================================================================================
+# --- DISPATCH PASIF PER HOOK ---
+# ===================================================================================
+
+# Hook -> {pasif: pemanggil}, urutan dict = urutan pemicuan. Pemanggil menyeragamkan signature
+# menjadi (session, pemilik, lawan, **konteks) dan mengembalikan teks log, bool (on_death), atau None.
+PASSIVE_HOOKS = {
+    "turn_start": {
+        "Oceans Lullaby": lambda s, owner, opponent, **_: oceans_lullaby(s, owner),
+        "Perfect Confection": lambda s, owner, opponent, **_: perfect_confection(s, owner),
+        "Sanguine Pact": lambda s, owner, opponent, **_: sanguine_pact(s, owner),
+        "Whims of Fortune": lambda s, owner, opponent, **_: whims_of_fortune(s, owner),
+        "Grave Pact": lambda s, owner, opponent, **_: grave_pact(s, owner),
+        "Forests Breath": lambda s, owner, opponent, **_: forests_breath(s, owner),
+        "Dark Honor": lambda s, owner, opponent, **_: dark_honor(s, owner),
+        "Immortal Blade": lambda s, owner, opponent, **_: immortal_blade(s, owner),
+        "Eternal Power": lambda s, owner, opponent, **_: eternal_power(s, owner),
+    },
+    "on_attack": {
+        "Twins Harmony": lambda s, owner, opponent, **_: twin_s_harmony(s, owner, opponent),
+        "Eager Heart": lambda s, owner, opponent, **_: eager_heart(s, owner),
+        "Winters Embrace": lambda s, owner, opponent, **_: winters_embrace(s, owner, opponent),
+    },
+    "on_skill": {
+        "Arcane Echo": lambda s, owner, opponent, **_: arcane_echo(s, owner),
+        "Feathered Sonnet": lambda s, owner, opponent, **_: feathered_sonnet(s, owner),
+        "Dance of a Thousand Cuts": lambda s, owner, opponent, **_: dance_of_a_thousand_cuts(s, owner, opponent),
+    },
+    # Pasif milik target skill lawan
+    "on_enemy_skill": {
+        "Spellthiefs Gleam": lambda s, owner, opponent, **_: spellthief_s_gleam(s, opponent, owner),
+    },
+    "on_damage": {
+        "Static Resonance": lambda s, owner, opponent, is_crit=False, **_: static_resonance(s, owner) if is_crit else None,
+        "Soul Siphon": lambda s, owner, opponent, damage=0, **_: soul_siphon(s, owner, damage),
+    },
+    # Prioritas revive; berhenti di pasif pertama yang mengembalikan True
+    "on_death": {
+        "Raging Phoenix": lambda s, owner, opponent, **_: raging_phoenix(s, owner),
+        "Extra Life": lambda s, owner, opponent, **_: extra_life(s, owner),
+        "Unbroken Threads": lambda s, owner, opponent, **_: unbroken_threads(s, owner),
+    },
+}
+
+def index_passives(participant: dict) -> dict:
+    """
+    Menyimpan index pasif pada partisipan: `passives` (frozenset nama) dan `passive_hooks`
+    {hook: (nama, ...)} berisi hanya pasif yang dimiliki, sesuai urutan PASSIVE_HOOKS.
+    """
+    names = passive_names(participant.get('raw_title_data', {}))
+    participant['passives'] = names
+    participant['passive_hooks'] = {hook: tuple(p for p in calls if p in names) for hook, calls in PASSIVE_HOOKS.items()}
+    return participant
+
+async def trigger_passives(session: "CombatEngine", hook: str, owner: dict, opponent: dict, **context) -> list:
+    """Memicu pasif `owner` untuk `hook`; mengembalikan teks log yang dihasilkan pasif."""
+    texts = []
+    for passive_name in owner.passive_hooks[hook]:
+        result = PASSIVE_HOOKS[hook][passive_name](session, owner, opponent, **context)
+        if inspect.isawaitable(result): result = await result
+        if isinstance(result, str): texts.append(result)
+    return texts
+
+async def apply_skill(session: "CombatEngine", caster: dict, target: dict, skill_name: str, **kwargs) -> str:
     skill_function = skill_implementations.get(skill_name)
     
     if skill_function:
-        caster['skill_cooldowns'][skill_name] = session.get_skill_cooldown(caster, skill_name)
+        caster.skill_cooldowns[skill_name] = session.get_skill_cooldown(caster, skill_name)
         
-        # [TAMBAHKAN INI] Hook untuk misi penggunaan skill
-        if caster.get('is_player'):
-            quest_cog = session.bot.get_cog("Misi")
-            if quest_cog:
-                await quest_cog.update_quest_progress(caster['id'], 'USE_SKILL')
+        # Event misi penggunaan skill (diteruskan adapter ke QuestCog)
+        session.record_event(caster, 'USE_SKILL')
         
         log_message = await skill_function(session, caster, target, **kwargs)
         return log_message
@@ -0,0 +1,160 @@
+# game_logic/status_effects.py
+
+# ===================================================================================
+# WADAH EFEK STATUS PARTISIPAN (LIST + INDEX NAMA/TIPE)
+# ===================================================================================
+
+class StatusEffects(list):
+    """
+    Daftar efek status (Effect) partisipan. Urutan tetap seperti list biasa (tampilan, urutan pemrosesan),
+    ditambah index per `name` dan per `type` agar hook tidak men-scan seluruh list.
+    Semua mutasi lewat method list menjaga index; `name`/`type` efek tidak boleh diubah setelah masuk.
+    """
+    __slots__ = ("_by_name", "_by_type")
+
+    def __init__(self, effects=()):
+        super().__init__(effects)
+        self._reindex()
+
+    def _reindex(self):
+        self._by_name: dict[str, list] = {}
+        self._by_type: dict[str, list] = {}
+        for effect in self: self._index(effect)
+
+    def _index(self, effect: dict):
+        self._by_name.setdefault(effect.name, []).append(effect)
+        self._by_type.setdefault(effect.type, []).append(effect)
+
+    def _unindex(self, effect: dict):
+        for index, key in ((self._by_name, effect.name), (self._by_type, effect.type)):
+            bucket = index[key]
+            for i, e in enumerate(bucket):
+                if e is effect:
+                    del bucket[i]
+                    break
+            if not bucket: del index[key]
+
+    # --- Mutasi (menjaga index) ---
+    def append(self, effect: dict):
+        super().append(effect)
+        self._index(effect)
+
+    def extend(self, effects):
+        for effect in effects: self.append(effect)
+
+    def __iadd__(self, effects):
+        self.extend(effects)
+        return self
+
+    def insert(self, i, effect: dict):
+        super().insert(i, effect)
+        self._reindex()
+
+    def remove(self, effect: dict):
+        del self[self.index(effect)]
+
+    def pop(self, i: int = -1) -> dict:
+        effect = super().pop(i)
+        self._unindex(effect)
+        return effect
+
+    def __delitem__(self, i):
+        if isinstance(i, slice):
+            super().__delitem__(i)
+            self._reindex()
+            return
+        effect = self[i]
+        super().__delitem__(i)
+        self._unindex(effect)
+
+    def __setitem__(self, i, value):
+        super().__setitem__(i, value)
+        self._reindex()
+
+    def clear(self):
+        super().clear()
+        self._by_name.clear()
+        self._by_type.clear()
+
+    def discard(self, effect: dict):
+        """Menghapus efek berdasarkan identitas (bukan kesamaan isi dict)."""
+        for i, e in enumerate(self):
+            if e is effect:
+                del self[i]
+                return
+
+    def remove_where(self, predicate) -> int:
+        """Menghapus semua efek yang memenuhi `predicate`, urutan sisanya tetap. Mengembalikan jumlah yang dihapus."""
+        kept = [e for e in self if not predicate(e)]
+        removed = len(self) - len(kept)
+        if removed:
+            super().__init__(kept)
+            self._reindex()
+        return removed
+
+    def remove_types(self, *types: str) -> int:
+        if not any(t in self._by_type for t in types): return 0
+        return self.remove_where(lambda e: e.type in types)
+
+    def remove_named(self, name: str) -> int:
+        if name not in self._by_name: return 0
+        return self.remove_where(lambda e: e.name == name)
+
+    def countdown(self) -> list:
+        """Mengurangi durasi semua efek dalam satu lintasan; efek yang habis dikeluarkan dan dikembalikan sesuai urutan."""
+        kept, expired = [], []
+        for effect in self:
+            effect.duration -= 1
+            (kept if effect.duration > 0 else expired).append(effect)
+        if expired:
+            super().__init__(kept)
+            self._reindex()
+        return expired
+
+    # --- Query ---
+    def _first(self, index: dict, keys: tuple) -> dict | None:
+        buckets = [index[k] for k in keys if k in index]
+        if not buckets: return None
+        if len(buckets) == 1: return buckets[0][0]
+        # Beberapa key cocok: ambil yang paling awal di list
+        members = {id(e) for b in buckets for e in b}
+        return next(e for e in self if id(e) in members)
+
+    def _select(self, index: dict, keys: tuple) -> list:
+        buckets = [index[k] for k in keys if k in index]
+        if len(buckets) <= 1: return list(buckets[0]) if buckets else []
+        members = {id(e) for b in buckets for e in b}
+        return [e for e in self if id(e) in members]
+
+    # Jalur cepat untuk satu key (kasus umum di hook); beberapa key mengikuti urutan list
+    def named(self, name: str, *others: str) -> dict | None:
+        """Efek pertama (urutan list) dengan salah satu nama, atau None."""
+        if others: return self._first(self._by_name, (name, *others))
+        bucket = self._by_name.get(name)
+        return bucket[0] if bucket else None
+
+    def has(self, name: str, *others: str) -> bool:
+        if name in self._by_name: return True
+        return bool(others) and any(n in self._by_name for n in others)
+
+    def of_type(self, effect_type: str, *others: str) -> list:
+        """Salinan efek bertipe salah satu tipe yang diminta, sesuai urutan list."""
+        if others: return self._select(self._by_type, (effect_type, *others))
+        bucket = self._by_type.get(effect_type)
+        return list(bucket) if bucket else []
+
+    def first_of_type(self, effect_type: str, *others: str) -> dict | None:
+        if others: return self._first(self._by_type, (effect_type, *others))
+        bucket = self._by_type.get(effect_type)
+        return bucket[0] if bucket else None
+
+    def has_type(self, effect_type: str, *others: str) -> bool:
+        if effect_type in self._by_type: return True
+        return bool(others) and any(t in self._by_type for t in others)
+
+    # --- Agregat turunan (dihitung dari index, selalu mengikuti nilai efek terkini) ---
+    @property
+    def evasion_bonus(self) -> float:
+        """Bonus evasion dari buff (Flowing Evasion)."""
+        effect = self.named("Flowing Evasion")
+        return effect.get('evasion_boost', 0.0) if effect else 0.0
@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import os
+import time
+from urllib.parse import parse_qs, urlparse
+
+import discord
+
+from database import get_asset_uploads, save_asset_upload
+
+# ===================================================================================
+# REGISTRY ASET (UPLOAD SEKALI, PAKAI URL CDN)
+# ===================================================================================
+
+# URL attachment Discord bertanda tangan (?ex=<hex unix>); diperbarui jika sisa umurnya di bawah ini (detik)
+URL_REFRESH_MARGIN = 3600
+
+class AssetEntry:
+    """Satu aset yang sudah di-upload. `mtime_ns`/`size` hanya di memori agar file tidak di-hash ulang tiap kirim."""
+    __slots__ = ("sha256", "url", "channel_id", "message_id", "mtime_ns", "size")
+
+    def __init__(self, sha256: str, url: str, channel_id: int, message_id: int):
+        self.sha256 = sha256
+        self.url = url
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.mtime_ns = None
+        self.size = None
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''): digest.update(chunk)
+    return digest.hexdigest()
+
+def _url_expiry(url: str) -> int | None:
+    expiry = parse_qs(urlparse(url).query).get("ex")
+    try: return int(expiry[0], 16) if expiry else None
+    except ValueError: return None
+
+class AssetRegistry:
+    """
+    Meng-upload aset lokal (PNG) sekali ke channel penyimpanan lalu menyimpan URL CDN & hash-nya di database.
+    Embed memakai URL tersebut; upload ulang hanya terjadi jika hash file berubah.
+    Tanpa channel penyimpanan, atau jika upload gagal, aset dikirim sebagai lampiran seperti biasa.
+    """
+    def __init__(self, bot, channel_id: int | None):
+        self.bot = bot
+        self.channel_id = channel_id
+        self._entries: dict[str, AssetEntry] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def load(self):
+        """Memuat registry dari database (dipanggil sekali saat setup)."""
+        uploads = await get_asset_uploads(self.bot.db)
+        self._entries = {
+            path: AssetEntry(row["sha256"], row["url"], row["channel_id"], row["message_id"])
+            for path, row in uploads.items()
+        }
+
+    async def _get_channel(self, channel_id: int):
+        return self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+
+    async def _upload(self, key: str, path: str, sha256: str) -> AssetEntry:
+        channel = await self._get_channel(self.channel_id)
+        message = await channel.send(content=f"`{key}` `{sha256[:12]}`", file=discord.File(path, filename=os.path.basename(path)))
+        entry = AssetEntry(sha256, message.attachments[0].url, channel.id, message.id)
+        await save_asset_upload(self.bot.db, key, sha256, entry.url, entry.channel_id, entry.message_id)
+        self._entries[key] = entry
+        return entry
+
+    async def _refresh_url(self, key: str, path: str, entry: AssetEntry) -> AssetEntry:
+        """URL bertanda tangan hampir kedaluwarsa: ambil URL baru dari pesan aslinya (tanpa upload ulang)."""
+        try:
+            channel = await self._get_channel(entry.channel_id)
+            message = await channel.fetch_message(entry.message_id)
+        except discord.NotFound:
+            return await self._upload(key, path, entry.sha256)
+        entry.url = message.attachments[0].url
+        await save_asset_upload(self.bot.db, key, entry.sha256, entry.url, entry.channel_id, entry.message_id)
+        return entry
+
+    async def get_url(self, path: str) -> str | None:
+        """URL CDN untuk file aset, atau None jika file tidak ada / registry tidak aktif / upload gagal."""
+        if not self.channel_id or not self.bot.db: return None
+        key = os.path.normpath(path).replace(os.sep, "/")
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            try:
+                stat = os.stat(path)
+                entry = self._entries.get(key)
+                if entry is None or (entry.mtime_ns, entry.size) != (stat.st_mtime_ns, stat.st_size):
+                    sha256 = await asyncio.to_thread(_file_sha256, path)
+                    if entry is None or entry.sha256 != sha256: entry = await self._upload(key, path, sha256)
+                    entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+
+                expiry = _url_expiry(entry.url)
+                if expiry is not None and expiry - time.time() < URL_REFRESH_MARGIN:
+                    entry = await self._refresh_url(key, path, entry)
+                    entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+                return entry.url
+            except FileNotFoundError:
+                return None
+            except (OSError, discord.HTTPException) as e:
+                print(f"Gagal menyiapkan aset '{key}': {e}")
+                return None
+
+    async def set_embed_image(self, embed: discord.Embed, path: str, *, thumbnail: bool = False) -> discord.File | None:
+        """
+        Memasang gambar aset ke embed (image atau thumbnail).
+        Mengembalikan discord.File yang harus ikut dilampirkan jika URL CDN tidak tersedia, selain itu None.
+        """
+        url, file = await self.get_url(path), None
+        if url is None:
+            if not os.path.exists(path): return None
+            filename = os.path.basename(path)
+            file, url = discord.File(path, filename=filename), f"attachment://{filename}"
+        if thumbnail: embed.set_thumbnail(url=url)
+        else: embed.set_image(url=url)
+        return file
@@ -3,14 +3,15 @@ import discord
 from discord.ext import commands, tasks
 from dotenv import load_dotenv
 import asyncio
-import json
 import random
 import sys
 from datetime import datetime
 
 # Impor database dan handler error
-from database import initialize_database
+from database import initialize_database, close_database, set_stat_calculator, refresh_power_scores
 from handlers.error_handler import setup_error_handler
+from handlers.asset_registry import AssetRegistry
+from game_logic.catalog import CatalogLoader
 
 # Memuat variabel dari file .env
 load_dotenv()
@@ -18,6 +19,8 @@ TOKEN = os.getenv('BOT_TOKEN')
 DEV_ID = int(os.getenv('DEV_ID'))
 PREFIX = os.getenv('PREFIX')
 STATUS_CHANNEL_ID = os.getenv('STATUS_LOG_CHANNEL_ID')
+# Channel privat tempat aset gambar di-upload sekali (URL CDN-nya dipakai ulang di embed)
+ASSET_CHANNEL_ID = os.getenv('ASSET_STORAGE_CHANNEL_ID')
 
 # Menentukan intents
 intents = discord.Intents.default()
@@ -25,6 +28,9 @@ intents.message_content = True
 intents.members = True
 intents.voice_states = True 
 
+# Tabel katalog yang memengaruhi total stat (power score leaderboard)
+POWER_SOURCE_TABLES = frozenset({"titles", "items", "artifacts"})
+
 # ===================================================================================
 # CLASS VIEW KHUSUS ADMIN
 # ===================================================================================
@@ -116,53 +122,133 @@ class MAHADVEN(commands.Bot):
     def __init__(self):
         super().__init__(command_prefix=PREFIX, intents=intents, owner_id=DEV_ID)
         self.db = None
-        # Data Game
-        self.titles = []
-        self.monsters = []
-        self.monster_titles = []
-        self.items = []
-        self.artifacts = []
-        self.agencies = [] 
-        self.quests = {}
-        self.stream_data = {}
-        self.fishes = [] 
+        # Data Game: satu katalog immutable yang dipakai bersama semua cog, diganti utuh saat reload
+        self.catalog_loader = CatalogLoader('./data')
+        self.catalog = self.catalog_loader.catalog
+        # Callback perubahan katalog: fn(catalog, changed_tables), dipanggil setelah swap
+        self.catalog_listeners = []
+        self.assets = AssetRegistry(self, int(ASSET_CHANNEL_ID) if ASSET_CHANNEL_ID else None)
         
         # Status Message Cache
         self.status_message = None
 
-    def _load_json_data(self, file_path, default):
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f: return json.load(f)
-        except: return default
-
-    def load_all_game_data(self):
+    def load_all_game_data(self) -> frozenset:
+        """Reload inkremental data game. Mengembalikan nama tabel yang berubah."""
         print("--- MEMUAT DATA GAME ---")
-        self.titles = self._load_json_data('./data/titles.json', [])
-        self.monsters = self._load_json_data('./data/monsters.json', [])
-        self.monster_titles = self._load_json_data('./data/monsters_titles.json', [])
-        self.items = self._load_json_data('./data/items.json', [])
-        self.artifacts = self._load_json_data('./data/artifacts.json', [])
-        self.agencies = self._load_json_data('./data/agencies.json', [])
-        self.quests = self._load_json_data('./data/quests.json', {"daily": [], "weekly": []})
-        self.fishes = self._load_json_data('./data/fishes.json', [])
-        self.fishing_items = self._load_json_data('./data/fishing_items.json', [])
-        print("--- SELESAI MEMUAT DATA ---")
+        catalog, changed = self.catalog_loader.reload()
+        for filename, error in self.catalog_loader.errors.items(): print(f"Gagal memuat {filename}: {error}")
+        if changed:
+            # Swap atomik: katalog baru sudah lengkap ter-index sebelum dipasang, dan tidak ada await
+            # antara swap dan callback sehingga command lain tidak melihat index cog yang setengah diperbarui.
+            self.catalog = catalog
+            for listener in list(self.catalog_listeners):
+                try: listener(catalog, changed)
+                except Exception as e: print(f"Gagal menjalankan callback katalog {listener!r}: {e}")
+        print(f"--- SELESAI MEMUAT DATA (v{self.catalog.version}, berubah: {', '.join(sorted(changed)) or '-'}) ---")
+        return changed
+
+    def add_catalog_listener(self, listener):
+        if listener not in self.catalog_listeners: self.catalog_listeners.append(listener)
+
+    def remove_catalog_listener(self, listener):
+        if listener in self.catalog_listeners: self.catalog_listeners.remove(listener)
+
+    def _on_catalog_change(self, catalog, changed: frozenset):
+        # Stat title/equipment berubah -> power score tersimpan ikut basi
+        if self.db and changed & POWER_SOURCE_TABLES:
+            asyncio.create_task(refresh_power_scores(self.db))
+
+    # --- Tabel Data Game (view read-only dari katalog) ---
+    @property
+    def titles(self): return self.catalog.all("titles")
+
+    @property
+    def monsters(self): return self.catalog.all("monsters")
+
+    @property
+    def monster_titles(self): return self.catalog.all("monster_titles")
+
+    @property
+    def items(self): return self.catalog.all("items")
+
+    @property
+    def artifacts(self): return self.catalog.all("artifacts")
+
+    @property
+    def agencies(self): return self.catalog.all("agencies")
+
+    @property
+    def quests(self): return self.catalog.quests
+
+    @property
+    def fishes(self): return self.catalog.all("fishes")
+
+    @property
+    def fishing_items(self): return self.catalog.all("fishing_items")
+
+    @property
+    def stream_data(self): return self.catalog.stream_data
 
     # --- Helper Get Data ---
     def get_agency_by_id(self, agency_id: str):
-        return next((a for a in self.agencies if a.get('id') == agency_id), None)
+        return self.catalog.agency(agency_id)
 
     def get_title_by_id(self, title_id: int):
-        return next((t for t in self.titles if t.get('id') == title_id), None)
+        return self.catalog.title(title_id)
     
     def get_monster_title_by_id(self, title_id: int):
-        return next((t for t in self.monster_titles if t.get('id') == title_id), None)
+        return self.catalog.monster_title(title_id)
 
     def get_item_by_id(self, item_id: int):
-        if item_id is None: return None
-        for i in self.items + self.artifacts:
-            if i.get('id') == item_id: return i
-        return None
+        return self.catalog.item(item_id)
+
+    def calculate_total_stats(self, player_data: dict, equipment: dict, upgrades: dict) -> tuple[dict, dict]:
+        """Total stat pemain (Base + Title + Equipment + Upgrade) beserta bonusnya: (total_stats, bonus_stats)."""
+        base_stats = {
+            'hp': player_data.get('base_hp', 100), 'atk': player_data.get('base_atk', 10), 
+            'def': player_data.get('base_def', 5), 'spd': player_data.get('base_spd', 10), 
+            'crit_rate': 0.05, 'crit_dmg': 1.5 
+        }
+        bonus_stats = {key: 0 for key in base_stats}
+
+        # Stat dari Title
+        if title_id := player_data.get('equipped_title_id'):
+            if title_data := self.get_title_by_id(title_id):
+                for stat, value in title_data.get('stat_boost', {}).items():
+                    stat_key = 'crit_dmg' if stat == 'crit_damage' else stat
+                    if stat_key in bonus_stats: bonus_stats[stat_key] += value
+
+        # Stat dari Equipment + Upgrades
+        for slot, item_id in (equipment or {}).items():
+            if item_id and (item_data := self.get_item_by_id(item_id)):
+                upgrade_data = upgrades.get(slot, {})
+                level = upgrade_data.get('level', 0)
+                
+                # Hitung Stat Dasar Item (Dengan Scaling)
+                for stat, value in item_data.get('stat_boost', {}).items():
+                    stat_key = 'crit_dmg' if stat == 'crit_damage' else stat
+                    final_value = value
+                    
+                    if value > 0:
+                        # Scaling: 5% untuk Crit, 10% untuk Stat Biasa
+                        if stat_key in ['crit_rate', 'crit_dmg']:
+                            final_value = value * (1 + (level * 0.05))
+                        else:
+                            final_value = int(value * (1 + (level * 0.10)))
+                    elif value < 0 and stat_key not in ['crit_rate', 'crit_dmg']:
+                        # Stat minus membaik tiap 3 level
+                        final_value = min(0, value + level // 3)
+                    
+                    if stat_key in bonus_stats:
+                        bonus_stats[stat_key] += final_value
+
+                # Hitung Bonus Stat (Sub-stats dari Upgrade)
+                for stat, val in upgrade_data.get('bonus_stats', {}).items():
+                    if stat in bonus_stats:
+                        bonus_stats[stat] += val
+
+        total_stats = {key: base_stats[key] + bonus_stats[key] for key in base_stats}
+        return total_stats, bonus_stats
 
     def get_skill_details(self, participant_data: dict, skill_name: str) -> dict:
         if not (participant_data and skill_name): return None
@@ -182,13 +268,32 @@ class MAHADVEN(commands.Bot):
     async def setup_hook(self):
         self.db = await initialize_database() 
         setup_error_handler(self)
+        await self.assets.load()
         self.load_all_game_data()
+        self.add_catalog_listener(self._on_catalog_change)
+
+        # Power score leaderboard disimpan di DB; hitung ulang karena data item/title bisa berubah
+        set_stat_calculator(lambda player, equipment, upgrades: self.calculate_total_stats(player, equipment, upgrades)[0])
+        await refresh_power_scores(self.db)
+
         await self._load_all_cogs()
         
         # Mulai loop
         self.change_status.start()
         self.status_panel_loop.start()
 
+    async def close(self):
+        # Pastikan antrian tulis database kosong sebelum bot mati
+        if self.db:
+            quest_cog = self.get_cog("Misi")
+            if quest_cog:
+                try: await quest_cog.flush_quest_progress()
+                except Exception as e: print(f"Gagal menyimpan progres misi: {e}")
+            try: await close_database(self.db)
+            except Exception as e: print(f"Gagal menutup database: {e}")
+            self.db = None
+        await super().close()
+
     # --- TASK 1: ROTASI STATUS DISCORD ---
     @tasks.loop(minutes=5)
     async def change_status(self):